@@ -6,181 +6,297 @@
 
 import re
 import json
-import urllib.parse
 from collections import defaultdict, Counter
 from datetime import datetime
 import math
+import time
+
+from analysis_checkpoint import AnalysisCheckpoint, verify_against_full
+from id_stats import IdStats
+from link_decode import link_title
+from link_index import load_link_index
+from url_classifier import classify_url
+
+CHECKPOINT_FILE = 'advanced_patterns_checkpoint.json'
+
+# قوائم الكلمات الدلالية لتحليل منشأ المحتوى
+ARABIC_KEYWORDS = ['عربي', 'مصري', 'سوري', 'لبناني', 'خليجي', 'مغربي', 'جزائري']
+TURKISH_KEYWORDS = ['turkish', 'turk', 'istanbul', 'ankara']
+KOREAN_KEYWORDS = ['korean', 'seoul', 'kpop', 'kdrama']
+INDIAN_KEYWORDS = ['bollywood', 'hindi', 'tamil', 'telugu']
+
+# كل قائمة كلمات كنمط بديل واحد (البحث عن أي كلمة منها داخل الرابط بأحرف صغيرة)
+ORIGIN_PATTERNS = [
+    (origin, re.compile('|'.join(map(re.escape, keywords))))
+    for origin, keywords in (('عربي', ARABIC_KEYWORDS), ('تركي', TURKISH_KEYWORDS),
+                             ('كوري', KOREAN_KEYWORDS), ('هندي', INDIAN_KEYWORDS))
+]
+# فحص واحد لأغلب الروابط التي لا تحوي أي كلمة منشأ
+ANY_ORIGIN_RE = re.compile('|'.join(pattern.pattern for _, pattern in ORIGIN_PATTERNS))
+
+# أنماط مُجمّعة مسبقاً تُستخدم لكل رابط في التمريرة المدمجة
+ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+LATIN_CHAR_RE = re.compile(r'[A-Za-z]')
+DIGIT_RE = re.compile(r'\d')
+SEPARATOR_RE = re.compile(r'[-_]')
+SERIES_SLUG_RE = re.compile(r'/series/\d+/([^/]+)')
+SEASON_RE = re.compile(r'الموسم-(\d+)')
 
 class AdvancedPatternsAnalyzer:
-    def __init__(self, filename='site_links.txt'):
+    def __init__(self, filename='site_links.txt', index=None, profile=False):
         self.filename = filename
+        self.index = index
+        self.profile = profile
+        # زمن كل مؤشر (ثوانٍ) في التمريرة المدمجة
+        self.insight_timings = defaultdict(float)
         self.all_links = []
+        self.total_links = 0
         self.insights = {}
+        # بيانات خام تُشتق منها المؤشرات (تُحفظ مع الحالة)
+        self.series_seasons = defaultdict(set)
+        self.movie_ids = IdStats()
         
     def load_links(self):
-        """تحميل الروابط"""
-        with open(self.filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('https://ak.sv/'):
-                self.all_links.append(line)
+        """تحميل الروابط من الفهرس المشترك"""
+        if self.index is None:
+            self.index = load_link_index(self.filename)
+        self.all_links.extend(self.index.links)
                 
-    def analyze_url_patterns(self):
-        """تحليل أنماط URLs المتقدمة"""
-        url_analysis = {
+    # ==================== مجمّعات المؤشرات ====================
+    # لكل مؤشر: قاموس تراكمي في insights، ودالة تضيف رابطاً واحداً إليه،
+    # ودالة تشتق القيم الإجمالية بعد انتهاء الدفعة
+    
+    def url_patterns_accumulator(self):
+        return self.insights.setdefault('url_patterns', {
             'depth_analysis': defaultdict(int),
             'parameter_patterns': defaultdict(int),
             'special_characters': defaultdict(int),
             'encoding_patterns': defaultdict(int)
-        }
+        })
         
-        for link in self.all_links:
-            # تحليل عمق URL
-            path = link.replace('https://ak.sv/', '')
-            depth = path.count('/')
-            url_analysis['depth_analysis'][depth] += 1
-            
-            # تحليل الترميز
-            if '%' in link:
-                url_analysis['encoding_patterns']['encoded'] += 1
-            else:
-                url_analysis['encoding_patterns']['plain'] += 1
-                
-            # تحليل الأحرف الخاصة
-            if re.search(r'[\u0600-\u06FF]', link):
-                url_analysis['special_characters']['arabic'] += 1
-            if re.search(r'[A-Za-z]', link):
-                url_analysis['special_characters']['english'] += 1
-            if re.search(r'\d', link):
-                url_analysis['special_characters']['numbers'] += 1
-            if re.search(r'[-_]', link):
-                url_analysis['special_characters']['separators'] += 1
-                
-        self.insights['url_patterns'] = url_analysis
+    def add_url_patterns(self, url_analysis, link, match):
+        # تحليل عمق URL
+        path = link.replace('https://ak.sv/', '')
+        depth = path.count('/')
+        url_analysis['depth_analysis'][depth] += 1
         
-    def analyze_content_distribution(self):
-        """تحليل توزيع المحتوى الجغرافي واللغوي"""
-        content_analysis = {
+        # تحليل الترميز
+        if '%' in link:
+            url_analysis['encoding_patterns']['encoded'] += 1
+        else:
+            url_analysis['encoding_patterns']['plain'] += 1
+            
+        # تحليل الأحرف الخاصة
+        special_characters = url_analysis['special_characters']
+        if ARABIC_CHAR_RE.search(link):
+            special_characters['arabic'] += 1
+        if LATIN_CHAR_RE.search(link):
+            special_characters['english'] += 1
+        if DIGIT_RE.search(link):
+            special_characters['numbers'] += 1
+        if SEPARATOR_RE.search(link):
+            special_characters['separators'] += 1
+    
+    def content_distribution_accumulator(self):
+        return self.insights.setdefault('content_distribution', {
             'arabic_content': defaultdict(int),
             'international_content': defaultdict(int),
             'mixed_content': defaultdict(int),
             'content_origins': defaultdict(int)
-        }
-        
-        # قوائم الكلمات الدلالية
-        arabic_keywords = ['عربي', 'مصري', 'سوري', 'لبناني', 'خليجي', 'مغربي', 'جزائري']
-        turkish_keywords = ['turkish', 'turk', 'istanbul', 'ankara']
-        korean_keywords = ['korean', 'seoul', 'kpop', 'kdrama']
-        indian_keywords = ['bollywood', 'hindi', 'tamil', 'telugu']
+        })
         
-        for link in self.all_links:
-            link_lower = link.lower()
-            
-            # تحليل المنشأ
-            if any(keyword in link_lower for keyword in arabic_keywords):
-                content_analysis['content_origins']['عربي'] += 1
-            elif any(keyword in link_lower for keyword in turkish_keywords):
-                content_analysis['content_origins']['تركي'] += 1
-            elif any(keyword in link_lower for keyword in korean_keywords):
-                content_analysis['content_origins']['كوري'] += 1
-            elif any(keyword in link_lower for keyword in indian_keywords):
-                content_analysis['content_origins']['هندي'] += 1
-            else:
-                content_analysis['content_origins']['دولي'] += 1
-                
-        self.insights['content_distribution'] = content_analysis
+    def add_content_distribution(self, content_analysis, link, match):
+        link_lower = link.lower()
         
-    def analyze_popularity_indicators(self):
-        """تحليل مؤشرات الشعبية والاهتمام"""
-        popularity_analysis = {
+        # تحليل المنشأ (أول قائمة تطابق، وإلا دولي)
+        origin = 'دولي'
+        if ANY_ORIGIN_RE.search(link_lower):
+            for origin, pattern in ORIGIN_PATTERNS:
+                if pattern.search(link_lower):
+                    break
+        content_analysis['content_origins'][origin] += 1
+    
+    def popularity_indicators_accumulator(self):
+        return self.insights.setdefault('popularity_indicators', {
             'high_id_content': [],
             'series_with_many_seasons': defaultdict(int),
             'actors_frequency': defaultdict(int),
             'content_clusters': defaultdict(list)
-        }
+        })
         
+    def add_popularity_indicators(self, popularity_analysis, link, match):
         # تحليل المحتوى عالي ID (قد يدل على شعبية)
-        for link in self.all_links:
-            if '/movie/' in link or '/series/' in link:
-                match = re.search(r'/(?:movie|series)/(\d+)/', link)
-                if match:
-                    content_id = int(match.group(1))
-                    if content_id > 8000:  # محتوى حديث أو شعبي
-                        title = link.split('/')[-1]
-                        title = urllib.parse.unquote(title)
-                        popularity_analysis['high_id_content'].append({
-                            'id': content_id,
-                            'title': title,
-                            'type': 'فيلم' if '/movie/' in link else 'مسلسل'
-                        })
+        if match.kind in ['movie', 'series']:
+            if match.rest is not None:
+                content_id = match.item_id
+                if content_id > 8000:  # محتوى حديث أو شعبي
+                    title = link_title(link)
+                    popularity_analysis['high_id_content'].append({
+                        'id': content_id,
+                        'title': title,
+                        'type': 'فيلم' if match.kind == 'movie' else 'مسلسل'
+                    })
         
         # تحليل المواسم المتعددة
-        series_seasons = defaultdict(set)
-        for link in self.all_links:
-            if '/series/' in link and 'الموسم' in link:
-                series_match = re.search(r'/series/\d+/([^/]+)', link)
-                season_match = re.search(r'الموسم-(\d+)', link)
-                if series_match and season_match:
-                    series_name = series_match.group(1).split('-الموسم')[0]
-                    season_num = int(season_match.group(1))
-                    series_seasons[series_name].add(season_num)
-                    
-        for series, seasons in series_seasons.items():
+        if '/series/' in link and 'الموسم' in link:
+            series_match = SERIES_SLUG_RE.search(link)
+            season_match = SEASON_RE.search(link)
+            if series_match and season_match:
+                series_name = series_match.group(1).split('-الموسم')[0]
+                season_num = int(season_match.group(1))
+                self.series_seasons[series_name].add(season_num)
+                
+    def finish_popularity_indicators(self, popularity_analysis):
+        popularity_analysis['series_with_many_seasons'].clear()
+        for series, seasons in self.series_seasons.items():
             if len(seasons) > 3:  # مسلسل له أكثر من 3 مواسم
                 popularity_analysis['series_with_many_seasons'][series] = len(seasons)
-        
-        self.insights['popularity_indicators'] = popularity_analysis
-        
-    def analyze_technical_patterns(self):
-        """تحليل الأنماط التقنية"""
-        technical_analysis = {
+    
+    def technical_patterns_accumulator(self):
+        return self.insights.setdefault('technical_patterns', {
             'id_gaps': [],
             'content_clustering': defaultdict(list),
             'naming_conventions': defaultdict(int),
             'url_efficiency': {}
-        }
+        })
+        
+    def add_technical_patterns(self, technical_analysis, link, match):
+        # معرفات الأفلام لتحليل الفجوات
+        if match.rest is not None and match.kind == 'movie':
+            self.movie_ids.add(match.item_id)
         
-        # تحليل فجوات IDs
-        movie_ids = []
-        series_ids = []
-        
-        for link in self.all_links:
-            if '/movie/' in link:
-                match = re.search(r'/movie/(\d+)/', link)
-                if match:
-                    movie_ids.append(int(match.group(1)))
-            elif '/series/' in link:
-                match = re.search(r'/series/(\d+)/', link)
-                if match:
-                    series_ids.append(int(match.group(1)))
-        
-        # تحليل فجوات IDs للأفلام
-        movie_ids.sort()
-        gaps = []
-        for i in range(len(movie_ids) - 1):
-            gap = movie_ids[i + 1] - movie_ids[i]
-            if gap > 100:  # فجوة كبيرة
-                gaps.append(gap)
+        # تحليل اصطلاحات التسمية
+        if '-' in link:
+            technical_analysis['naming_conventions']['dash_separated'] += 1
+        if '_' in link:
+            technical_analysis['naming_conventions']['underscore_separated'] += 1
+        if DIGIT_RE.search(link):
+            technical_analysis['naming_conventions']['contains_numbers'] += 1
+            
+    def finish_technical_patterns(self, technical_analysis):
+        # تحليل فجوات IDs للأفلام (الفجوة الكبيرة أكثر من 100)
+        gaps = self.movie_ids.gaps_over(100)
         
         technical_analysis['id_gaps'] = {
-            'movie_gaps': gaps[:10],  # أكبر 10 فجوات
+            'movie_gaps': [gap for gap, _, _ in self.movie_ids.largest_gaps(10) if gap > 100],  # أكبر 10 فجوات
             'largest_gap': max(gaps) if gaps else 0,
             'average_gap': sum(gaps) / len(gaps) if gaps else 0
         }
+    
+    def insight_steps(self):
+        """(الاسم، دالة الإضافة، دالة الإنهاء، القاموس التراكمي) لكل مؤشر بترتيب التقرير"""
+        return [
+            ('url_patterns', self.add_url_patterns, None,
+             self.url_patterns_accumulator()),
+            ('content_distribution', self.add_content_distribution, None,
+             self.content_distribution_accumulator()),
+            ('popularity_indicators', self.add_popularity_indicators, self.finish_popularity_indicators,
+             self.popularity_indicators_accumulator()),
+            ('technical_patterns', self.add_technical_patterns, self.finish_technical_patterns,
+             self.technical_patterns_accumulator()),
+        ]
+    
+    # ==================== التحليلات المنفصلة ====================
+    
+    def run_insight(self, name, links=None):
+        """تشغيل مؤشر واحد فقط على الروابط"""
+        for step_name, add, finish, analysis in self.insight_steps():
+            if step_name == name:
+                for link in self.all_links if links is None else links:
+                    add(analysis, link, classify_url(link))
+                if finish:
+                    finish(analysis)
+                
+    def analyze_url_patterns(self, links=None):
+        """تحليل أنماط URLs المتقدمة"""
+        self.run_insight('url_patterns', links)
         
-        # تحليل اصطلاحات التسمية
-        for link in self.all_links:
-            if '-' in link:
-                technical_analysis['naming_conventions']['dash_separated'] += 1
-            if '_' in link:
-                technical_analysis['naming_conventions']['underscore_separated'] += 1
-            if re.search(r'\d+', link):
-                technical_analysis['naming_conventions']['contains_numbers'] += 1
+    def analyze_content_distribution(self, links=None):
+        """تحليل توزيع المحتوى الجغرافي واللغوي"""
+        self.run_insight('content_distribution', links)
+        
+    def analyze_popularity_indicators(self, links=None):
+        """تحليل مؤشرات الشعبية والاهتمام"""
+        self.run_insight('popularity_indicators', links)
+        
+    def analyze_technical_patterns(self, links=None):
+        """تحليل الأنماط التقنية"""
+        self.run_insight('technical_patterns', links)
+        
+    def fold_links(self, links):
+        """
+        إضافة دفعة روابط إلى الحالة التراكمية لجميع المؤشرات في تمريرة واحدة:
+        يُصنف كل رابط مرة واحدة ثم يُمرر لكل مجمّع
+        (مع profile=True يُقاس زمن كل مؤشر في insight_timings)
+        """
+        self.total_links += len(links)
+        steps = self.insight_steps()
+        
+        if self.profile:
+            timings = self.insight_timings
+            for link in links:
+                start = time.perf_counter()
+                match = classify_url(link)
+                timings['classify'] += time.perf_counter() - start
+                for name, add, _, analysis in steps:
+                    start = time.perf_counter()
+                    add(analysis, link, match)
+                    timings[name] += time.perf_counter() - start
+        else:
+            adds = [(add, analysis) for _, add, _, analysis in steps]
+            for link in links:
+                match = classify_url(link)
+                for add, analysis in adds:
+                    add(analysis, link, match)
+        
+        for name, _, finish, analysis in steps:
+            if not finish:
+                continue
+            if self.profile:
+                start = time.perf_counter()
+                finish(analysis)
+                self.insight_timings[name] += time.perf_counter() - start
+            else:
+                finish(analysis)
                 
-        self.insights['technical_patterns'] = technical_analysis
+    def print_insight_timings(self):
+        """طباعة توزيع زمن التمريرة على المؤشرات"""
+        total = sum(self.insight_timings.values())
+        if not total:
+            return
+        print("⏱️ توزيع الزمن على المؤشرات:")
+        for name, seconds in sorted(self.insight_timings.items(), key=lambda item: -item[1]):
+            print(f"  {name:<24} {seconds * 1000:9.1f} ms  ({seconds / total * 100:.1f}%)")
+        
+    def get_state(self):
+        """الحالة التراكمية بصيغة قابلة للحفظ في JSON"""
+        return {
+            'total_links': self.total_links,
+            'insights': self.insights,
+            'series_seasons': {series: sorted(seasons) for series, seasons in self.series_seasons.items()},
+            'movie_ids': self.movie_ids.to_state(),
+        }
+        
+    def set_state(self, state):
+        """استعادة الحالة من نقطة حفظ (مع إعادة المفاتيح الرقمية والقواميس الافتراضية)"""
+        self.total_links = state['total_links']
+        self.series_seasons = defaultdict(set, ((series, set(seasons))
+                                                for series, seasons in state['series_seasons'].items()))
+        self.movie_ids = IdStats.from_state(state['movie_ids'])
+        self.insights = {}
+        for name, analysis in state['insights'].items():
+            self.insights[name] = restored = {}
+            for key, value in analysis.items():
+                # العدادات والمجموعات كانت defaultdict، أما id_gaps و url_efficiency فقواميس عادية
+                if key in ('content_clustering', 'content_clusters'):
+                    value = defaultdict(list, value)
+                elif isinstance(value, dict) and key not in ('id_gaps', 'url_efficiency'):
+                    value = defaultdict(int, value)
+                restored[key] = value
+        depth_analysis = self.insights.get('url_patterns', {}).get('depth_analysis')
+        if depth_analysis is not None:
+            self.insights['url_patterns']['depth_analysis'] = defaultdict(
+                int, ((int(depth), count) for depth, count in depth_analysis.items()))
         
     def generate_advanced_insights_report(self):
         """إنشاء تقرير الاستبصارات المتقدمة"""
@@ -188,7 +304,7 @@ class AdvancedPatternsAnalyzer:
         report.append("🔬 تقرير التحليل المتقدم للأنماط والاستبصارات")
         report.append("=" * 70)
         report.append(f"📅 تاريخ التحليل: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"🔍 عدد الروابط المحللة: {len(self.all_links):,}")
+        report.append(f"🔍 عدد الروابط المحللة: {self.total_links:,}")
         report.append("")
         
         # تحليل أنماط URLs
@@ -199,17 +315,17 @@ class AdvancedPatternsAnalyzer:
             
             report.append("• توزيع عمق المسارات:")
             for depth, count in sorted(url_patterns['depth_analysis'].items()):
-                percentage = (count / len(self.all_links)) * 100
+                percentage = (count / self.total_links) * 100
                 report.append(f"  - عمق {depth}: {count:,} ({percentage:.1f}%)")
             
             report.append("• أنماط الترميز:")
             for pattern, count in url_patterns['encoding_patterns'].items():
-                percentage = (count / len(self.all_links)) * 100
+                percentage = (count / self.total_links) * 100
                 report.append(f"  - {pattern}: {count:,} ({percentage:.1f}%)")
             
             report.append("• استخدام الأحرف الخاصة:")
             for char_type, count in url_patterns['special_characters'].items():
-                percentage = (count / len(self.all_links)) * 100
+                percentage = (count / self.total_links) * 100
                 report.append(f"  - {char_type}: {count:,} ({percentage:.1f}%)")
             report.append("")
         
@@ -290,11 +406,41 @@ class AdvancedPatternsAnalyzer:
         print("🔬 بدء التحليل المتقدم للأنماط...")
         
         self.load_links()
-        self.analyze_url_patterns()
-        self.analyze_content_distribution()
-        self.analyze_popularity_indicators()
-        self.analyze_technical_patterns()
+        self.fold_links(self.all_links)
+        
+        return self.save_report()
+    
+    def run_incremental_analysis(self, checkpoint_file=CHECKPOINT_FILE):
+        """تحليل الروابط المضافة منذ آخر نقطة حفظ فقط ثم تحديث نقطة الحفظ"""
+        print("🔬 بدء التحليل التزايدي للأنماط...")
         
+        checkpoint = AnalysisCheckpoint(checkpoint_file, self.filename)
+        state = checkpoint.load()
+        if state is not None:
+            self.set_state(state)
+        new_links, tail_links = checkpoint.read_new_links()
+        print(f"✅ {self.total_links:,} رابط من نقطة الحفظ + {len(new_links) + len(tail_links):,} رابط جديد")
+        
+        self.fold_links(new_links)
+        checkpoint.save(self.get_state())
+        # السطر الأخير غير المكتمل يدخل في هذا التقرير فقط
+        self.fold_links(tail_links)
+        
+        return self.save_report()
+    
+    def verify_incremental_analysis(self, checkpoint_file=CHECKPOINT_FILE):
+        """تشغيل تزايدي ثم مقارنته بإعادة حساب كاملة من الصفر"""
+        incremental_report = self.run_incremental_analysis(checkpoint_file)
+        
+        full = AdvancedPatternsAnalyzer(self.filename)
+        full.load_links()
+        full.fold_links(full.all_links)
+        
+        return verify_against_full(self.get_state(), full.get_state(),
+                                   incremental_report, full.generate_advanced_insights_report())
+    
+    def save_report(self):
+        """إنشاء التقرير وحفظه"""
         report = self.generate_advanced_insights_report()
         
         # حفظ التقرير
@@ -306,7 +452,23 @@ class AdvancedPatternsAnalyzer:
         return report
 
 if __name__ == "__main__":
-    analyzer = AdvancedPatternsAnalyzer()
-    report = analyzer.run_analysis()
+    import argparse
+    parser = argparse.ArgumentParser(description='محلل الأنماط المتقدم')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--incremental', action='store_true', help='تحليل الروابط الجديدة منذ آخر نقطة حفظ فقط')
+    parser.add_argument('--verify', action='store_true', help='تحليل تزايدي ثم مقارنته بإعادة حساب كاملة')
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE, help='ملف نقطة الحفظ')
+    parser.add_argument('--timings', action='store_true', help='قياس زمن كل مؤشر في التمريرة المدمجة')
+    args = parser.parse_args()
+    
+    analyzer = AdvancedPatternsAnalyzer(args.filename, profile=args.timings)
+    if args.verify:
+        raise SystemExit(0 if analyzer.verify_incremental_analysis(args.checkpoint) else 1)
+    if args.incremental:
+        report = analyzer.run_incremental_analysis(args.checkpoint)
+    else:
+        report = analyzer.run_analysis()
     print("\n" + "="*70)
-    print(report)
\ No newline at end of file
+    print(report)
+    if args.timings:
+        analyzer.print_insight_timings()
\ No newline at end of file
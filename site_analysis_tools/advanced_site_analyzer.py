@@ -6,6 +6,7 @@
 تحليل عميق ومتقدم لفهم كل شيء في الموقع
 """
 
+import argparse
 import requests
 import re
 import json
@@ -16,27 +17,21 @@ from urllib.parse import unquote, urljoin, urlparse
 from collections import defaultdict, Counter
 import trafilatura
 import lxml.html
-from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 
-@dataclass
-class ContentMetadata:
-    id: str
-    title: str
-    url: str
-    content_type: str
-    language: str
-    year: Optional[str] = None
-    quality: Optional[str] = None
-    genre: Optional[str] = None
-    rating: Optional[str] = None
-    episode_number: Optional[str] = None
-    season_number: Optional[str] = None
-    series_name: Optional[str] = None
+from content_catalog import ContentCatalog, ContentMetadata, dump_json
+from http_cache import DEFAULT_CACHE_DIR, install_cache
+from id_stats import IdStats
+from language_detect import detect_language
+from link_index import load_link_index
+from url_canonical import unique_links
+from url_classifier import classify_url
 
 class AdvancedSiteAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
         self.session = self.setup_session()
+        # الصفحات المحفوظة من التشغيلات السابقة يُعاد التحقق منها بدلاً من تحميلها كاملة
+        self.http_cache = install_cache(self.session, cache_dir) if cache_dir else None
         self.analysis_results = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'site_structure': {},
@@ -69,15 +64,13 @@ class AdvancedSiteAnalyzer:
     def load_links_from_file(self, filename='site_links.txt'):
         """تحميل الروابط من الملف"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # الروابط من الفهرس المشترك
+            links = load_link_index(filename).links
+            # توحيد الصيغة وإزالة المكرر مع الحفاظ على ترتيب الملف
+            unique = unique_links(links)
             
-            # استخراج جميع الروابط
-            links = re.findall(r'https://ak\.sv[^\s]*', content)
-            unique_links = list(set(links))
-            
-            print(f"✅ تم تحميل {len(unique_links)} رابط فريد من أصل {len(links)} رابط")
-            return unique_links
+            print(f"✅ تم تحميل {len(unique)} رابط فريد من أصل {len(links)} رابط")
+            return unique
             
         except Exception as e:
             print(f"❌ خطأ في تحميل الملف: {e}")
@@ -97,66 +90,24 @@ class AdvancedSiteAnalyzer:
             'other': []
         }
         
-        id_ranges = {
-            'movies': {'min': float('inf'), 'max': 0, 'ids': []},
-            'series': {'min': float('inf'), 'max': 0, 'ids': []},
-            'episodes': {'min': float('inf'), 'max': 0, 'ids': []},
-            'shows': {'min': float('inf'), 'max': 0, 'ids': []},
-            'mix': {'min': float('inf'), 'max': 0, 'ids': []}
+        id_stats = {
+            'movies': IdStats(),
+            'series': IdStats(),
+            'episodes': IdStats(),
+            'shows': IdStats(),
+            'mix': IdStats()
         }
         
         for link in links:
             decoded_link = unquote(link)
+            match = classify_url(link)
             
-            # تحليل الأفلام
-            if '/movie/' in link:
-                match = re.search(r'/movie/(\d+)/', link)
-                if match:
-                    movie_id = int(match.group(1))
-                    patterns['movies'].append(decoded_link)
-                    id_ranges['movies']['ids'].append(movie_id)
-                    id_ranges['movies']['min'] = min(id_ranges['movies']['min'], movie_id)
-                    id_ranges['movies']['max'] = max(id_ranges['movies']['max'], movie_id)
-            
-            # تحليل المسلسلات
-            elif '/series/' in link:
-                match = re.search(r'/series/(\d+)/', link)
-                if match:
-                    series_id = int(match.group(1))
-                    patterns['series'].append(decoded_link)
-                    id_ranges['series']['ids'].append(series_id)
-                    id_ranges['series']['min'] = min(id_ranges['series']['min'], series_id)
-                    id_ranges['series']['max'] = max(id_ranges['series']['max'], series_id)
-            
-            # تحليل الحلقات
-            elif '/episode/' in link:
-                match = re.search(r'/episode/(\d+)/', link)
-                if match:
-                    episode_id = int(match.group(1))
-                    patterns['episodes'].append(decoded_link)
-                    id_ranges['episodes']['ids'].append(episode_id)
-                    id_ranges['episodes']['min'] = min(id_ranges['episodes']['min'], episode_id)
-                    id_ranges['episodes']['max'] = max(id_ranges['episodes']['max'], episode_id)
-            
-            # تحليل العروض
-            elif '/shows/' in link:
-                match = re.search(r'/shows/(\d+)/', link)
-                if match:
-                    show_id = int(match.group(1))
-                    patterns['shows'].append(decoded_link)
-                    id_ranges['shows']['ids'].append(show_id)
-                    id_ranges['shows']['min'] = min(id_ranges['shows']['min'], show_id)
-                    id_ranges['shows']['max'] = max(id_ranges['shows']['max'], show_id)
-            
-            # تحليل المنوعات
-            elif '/mix/' in link:
-                match = re.search(r'/mix/(\d+)/', link)
-                if match:
-                    mix_id = int(match.group(1))
-                    patterns['mix'].append(decoded_link)
-                    id_ranges['mix']['ids'].append(mix_id)
-                    id_ranges['mix']['min'] = min(id_ranges['mix']['min'], mix_id)
-                    id_ranges['mix']['max'] = max(id_ranges['mix']['max'], mix_id)
+            # تحليل المحتوى (أفلام، مسلسلات، حلقات، عروض، منوعات)
+            if match.category in id_stats:
+                if match.rest is not None:
+                    category = match.category
+                    patterns[category].append(decoded_link)
+                    id_stats[category].add(match.item_id)
             
             # الصفحات الإدارية
             elif any(admin in link for admin in ['/ad-policy', '/contactus', '/dmca', '/AKWAM-Notifications']):
@@ -173,10 +124,18 @@ class AdvancedSiteAnalyzer:
             else:
                 patterns['other'].append(decoded_link)
         
-        # تنظيف id_ranges من القيم اللانهائية
-        for content_type in id_ranges:
-            if id_ranges[content_type]['min'] == float('inf'):
-                id_ranges[content_type]['min'] = 0
+        # المدى والإحصائيات من مصفوفة المعرفات مرة واحدة بعد انتهاء الفحص
+        id_ranges = {}
+        for content_type, stats in id_stats.items():
+            id_ranges[content_type] = {
+                'min': stats.min() or 0,
+                'max': stats.max() or 0,
+                'ids': stats.ids,
+                'mean': stats.mean(),
+                'median': stats.median(),
+                'largest_gaps': stats.largest_gaps(5),
+                'density': stats.density(),
+            }
         
         return patterns, id_ranges
     
@@ -239,21 +198,8 @@ class AdvancedSiteAnalyzer:
         return metadata
     
     def detect_language(self, text):
-        """كشف اللغة من النص"""
-        arabic_chars = len(re.findall(r'[\u0600-\u06FF]', text))
-        total_chars = len(re.sub(r'[^a-zA-Z\u0600-\u06FF]', '', text))
-        
-        if total_chars == 0:
-            return 'unknown'
-        
-        arabic_ratio = arabic_chars / total_chars
-        
-        if arabic_ratio > 0.7:
-            return 'arabic'
-        elif arabic_ratio > 0.3:
-            return 'mixed'
-        else:
-            return 'english'
+        """كشف اللغة من النص (arabic / mixed / english / unknown)"""
+        return detect_language(text)
     
     def analyze_site_structure(self, base_url='https://ak.sv'):
         """تحليل بنية الموقع"""
@@ -557,20 +503,21 @@ class AdvancedSiteAnalyzer:
         
         return content_structure
     
-    def deep_content_analysis(self, links):
-        """تحليل عميق للمحتوى"""
+    def deep_content_analysis(self, links, limit=50):
+        """تحليل عميق للمحتوى (limit=None لكل الروابط)"""
         print("🔍 بدء التحليل العميق للمحتوى...")
         
+        # البيانات الوصفية تُخزن بالأعمدة (مناسب لتحليل الملف كاملاً)
         content_analysis = {
-            'movies': {'count': 0, 'samples': [], 'metadata': []},
-            'series': {'count': 0, 'samples': [], 'metadata': []},
-            'episodes': {'count': 0, 'samples': [], 'metadata': []},
-            'shows': {'count': 0, 'samples': [], 'metadata': []},
-            'mix': {'count': 0, 'samples': [], 'metadata': []}
+            'movies': {'count': 0, 'samples': [], 'metadata': ContentCatalog()},
+            'series': {'count': 0, 'samples': [], 'metadata': ContentCatalog()},
+            'episodes': {'count': 0, 'samples': [], 'metadata': ContentCatalog()},
+            'shows': {'count': 0, 'samples': [], 'metadata': ContentCatalog()},
+            'mix': {'count': 0, 'samples': [], 'metadata': ContentCatalog()}
         }
         
         # تحليل عينات من كل نوع محتوى
-        for link in links[:50]:  # تحليل أول 50 رابط كعينة
+        for link in links[:limit]:  # أول 50 رابط كعينة افتراضياً
             try:
                 if '/movie/' in link:
                     metadata = self.extract_content_metadata(link, 'movie')
@@ -620,8 +567,8 @@ class AdvancedSiteAnalyzer:
         
         return trends
     
-    def perform_comprehensive_analysis(self):
-        """تنفيذ التحليل الشامل"""
+    def perform_comprehensive_analysis(self, deep_limit=50):
+        """تنفيذ التحليل الشامل (deep_limit=None لتحليل البيانات الوصفية لكل الروابط)"""
         print("🚀 بدء التحليل الشامل المتطور...")
         
         # تحميل الروابط
@@ -643,7 +590,7 @@ class AdvancedSiteAnalyzer:
         self.analyze_site_structure()
         
         # التحليل العميق للمحتوى
-        self.deep_content_analysis(links)
+        self.deep_content_analysis(links, deep_limit)
         
         # تحليل الاتجاهات
         all_metadata = []
@@ -656,6 +603,8 @@ class AdvancedSiteAnalyzer:
         # حفظ النتائج
         self.save_analysis_results()
         
+        if self.http_cache:
+            print(self.http_cache.summary())
         print("✅ تم إكمال التحليل الشامل المتطور")
     
     def save_analysis_results(self):
@@ -665,9 +614,15 @@ class AdvancedSiteAnalyzer:
         # حفظ JSON مفصل
         json_filename = f'advanced_analysis_{timestamp}.json'
         with open(json_filename, 'w', encoding='utf-8') as f:
-            # تحويل ContentMetadata objects إلى dictionaries
+            # الكتالوجات تُكتب مباشرة من أعمدتها دون تحويلها إلى قواميس
             json_data = self.convert_analysis_to_json()
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+            dump_json(json_data, f, indent=2)
+        
+        # كتالوج المحتوى سطراً لكل عنصر
+        catalog_filename = f'advanced_catalog_{timestamp}.jsonl'
+        with open(catalog_filename, 'w', encoding='utf-8') as f:
+            for category in self.analysis_results['content_catalog'].values():
+                category['metadata'].write_jsonl(f)
         
         # حفظ تقرير نصي مقروء
         report_filename = f'تقرير_التحليل_المتطور_{timestamp}.md'
@@ -675,31 +630,20 @@ class AdvancedSiteAnalyzer:
         
         print(f"💾 تم حفظ النتائج في:")
         print(f"   - {json_filename}")
+        print(f"   - {catalog_filename}")
         print(f"   - {report_filename}")
     
     def convert_analysis_to_json(self):
         """تحويل نتائج التحليل إلى JSON"""
         json_data = dict(self.analysis_results)
         
-        # تحويل ContentMetadata objects
-        for category in json_data.get('content_catalog', {}).values():
-            if 'metadata' in category:
-                category['metadata'] = [
-                    {
-                        'id': m.id,
-                        'title': m.title,
-                        'url': m.url,
-                        'content_type': m.content_type,
-                        'language': m.language,
-                        'year': m.year,
-                        'quality': m.quality,
-                        'genre': m.genre,
-                        'rating': m.rating,
-                        'episode_number': m.episode_number,
-                        'season_number': m.season_number,
-                        'series_name': m.series_name
-                    } for m in category['metadata']
-                ]
+        # مصفوفات المعرفات (array) إلى قوائم
+        link_patterns = json_data.get('link_patterns')
+        if link_patterns:
+            json_data['link_patterns'] = dict(link_patterns, id_ranges={
+                content_type: dict(ranges, ids=ranges['ids'].tolist())
+                for content_type, ranges in link_patterns['id_ranges'].items()
+            })
         
         return json_data
     
@@ -733,6 +677,8 @@ class AdvancedSiteAnalyzer:
 - **أكبر معرف:** {ranges['max']:,}
 - **إجمالي المعرفات:** {len(ranges['ids']):,}
 - **النطاق:** {ranges['max'] - ranges['min']:,}
+- **المتوسط / الوسيط:** {ranges['mean']:,.0f} / {ranges['median']:,.0f}
+- **أكبر فجوة:** {max([gap for gap, _, _ in ranges['largest_gaps']], default=0):,}
 
 """)
             
@@ -794,5 +740,10 @@ class AdvancedSiteAnalyzer:
 """)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='التحليل المتطور الشامل لموقع AKWAM')
+    parser.add_argument('--deep-limit', type=int, default=50,
+                        help='عدد الروابط في التحليل العميق للمحتوى (0 = كل الروابط)')
+    args = parser.parse_args()
+
     analyzer = AdvancedSiteAnalyzer()
-    analyzer.perform_comprehensive_analysis()
\ No newline at end of file
+    analyzer.perform_comprehensive_analysis(args.deep_limit or None)
\ No newline at end of file
@@ -8,8 +8,10 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 import time
 
-def analyze_akwam_site():
-    """تحليل شامل لموقع ak.sv"""
+from http_cache import DEFAULT_CACHE_DIR, install_cache
+
+def analyze_akwam_site(cache_dir=DEFAULT_CACHE_DIR):
+    """تحليل شامل لموقع ak.sv (cache_dir=None لتحميل كل الصفحات دون ذاكرة HTTP)"""
     
     # إعداد الجلسة
     session = requests.Session()
@@ -18,6 +20,7 @@ def analyze_akwam_site():
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'ar,en;q=0.5'
     })
+    http_cache = install_cache(session, cache_dir) if cache_dir else None
     
     analysis_results = {
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -115,6 +118,8 @@ def analyze_akwam_site():
     except Exception as e:
         print(f"⚠️ خطأ في تحليل صفحة المسلسل: {e}")
     
+    if http_cache:
+        print(http_cache.summary())
     return analysis_results
 
 def analyze_content_types(html):
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+نقاط حفظ التحليل التزايدي - حفظ حالة المحلل مع آخر موضع (بالبايت) قرأه من ملف الروابط
+ليُضاف في التشغيل التالي الجزء الجديد فقط من الملف (الذي يُكتب بالإلحاق في نهايته)
+"""
+
+import json
+import os
+from datetime import datetime
+
+from link_stream import complete_length, iter_links, prefix_digest
+
+CHECKPOINT_VERSION = 2
+
+class AnalysisCheckpoint:
+    """نقطة حفظ واحدة لمحلل واحد وملف روابط واحد"""
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.offset = 0
+        self.new_offset = 0
+
+    def load(self):
+        """الحالة المحفوظة إذا كان الملف قد نما بإضافات في نهايته فقط، وإلا None"""
+        self.offset = 0
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != CHECKPOINT_VERSION or data.get('source') != self.source:
+            print(f"⚠️ نقطة الحفظ {self.path} لا تخص هذا الملف - إعادة التحليل من البداية")
+            return None
+        if prefix_digest(self.source, data['offset']) != data['digest']:
+            print(f"⚠️ تغيّر ملف الروابط منذ آخر نقطة حفظ - إعادة التحليل من البداية")
+            return None
+
+        self.offset = data['offset']
+        return data['state']
+
+    def read_new_links(self):
+        """
+        روابط الملف بعد آخر موضع محفوظ: (روابط الأسطر المكتملة، روابط السطر الأخير غير المكتمل)
+        السطر غير المكتمل يدخل في التقرير الحالي فقط ولا يُحفظ في الحالة
+        """
+        self.new_offset = complete_length(self.source)
+        complete, tail = [], []
+        for _, line_end, link in iter_links(self.source, self.offset, with_offsets=True):
+            if line_end <= self.new_offset:
+                complete.append(link)
+            else:
+                tail.append(link)
+        return complete, tail
+
+    def save(self, state):
+        """حفظ الحالة مع موضع نهاية آخر سطر مكتمل (كتابة ذرية)"""
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'source': self.source,
+            'offset': self.new_offset,
+            'digest': prefix_digest(self.source, self.new_offset),
+            'saved_at': datetime.now().isoformat(),
+            'state': state,
+        }
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.offset = self.new_offset
+
+def report_lines(report):
+    """أسطر التقرير دون سطر تاريخ التحليل (يختلف بين تشغيلين)"""
+    return [line for line in report.split('\n') if not line.startswith('📅')]
+
+def verify_against_full(incremental_state, full_state, incremental_report, full_report):
+    """مقارنة نتيجة التحليل التزايدي بإعادة الحساب الكاملة (الحالة والتقرير)"""
+    state_matches = (json.dumps(incremental_state, ensure_ascii=False)
+                     == json.dumps(full_state, ensure_ascii=False))
+    incremental_lines = report_lines(incremental_report)
+    full_lines = report_lines(full_report)
+
+    if state_matches and incremental_lines == full_lines:
+        print(f"✅ التحقق: التحليل التزايدي مطابق لإعادة الحساب الكاملة ({len(full_lines):,} سطر)")
+        return True
+
+    print("❌ التحقق: التحليل التزايدي يختلف عن إعادة الحساب الكاملة")
+    if not state_matches:
+        print("  - الحالة التراكمية مختلفة")
+    for number, (incremental, full) in enumerate(zip(incremental_lines, full_lines), 1):
+        if incremental != full:
+            print(f"  - أول اختلاف في السطر {number}:")
+            print(f"    تزايدي: {incremental}")
+            print(f"    كامل:   {full}")
+            break
+    else:
+        if len(incremental_lines) != len(full_lines):
+            print(f"  - عدد الأسطر: {len(incremental_lines):,} مقابل {len(full_lines):,}")
+    return False
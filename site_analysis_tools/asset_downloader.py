@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تحميل الأصول في الخلفية - جلسة requests واحدة باتصالات دائمة ومجموعة خيوط محدودة تكتب كل ملف
+على أجزاء أثناء وصوله (إلى ملف .part يُعاد تسميته عند الاكتمال)، وتُرسل أصول كل صفحة دفعة واحدة
+فيستمر تحميلها بينما ينتقل الزاحف إلى الصفحة التالية.
+مع مخزن أصول مشترك (AssetStore) يُحمل كل رابط مرة واحدة لكل الصفحات ويُحفظ باسم بصمة محتواه
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fetch_engine import pooled_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 15
+CHUNK_SIZE = 64 * 1024
+
+class AssetBatch:
+    """
+    أصول صفحة واحدة: [(البيانات، Future)] - result() تعيد بيانات الأصول التي حُفظت بنفس الترتيب،
+    ودوال add_done_callback تُستدعى مرة واحدة عند اكتمال آخر أصل (في خيط التحميل)
+    """
+
+    def __init__(self, items, futures, on_complete=None):
+        self.items = items
+        self.futures = futures
+        self._lock = threading.Lock()
+        self._remaining = len(futures)
+        self._callbacks = []
+        self._on_complete = on_complete
+        for future in futures:
+            future.add_done_callback(self._finished)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _finished(self, future):
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining:
+                return
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+        if self._on_complete:
+            self._on_complete()
+
+    def _run(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            logger.error(f"خطأ في معالجة نتيجة تحميل الأصول: {e}")
+
+    def done(self):
+        return self._remaining == 0
+
+    def add_done_callback(self, callback):
+        with self._lock:
+            if self._remaining:
+                self._callbacks.append(callback)
+                return
+        self._run(callback)
+
+    def result(self):
+        return [item for item, future in zip(self.items, self.futures) if future.result()]
+
+    def saved(self):
+        """[(البيانات، مسار الملف المحفوظ)] للأصول التي حُفظت"""
+        return [(item, future.result()) for item, future in zip(self.items, self.futures) if future.result()]
+
+class AssetDownloader:
+    """
+    تحميل الأصول: download متزامن لأصل واحد، و submit_batch لأصول صفحة كاملة في الخلفية
+    (مع store تُحفظ الملفات في المخزن المشترك ويكون المسار الناتج مسار المخزن أو رابطاً صلباً له)
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, user_agent=None, session=None,
+                 chunk_size=CHUNK_SIZE, store=None):
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.store = store
+        self.session = pooled_session(session, workers)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self._lock = threading.Condition()
+        # مسار الملف (أو الرابط مع المخزن) -> Future: نفس الأصل من عدة صفحات يُحمل مرة واحدة
+        self._pending = {}
+        self._active = 0    # تحميلات ودفعات لم تكتمل بعد (wait تنتظر حتى تصبح صفراً)
+        self.downloaded = 0
+        self.failed = 0
+
+    def download(self, url, filepath):
+        """تحميل أصل واحد إلى filepath (المسار عند النجاح أو إذا كان الملف موجوداً، وإلا None)"""
+        if self.store is not None:
+            return self._download_to_store(url, filepath)
+        if os.path.exists(filepath):
+            return filepath
+        partial = f"{filepath}.part"
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    logger.warning(f"فشل تحميل الأصل {url}: كود الحالة {response.status_code}")
+                    self._count(failed=True)
+                    return None
+                os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+                with open(partial, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+            os.replace(partial, filepath)
+        except Exception as e:
+            logger.error(f"خطأ في تحميل الأصل {url}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            self._count(failed=True)
+            return None
+        self._count()
+        return filepath
+
+    def _download_to_store(self, url, filepath):
+        asset = self.store.get(url)
+        if asset is None:
+            try:
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    if response.status_code != 200:
+                        logger.warning(f"فشل تحميل الأصل {url}: كود الحالة {response.status_code}")
+                        self._count(failed=True)
+                        return None
+                    asset = self.store.add(url, response.iter_content(chunk_size=self.chunk_size),
+                                           response.headers.get('Content-Type'))
+            except Exception as e:
+                logger.error(f"خطأ في تحميل الأصل {url}: {e}")
+                self._count(failed=True)
+                return None
+            self._count()
+        return self.store.place(asset, filepath)
+
+    def _count(self, failed=False):
+        with self._lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.downloaded += 1
+
+    def submit(self, url, filepath):
+        """Future بمسار الملف (أو None)، والملفات الموجودة لا تُرسل للتحميل"""
+        key = filepath if self.store is None else url
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                # مع المخزن: صفحة أخرى تنتظر نفس التحميل ثم تضع مرجعه في مجلدها
+                return future if self.store is None else self._then_place(future, url, filepath)
+            existing = self._existing(url, filepath)
+            if existing is not None:
+                future = Future()
+                future.set_result(existing)
+                return future
+            future = self._pending[key] = self.executor.submit(self.download, url, filepath)
+            self._active += 1
+        future.add_done_callback(lambda _: self._release(key))
+        return future
+
+    def _existing(self, url, filepath):
+        if self.store is None:
+            return filepath if os.path.exists(filepath) else None
+        asset = self.store.get(url)
+        return self.store.place(asset, filepath) if asset else None
+
+    def _then_place(self, first, url, filepath):
+        placed = Future()
+        first.add_done_callback(
+            lambda first: placed.set_result(first.result() and self.store.place(self.store.get(url), filepath)))
+        return placed
+
+    def _release(self, key=None):
+        with self._lock:
+            if key is not None:
+                self._pending.pop(key, None)
+            self._active -= 1
+            if not self._active:
+                self._lock.notify_all()
+
+    def submit_batch(self, jobs):
+        """jobs: [(الرابط، مسار الملف، البيانات)] -> AssetBatch لا تنتظر اكتمال التحميل"""
+        futures = [self.submit(url, filepath) for url, filepath, _ in jobs]
+        if futures:
+            with self._lock:
+                self._active += 1
+        return AssetBatch([item for _, _, item in jobs], futures, on_complete=self._release)
+
+    def wait(self):
+        """انتظار كل التحميلات المرسلة حتى الآن (ودوال اكتمال دفعاتها)"""
+        with self._lock:
+            self._lock.wait_for(lambda: not self._active)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مخزن الأصول المشترك بين الصفحات - كل أصل يُحفظ مرة واحدة باسم بصمة SHA-256 لمحتواه
+(objects/ab/<sha256>.<ext>)، مع فهرس يربط كل رابط ببصمته فلا يُعاد تحميل نفس ملفات CSS و JS
+والخطوط والشعار لكل صفحة، ولا يُكتب نفس المحتوى مرتين ولو جاء من روابط مختلفة.
+الصفحات تشير إلى ملفات المخزن (أو روابط صلبة لها داخل مجلد الصفحة) بدلاً من نسخها
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import NamedTuple, Optional
+from urllib.parse import urlparse
+
+INDEX_FILE = 'index.json'
+OBJECTS_DIR = 'objects'
+
+class StoredAsset(NamedTuple):
+    sha256: str
+    # مسار الملف نسبةً إلى جذر المخزن
+    path: str
+    size: int
+    content_type: Optional[str]
+
+def object_name(sha256, url):
+    """اسم ملف المحتوى: البصمة مع امتداد الرابط (حتى يُعرف نوع الملف عند فتحه)"""
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    if not extension[1:].isalnum() or len(extension) > 6:
+        extension = ''
+    return os.path.join(OBJECTS_DIR, sha256[:2], sha256 + extension)
+
+class AssetStore:
+    """
+    المخزن: get(رابط) للأصل المحفوظ، add(رابط، أجزاء المحتوى) لحفظ أصل جديد أثناء تحميله،
+    place لمرجعه في مجلد صفحة، و save لحفظ الفهرس (يُقرأ تلقائياً في التشغيل التالي)
+    """
+
+    def __init__(self, root, hardlinks=False):
+        self.root = root
+        self.hardlinks = hardlinks
+        self._lock = threading.Lock()
+        self.urls = {}      # الرابط -> StoredAsset
+        self.objects = {}   # البصمة -> StoredAsset (أول رابط حُفظ به المحتوى)
+        self.duplicate_bytes = 0  # حجم محتوى تكرر تحت روابط مختلفة ولم يُكتب مرة ثانية
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.root, INDEX_FILE), encoding='utf-8') as f:
+                entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for url, entry in entries.items():
+            asset = StoredAsset(**entry)
+            # الملفات المحذوفة من المخزن تُحمل من جديد
+            if os.path.exists(self.path(asset)):
+                self.urls[url] = asset
+                self.objects.setdefault(asset.sha256, asset)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def get(self, url):
+        return self.urls.get(url)
+
+    def path(self, asset):
+        return os.path.join(self.root, asset.path)
+
+    def add(self, url, chunks, content_type=None):
+        """حفظ المحتوى أثناء وصوله في ملف مؤقت مع حساب بصمته، ثم نقله إلى مكانه إن كان جديداً"""
+        digest = hashlib.sha256()
+        size = 0
+        descriptor, temporary = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            with self._lock:
+                asset = self.objects.get(sha256)
+                if asset is None:
+                    asset = StoredAsset(sha256, object_name(sha256, url), size, content_type)
+                    os.makedirs(os.path.dirname(self.path(asset)), exist_ok=True)
+                    os.replace(temporary, self.path(asset))
+                    self.objects[sha256] = asset
+                else:
+                    self.duplicate_bytes += size
+                self.urls[url] = asset
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return asset
+
+    def place(self, asset, filepath):
+        """
+        مسار الأصل لصفحة: ملف المخزن نفسه، أو رابط صلب له في filepath إذا كان hardlinks مفعلاً
+        (نظام ملفات لا يدعم الروابط الصلبة يُرجع ملف المخزن)
+        """
+        source = self.path(asset)
+        if not self.hardlinks:
+            return source
+        try:
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            if not os.path.exists(filepath):
+                os.link(source, filepath)
+            return filepath
+        except OSError:
+            return source
+
+    def stats(self):
+        return {
+            'urls': len(self.urls),
+            'objects': len(self.objects),
+            'bytes': sum(asset.size for asset in self.objects.values()),
+            'duplicate_bytes': self.duplicate_bytes,
+        }
+
+    def save(self):
+        """حفظ الفهرس (بكتابة ملف مؤقت ثم استبداله حتى لا يبقى فهرس ناقص)"""
+        with self._lock:
+            entries = {url: asset._asdict() for url, asset in self.urls.items()}
+        index_path = os.path.join(self.root, INDEX_FILE)
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(index_path + '.tmp', index_path)
@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياسات أداء أدوات تحليل الروابط على ملف site_links.txt الحقيقي
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import urllib.parse
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from advanced_patterns_analyzer import AdvancedPatternsAnalyzer
+from content_catalog import CONTENT_FIELDS, ContentCatalog, ContentMetadata, dump_json
+from deep_links_analyzer import DeepLinksAnalyzer
+from facet_index import FacetIndex
+from hierarchical_organizer import HierarchicalLinksOrganizer
+from id_stats import IdStats
+from keyword_matcher import GENRE_KEYWORDS, KeywordMatcher
+from language_detect import detect_language, detect_languages
+from link_decode import cache_stats, clear_caches, link_title
+from link_index import load_link_index
+from link_scoring import LinkScorer, extract_features
+from link_stream import iter_links
+from near_duplicates import find_near_duplicates, jaccard, shingles, title_entries
+from report_writer import ReportWriter
+from series_index import SeriesIndex, series_key
+from sharded import resolve_workers, run_sharded
+from site_structure_analyzer import SiteStructureAnalyzer
+from smart_organizer import SmartLinksOrganizer
+from title_search import TitleIndex, normalize_text, title_items
+from url_classifier import classify_url
+
+def best_time(func, repeat=5):
+    """أفضل زمن من عدة تكرارات"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def report(title, rows, count, unit='رابط'):
+    """طباعة جدول نتائج مع نسبة التسريع مقارنة بالصف الأول"""
+    print(f"\n⏱️ {title} ({count:,} {unit})")
+    print("-" * 60)
+    baseline = rows[0][1]
+    for name, seconds in rows:
+        rate = count / seconds if seconds else float('inf')
+        print(f"  {name:<28} {seconds * 1000:9.1f} ms  {rate:>12,.0f} {unit}/ث  x{baseline / seconds:.2f}")
+
+# ==================== المصنف ====================
+
+def legacy_cascade(link):
+    """السلسلة القديمة: فحوص نصية متتالية ثم re.search ثانٍ لاستخراج المعرف"""
+    if '/movie/' in link:
+        category = 'movies'
+        match = re.search(r'/movie/(\d+)/', link)
+    elif '/series/' in link:
+        category = 'series'
+        match = re.search(r'/series/(\d+)/', link)
+    elif '/episode/' in link:
+        category = 'episodes'
+        match = re.search(r'/episode/(\d+)/', link)
+    elif '/shows/' in link or '/show/' in link:
+        category = 'shows'
+        match = re.search(r'/shows?/(\d+)/', link)
+    elif '/person/' in link:
+        category = 'persons'
+        match = re.search(r'/person/(\d+)/', link)
+    elif '/mix/' in link:
+        category = 'mix'
+        match = re.search(r'/mix/(\d+)/', link)
+    else:
+        return None, 0
+    return category, int(match.group(1)) if match else 0
+
+def legacy_smart_categories(links):
+    """تصنيف المنظم الذكي القديم: قائمة لكل نوع ثم حساب "أخرى" بالبحث في القوائم"""
+    categories = {
+        'movies': [link for link in links if '/movie/' in link],
+        'series': [link for link in links if '/series/' in link],
+        'episodes': [link for link in links if '/episode/' in link],
+        'shows': [link for link in links if '/shows/' in link or '/show/' in link],
+        'persons': [link for link in links if '/person/' in link],
+        'mix': [link for link in links if '/mix/' in link],
+    }
+    all_categorized = sum(categories.values(), [])
+    categories['others'] = [link for link in links if link not in all_categorized]
+    return categories
+
+def classifier_categories(links):
+    """التصنيف الحالي: مرور واحد بالمصنف الموحد"""
+    categories = {name: [] for name in ('movies', 'series', 'episodes', 'shows', 'persons', 'mix', 'others')}
+    for link in links:
+        categories[classify_url(link).category or 'others'].append(link)
+    return categories
+
+def bench_classifier(filename):
+    links = load_link_index(filename).links
+
+    def run_legacy():
+        for link in links:
+            legacy_cascade(link)
+
+    def run_classifier():
+        for link in links:
+            classify_url(link)
+
+    report("تصنيف الروابط واستخراج المعرف", [
+        ('السلسلة القديمة', best_time(run_legacy)),
+        ('المصنف الموحد', best_time(run_classifier)),
+    ], len(links))
+
+    report("تقسيم الروابط إلى فئات (المنظم الذكي)", [
+        ('القوائم المتتالية القديمة', best_time(lambda: legacy_smart_categories(links), repeat=1)),
+        ('مرور واحد بالمصنف', best_time(lambda: classifier_categories(links))),
+    ], len(links))
+
+# ==================== التحميل ====================
+
+def legacy_load(filename):
+    """التحميل القديم: قراءة الملف كاملاً ثم تقسيمه"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        content = f.read()
+    for line in content.strip().split('\n'):
+        line = line.strip()
+        if line.startswith('https://ak.sv/'):
+            yield line
+
+def peak_memory(func):
+    """أقصى ذاكرة مخصصة أثناء تنفيذ الدالة"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_loader(filename):
+    loaders = [('قراءة الملف كاملاً', legacy_load), ('mmap متدفق', iter_links)]
+    count = sum(1 for _ in iter_links(filename))
+    report("تحميل الروابط من الملف", [
+        (name, best_time(lambda: sum(1 for _ in loader(filename)))) for name, loader in loaders
+    ], count)
+    for name, loader in loaders:
+        peak = peak_memory(lambda: sum(1 for _ in loader(filename)))
+        print(f"  {name:<28} ذروة الذاكرة: {peak / 1024 / 1024:.1f} MB")
+
+# ==================== التنفيذ المجزأ ====================
+
+def bench_sharded(filename):
+    index = load_link_index(filename)
+    workers = resolve_workers(None)
+    # المنظمان يعملان على سجلات الفهرس، ومحلل البنية على الروابط نفسها
+    for name, collect, items in [('المنظم الذكي', SmartLinksOrganizer.collect_aggregates, index.records),
+                                 ('المنظم الهرمي', HierarchicalLinksOrganizer.collect_aggregates, index.records),
+                                 ('محلل بنية الموقع', SiteStructureAnalyzer.collect_aggregates, index.links)]:
+        report(f"تجميعات {name}", [
+            ('عملية واحدة', best_time(lambda: run_sharded(collect, items), repeat=3)),
+            (f'{workers} عمليات', best_time(lambda: run_sharded(collect, items, workers), repeat=3)),
+        ], len(items))
+
+# ==================== المحلل العميق ====================
+
+def deep_separate_passes(links):
+    """التحليلات الخمسة كل منها بتمريرة مستقلة على الروابط"""
+    analyzer = DeepLinksAnalyzer()
+    analyzer.analyze_structure(links)
+    analyzer.analyze_movies(links)
+    analyzer.analyze_series(links)
+    analyzer.analyze_episodes(links)
+    analyzer.analyze_persons(links)
+    return analyzer
+
+def deep_fused_pass(links):
+    analyzer = DeepLinksAnalyzer()
+    analyzer.fold_links(links)
+    return analyzer
+
+def bench_deep(filename):
+    links = load_link_index(filename).links
+    separate, fused = deep_separate_passes(links), deep_fused_pass(links)
+    assert (separate.detailed_analysis, separate.categories, separate.patterns) == \
+           (fused.detailed_analysis, fused.categories, fused.patterns)
+    report("التحليل العميق (DeepLinksAnalyzer)", [
+        ('خمس تمريرات منفصلة', best_time(lambda: deep_separate_passes(links))),
+        ('تمريرة واحدة مدمجة', best_time(lambda: deep_fused_pass(links))),
+    ], len(links))
+
+# ==================== محلل الأنماط المتقدم ====================
+
+def patterns_separate_passes(links):
+    """المؤشرات الأربعة كل منها بتمريرة مستقلة على الروابط"""
+    analyzer = AdvancedPatternsAnalyzer()
+    analyzer.analyze_url_patterns(links)
+    analyzer.analyze_content_distribution(links)
+    analyzer.analyze_popularity_indicators(links)
+    analyzer.analyze_technical_patterns(links)
+    return analyzer
+
+def patterns_fused_pass(links, profile=False):
+    analyzer = AdvancedPatternsAnalyzer(profile=profile)
+    analyzer.fold_links(links)
+    return analyzer
+
+def bench_patterns(filename):
+    links = load_link_index(filename).links
+    assert patterns_separate_passes(links).insights == patterns_fused_pass(links).insights
+    report("محلل الأنماط المتقدم (AdvancedPatternsAnalyzer)", [
+        ('أربع تمريرات منفصلة', best_time(lambda: patterns_separate_passes(links))),
+        ('تمريرة واحدة مدمجة', best_time(lambda: patterns_fused_pass(links))),
+    ], len(links))
+    patterns_fused_pass(links, profile=True).print_insight_timings()
+
+# ==================== ذاكرة فك الترميز ====================
+
+# عدد مرات استخراج عنوان الرابط نفسه في تشغيل كامل للمنظمات (النقاط، النوع، العمق، البنية...)
+TITLE_LOOKUPS_PER_LINK = 5
+
+def bench_decode(filename):
+    links = load_link_index(filename).links
+
+    def direct():
+        for _ in range(TITLE_LOOKUPS_PER_LINK):
+            for link in links:
+                urllib.parse.unquote(link.split('/')[-1])
+
+    def cached():
+        for _ in range(TITLE_LOOKUPS_PER_LINK):
+            for link in links:
+                link_title(link)
+
+    clear_caches()
+    report("استخراج العناوين المفكوكة", [
+        ('unquote مباشرة', best_time(direct)),
+        ('ذاكرة LRU مشتركة', best_time(cached)),
+    ], len(links) * TITLE_LOOKUPS_PER_LINK, unit='عنوان')
+    print(f"  نسبة الإصابة: {cache_stats()['link_title']['hit_rate'] * 100:.1f}%")
+
+# ==================== نقاط الشعبية ====================
+
+def smart_ranked_lists(records):
+    """القوائم التي يرتبها الملف الذكي مع عدد ما يُعرض من كل منها"""
+    aggregates = SmartLinksOrganizer.collect_aggregates(records)
+    categories = aggregates['categories']
+    lists = [(categories['movies'], 50), (categories['series'], 30)]
+    lists += [(genre_movies, 10) for genre_movies in aggregates['movie_genres'].values() if len(genre_movies) >= 5]
+    lists += [(aggregates['arabic_content'], 20), (categories['persons'], 25)]
+    return lists
+
+def legacy_ranking(links, lists, scorer):
+    """ترتيب كل قائمة كاملة مع حساب النقاط داخل مفتاح الترتيب ثم أخذ أولها"""
+    def smart_key(link):
+        features = extract_features(link)
+        return (-scorer.score_features(features), -features.item_id)
+    return [sorted(ranked, key=smart_key)[:count] for ranked, count in lists]
+
+def topk_ranking(links, lists, scorer):
+    features = [extract_features(link) for link in links]
+    rank_keys = scorer.rank_keys(links, scorer.score_batch(features),
+                                 [link_features.item_id for link_features in features])
+    return [scorer.top_k(ranked, count, rank_keys) for ranked, count in lists]
+
+def bench_scoring(filename):
+    index = load_link_index(filename)
+    links = index.links
+    lists = smart_ranked_lists(index.records)
+    scorer = LinkScorer()
+    assert legacy_ranking(links, lists, scorer) == topk_ranking(links, lists, scorer)
+    report(f"ترتيب الشعبية واختيار الأفضل ({len(lists)} قائمة)", [
+        ('نقاط داخل مفتاح الترتيب', best_time(lambda: legacy_ranking(links, lists, scorer))),
+        ('خصائص مسبقة + كومة K', best_time(lambda: topk_ranking(links, lists, scorer))),
+    ], len(links))
+
+def legacy_genres(links, table):
+    """أول نوع تظهر إحدى كلماته بحلقة متداخلة على الأنواع والكلمات"""
+    genres = []
+    for link in links:
+        link_lower = link.lower()
+        title = link_title(link).lower()
+        genres.append(next((genre for genre, keywords in table.items()
+                            if any(keyword in link_lower or keyword in title for keyword in keywords)), None))
+    return genres
+
+def matcher_genres(links, matcher):
+    return [matcher.first_tag(link, link_title(link)) for link in links]
+
+def bench_keywords(filename, extra_tags=300):
+    links = load_link_index(filename).links
+    rng = random.Random(0)
+    # جدول موسع بكلمات عشوائية لقياس أثر نمو القاموس
+    large_table = dict(GENRE_KEYWORDS)
+    for tag in range(extra_tags):
+        large_table[f'tag{tag}'] = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=7)) for _ in range(10)]
+
+    for table in (GENRE_KEYWORDS, large_table):
+        matcher = KeywordMatcher(table)
+        assert legacy_genres(links, table) == matcher_genres(links, matcher)
+        report(f"وسم الأنواع ({len(matcher):,} كلمة)", [
+            ('حلقة الأنواع × الكلمات', best_time(lambda: legacy_genres(links, table), repeat=3)),
+            ('Aho-Corasick', best_time(lambda: matcher_genres(links, matcher), repeat=3)),
+        ], len(links))
+
+def legacy_detect_language(text):
+    """عد الحروف بتعبيرين منتظمين (findall ثم sub) لكل نص"""
+    arabic_chars = len(re.findall(r'[\u0600-\u06FF]', text))
+    total_chars = len(re.sub(r'[^a-zA-Z\u0600-\u06FF]', '', text))
+    if total_chars == 0:
+        return 'unknown'
+    arabic_ratio = arabic_chars / total_chars
+    if arabic_ratio > 0.7:
+        return 'arabic'
+    elif arabic_ratio > 0.3:
+        return 'mixed'
+    return 'english'
+
+def bench_language(filename):
+    links = load_link_index(filename).links
+    # العناوين المفكوكة والخام (المرمزة) معاً
+    titles = [link_title(link) for link in links] + [link.rsplit('/', 1)[-1] for link in links]
+    expected = [legacy_detect_language(title) for title in titles]
+    assert expected == [detect_language(title) for title in titles] == detect_languages(titles)
+    report("كشف لغة العناوين", [
+        ('findall + sub لكل عنوان', best_time(lambda: [legacy_detect_language(title) for title in titles])),
+        ('بايتات UTF-8 لكل عنوان', best_time(lambda: [detect_language(title) for title in titles])),
+        ('دفعة واحدة', best_time(lambda: detect_languages(titles))),
+    ], len(titles), unit='عنوان')
+
+def report_lines(links, repeat):
+    """أسطر تقرير بحجم التقارير المنظمة (رقم ومعرف وعنوان ثم الرابط لكل عنصر)"""
+    for _ in range(repeat):
+        for i, link in enumerate(links, 1):
+            yield f"{i:4d}. [{classify_url(link).item_id or 0:>5}] {link_title(link)}"
+            yield f"      {link}"
+
+def write_joined(path, lines):
+    """الطريقة القديمة: تجميع الأسطر في قائمة ثم '\n'.join والكتابة مرة واحدة"""
+    output_content = list(lines)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(output_content))
+
+def write_streamed(path, lines, compression=None):
+    with ReportWriter(path, compression) as report:
+        report.extend(lines)
+
+def bench_report(filename, repeat=5):
+    links = load_link_index(filename).links
+    lines = list(report_lines(links, repeat))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.txt')
+        write_joined(path, lines)
+        with open(path, encoding='utf-8') as f:
+            expected = f.read()
+        write_streamed(path, lines)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == expected
+        size = os.path.getsize(path)
+
+        writers = [
+            ('قائمة + join', write_joined),
+            ('متدفق', write_streamed),
+            ('متدفق + gzip', lambda path, lines: write_streamed(path, lines, 'gzip')),
+        ]
+        # الزمن لكتابة أسطر جاهزة، والذاكرة أثناء توليد الأسطر وكتابتها كما في المنظمات
+        report(f"كتابة تقرير ({size / 1024 / 1024:.1f} MB)", [
+            (name, best_time(lambda: write(path, lines))) for name, write in writers
+        ], len(lines), unit='سطر')
+        for name, write in writers:
+            peak = peak_memory(lambda: write(path, report_lines(links, repeat)))
+            print(f"  {name:<28} ذروة الذاكرة: {peak / 1024 / 1024:.1f} MB")
+
+def scan_series_episodes(index, name):
+    """إعادة فحص كل روابط الحلقات للعثور على حلقات مسلسل واحد"""
+    key = series_key(name)
+    found = []
+    for record in index.kind('episode'):
+        if record.series_slug and series_key(record.series_slug) == key:
+            found.append(record.item_id)
+    return sorted(found)
+
+def bench_series(filename, queries=50):
+    index = load_link_index(filename)
+    series_index = SeriesIndex.from_index(index)
+    names = sorted(entry['name'] for entry in series_index.series.values()
+                   if any(data['episodes'] for data in entry['seasons'].values()))
+    names = random.Random(0).sample(names, min(queries, len(names)))
+    for name in names:
+        assert scan_series_episodes(index, name) == sorted(ref.item_id for ref in series_index.episodes(name))
+    report("حلقات مسلسل", [
+        ('إعادة فحص الروابط', best_time(lambda: [scan_series_episodes(index, name) for name in names], repeat=3)),
+        ('فهرس المسلسلات', best_time(lambda: [series_index.episodes(name) for name in names])),
+    ], len(names), unit='استعلام')
+    report("بناء فهرس المسلسلات", [
+        ('من الفهرس المشترك', best_time(lambda: SeriesIndex.from_index(index), repeat=3)),
+        ('من الحالة المحفوظة', best_time(lambda: SeriesIndex.from_state(series_index.to_state()), repeat=3)),
+    ], len(series_index), unit='مسلسل')
+
+# ==================== كتالوج المحتوى ====================
+
+@dataclass
+class LegacyContentMetadata:
+    """ContentMetadata السابق: قاموس لكل كائن ومعرف نصي"""
+    id: str
+    title: str
+    url: str
+    content_type: str
+    language: str
+    year: Optional[str] = None
+    quality: Optional[str] = None
+    genre: Optional[str] = None
+    rating: Optional[str] = None
+    episode_number: Optional[str] = None
+    season_number: Optional[str] = None
+    series_name: Optional[str] = None
+
+def catalog_rows(filename, copies):
+    rows = []
+    for record in load_link_index(filename).records:
+        if record.kind in ('movie', 'series', 'episode') and record.item_id:
+            language = detect_language(record.title)
+            season = str(record.season) if record.season else None
+            rows.append((str(record.item_id), record.title.replace('-', ' '), record.url, record.kind, language, season))
+    return rows * copies
+
+def legacy_catalog_json(rows):
+    items = [LegacyContentMetadata(item_id, title, url, kind, language, season_number=season)
+             for item_id, title, url, kind, language, season in rows]
+    output = io.StringIO()
+    json.dump({'metadata': [{name: getattr(item, name) for name in CONTENT_FIELDS} for item in items]},
+              output, ensure_ascii=False, indent=2)
+    return output.tell()
+
+def columnar_catalog_json(rows):
+    catalog = ContentCatalog()
+    for item_id, title, url, kind, language, season in rows:
+        catalog.add(item_id, title, url, kind, language, season_number=season)
+    output = io.StringIO()
+    dump_json({'metadata': catalog}, output, indent=2)
+    return output.tell()
+
+def bench_catalog(filename, copies=10):
+    rows = catalog_rows(filename, copies)
+    report("كتالوج المحتوى (بناء + JSON)", [
+        ('dataclass + قواميس', best_time(lambda: legacy_catalog_json(rows), repeat=1)),
+        ('ContentCatalog', best_time(lambda: columnar_catalog_json(rows), repeat=1)),
+    ], len(rows), unit='عنصر')
+    # ذاكرة الكائنات نفسها (دون ملف JSON الناتج)
+    for name, build in [('dataclass', lambda: [LegacyContentMetadata(*row[:5], season_number=row[5]) for row in rows]),
+                        ('slots', lambda: [ContentMetadata(*row[:5], season_number=row[5]) for row in rows]),
+                        ('ContentCatalog', lambda: ContentCatalog(ContentMetadata(*row[:5], season_number=row[5])
+                                                                  for row in rows))]:
+        peak = peak_memory(build)
+        print(f"  {name:<28} ذروة الذاكرة: {peak / 1024 / 1024:.1f} MB")
+
+# ==================== فهرس المعاملات ====================
+
+def legacy_parameters(links):
+    """قائمة بكل قيمة لكل معامل كما كان يجمعها محلل البنية"""
+    parameters = defaultdict(list)
+    for link in links:
+        if '?' in link:
+            for param in link.split('?')[1].split('&'):
+                if '=' in param:
+                    key, value = param.split('=', 1)
+                    parameters[key].append(value)
+    return {key: (len(values), len(set(values))) for key, values in parameters.items()}
+
+def facet_parameters(links):
+    index = FacetIndex(links)
+    return {key: (index.usage(key), index.cardinality(key)) for key in index}
+
+def bench_facets(filename, pages=50):
+    listing = [link for link in load_link_index(filename).links if '?' in link]
+    # كل صفحة تصفح بخمسين رقم صفحة (زحف كامل لصفحات الفلاتر)
+    links = [f"{link}&page={page}" if 'page=' not in link else link
+             for link in listing for page in range(1, pages + 1)]
+    assert legacy_parameters(links) == facet_parameters(links)
+    report("عدادات المعاملات", [
+        ('قوائم القيم', best_time(lambda: legacy_parameters(links), repeat=3)),
+        ('FacetIndex', best_time(lambda: facet_parameters(links), repeat=3)),
+    ], len(links))
+    for name, build in [('قوائم القيم', legacy_parameters), ('FacetIndex', facet_parameters)]:
+        peak = peak_memory(lambda: build(links))
+        print(f"  {name:<28} ذروة الذاكرة: {peak / 1024 / 1024:.1f} MB")
+
+# ==================== المحتوى شبه المكرر ====================
+
+def all_pairs_duplicates(entries, threshold=0.85):
+    """مقارنة كل زوج من العناوين (تكلفة تربيعية)"""
+    shingle_sets = [shingles(text) for _, text in entries]
+    pairs = set()
+    for first in range(len(entries)):
+        for second in range(first + 1, len(entries)):
+            if (entries[first][0].group == entries[second][0].group
+                    and jaccard(shingle_sets[first], shingle_sets[second]) >= threshold):
+                pairs.add((first, second))
+    return pairs
+
+def clustered_urls(clusters):
+    return {frozenset([cluster.representative.url] + [entry.url for entry, _ in cluster.members])
+            for cluster in clusters}
+
+def bench_near_duplicates(filename, sample=2000):
+    entries = title_entries(load_link_index(filename))
+    sampled = entries[:sample]
+    expected = all_pairs_duplicates(sampled)
+    found = clustered_urls(find_near_duplicates(sampled))
+    # كل زوج تجده المقارنة الكاملة يقع في نفس مجموعة LSH
+    grouped = {url: group for group in found for url in group}
+    missed = sum(1 for first, second in expected
+                 if grouped.get(sampled[first][0].url) is not grouped.get(sampled[second][0].url)
+                 or sampled[first][0].url not in grouped)
+    print(f"  أزواج المقارنة الكاملة: {len(expected):,}، فاتت LSH: {missed}")
+    report("المحتوى شبه المكرر", [
+        ('كل الأزواج', best_time(lambda: all_pairs_duplicates(sampled), repeat=1)),
+        ('MinHash + LSH', best_time(lambda: find_near_duplicates(sampled), repeat=3)),
+    ], len(sampled), unit='عنوان')
+    report("المحتوى شبه المكرر (كل العناوين)", [
+        ('MinHash + LSH', best_time(lambda: find_near_duplicates(entries), repeat=3)),
+    ], len(entries), unit='عنوان')
+
+# ==================== البحث في العناوين ====================
+
+SEARCH_QUERIES = ['breaking', 'الموسم الثاني', 'مدرسه', 'القلب', 'the dark', 'ا', 'season 2', 'حب']
+
+def scan_titles(norms, query, limit=10):
+    """البحث بالمرور على كل العناوين الموحدة (مثل grep على التقارير)"""
+    terms = normalize_text(query).split()
+    return [position for position, norm in enumerate(norms)
+            if all(term in norm for term in terms)][:limit]
+
+def bench_search(filename, copies=20):
+    items = title_items(load_link_index(filename))
+    # تكرار العناوين بروابط مختلفة لقياس الأداء على مئات الآلاف من العناوين
+    items = [(title, f'{url}?copy={copy}') for copy in range(copies) for title, url in items]
+    report("بناء فهرس البحث", [
+        ('بناء', best_time(lambda: TitleIndex.build(items), repeat=1)),
+    ], len(items), unit='عنوان')
+
+    index = TitleIndex.build(items)
+    norms = [normalize_text(title) for title, _ in items]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'title_index.bin')
+        index.save(path)
+        print(f"  {'حجم الملف':<28} {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        report("تحميل فهرس البحث", [
+            ('mmap', best_time(lambda: TitleIndex.load(path).close())),
+        ], 1, unit='تحميل')
+
+        loaded = TitleIndex.load(path)
+        for query in SEARCH_QUERIES:
+            loaded.search(query)  # بدايات الكلمات القصيرة تُدمج في أول استعلام
+        report("البحث (أفضل 10 نتائج)", [
+            ('المرور على كل العناوين', best_time(lambda: [scan_titles(norms, query) for query in SEARCH_QUERIES], repeat=1)),
+            ('فهرس البحث', best_time(lambda: [loaded.search(query) for query in SEARCH_QUERIES])),
+        ], len(SEARCH_QUERIES), unit='استعلام')
+        loaded.close()
+
+# ==================== إحصائيات المعرفات ====================
+
+def legacy_id_summary(ids):
+    """المدى والمتوسط والوسيط والفجوات كما كانت تُحسب من قوائم Python"""
+    ordered = sorted(ids)
+    gaps = [ordered[i + 1] - ordered[i] for i in range(len(ordered) - 1)]
+    return min(ids), max(ids), statistics.mean(ids), statistics.median(ids), max(gaps)
+
+def array_id_summary(ids, use_numpy=True):
+    stats = IdStats(ids, use_numpy=use_numpy)
+    return stats.min(), stats.max(), stats.mean(), stats.median(), stats.largest_gaps(1)[0][0]
+
+def bench_id_stats(filename, count=10_000_000):
+    ids = [random.randrange(1, 1 << 31) for _ in range(count)]
+    report("إحصائيات المعرفات (المدى، المتوسط، الوسيط، أكبر فجوة)", [
+        ('قوائم + statistics', best_time(lambda: legacy_id_summary(ids), repeat=1)),
+        ('array قياسي', best_time(lambda: array_id_summary(ids, use_numpy=False), repeat=1)),
+        ('array + NumPy', best_time(lambda: array_id_summary(ids), repeat=1)),
+    ], count, unit='معرف')
+    # مؤشر 8 بايت + كائن int بحجم 28 بايت لكل عنصر في القائمة، مقابل 4 بايت في array('I')
+    print(f"  {'قائمة Python':<28} ذاكرة: ~{count * 36 / 1024 / 1024:.0f} MB")
+    print(f"  {'array':<28} ذاكرة: {count * 4 / 1024 / 1024:.0f} MB")
+
+BENCHMARKS = {
+    'classifier': bench_classifier,
+    'loader': bench_loader,
+    'sharded': bench_sharded,
+    'id_stats': bench_id_stats,
+    'deep': bench_deep,
+    'patterns': bench_patterns,
+    'decode': bench_decode,
+    'scoring': bench_scoring,
+    'keywords': bench_keywords,
+    'language': bench_language,
+    'report': bench_report,
+    'series': bench_series,
+    'search': bench_search,
+    'near_duplicates': bench_near_duplicates,
+    'facets': bench_facets,
+    'catalog': bench_catalog,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='قياسات أداء أدوات تحليل الروابط')
+    parser.add_argument('names', nargs='*', choices=[[]] + list(BENCHMARKS), help='القياسات المطلوبة (الكل افتراضياً)')
+    parser.add_argument('--file', default='site_links.txt', help='ملف الروابط')
+    args = parser.parse_args()
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](args.file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+كتالوج المحتوى المضغوط - سجل بيانات وصفية بـ __slots__ (بدون قاموس لكل كائن) بمعرف رقمي
+ونصوص نوع المحتوى واللغة مشتركة (sys.intern)، ومخزن بالأعمدة للكتالوجات الكبيرة:
+مصفوفات للمعرفات ورموز النوع واللغة، والحقول الاختيارية (غالباً None) محفوظة فقط حيث توجد،
+مع كتابة JSON و JSONL مباشرة من الأعمدة دون بناء قاموس لكل عنصر
+"""
+
+import json
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from json.encoder import encode_basestring
+from typing import Optional
+
+CONTENT_FIELDS = ('id', 'title', 'url', 'content_type', 'language', 'year', 'quality', 'genre',
+                  'rating', 'episode_number', 'season_number', 'series_name')
+OPTIONAL_FIELDS = CONTENT_FIELDS[5:]
+
+@dataclass(slots=True)
+class ContentMetadata:
+    id: int
+    title: str
+    url: str
+    content_type: str
+    language: str
+    year: Optional[str] = None
+    quality: Optional[str] = None
+    genre: Optional[str] = None
+    rating: Optional[str] = None
+    episode_number: Optional[str] = None
+    season_number: Optional[str] = None
+    series_name: Optional[str] = None
+
+    def __post_init__(self):
+        self.id = int(self.id)
+        # قيم قليلة تتكرر في كل عنصر: نسخة واحدة من كل نص
+        self.content_type = sys.intern(self.content_type)
+        self.language = sys.intern(self.language)
+
+    def to_json(self):
+        """كائن JSON بنفس ناتج json.dumps(قاموس الحقول, ensure_ascii=False)"""
+        return _json_object(getattr(self, name) for name in CONTENT_FIELDS)
+
+# ==================== JSON ====================
+
+_KEY_PREFIXES = tuple(f'{encode_basestring(name)}: ' for name in CONTENT_FIELDS)
+
+def _json_value(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False)
+
+def _json_object(values, separator=', ', opening='{', closing='}'):
+    return opening + separator.join(
+        prefix + _json_value(value) for prefix, value in zip(_KEY_PREFIXES, values)) + closing
+
+def _json_key(key):
+    """تحويل مفتاح القاموس كما يفعل json (الأرقام و None و True تصبح نصوصاً)"""
+    return encode_basestring(key if isinstance(key, str) else json.dumps(key))
+
+class ContentCatalog:
+    """
+    كتالوج بالأعمدة: صف لكل عنصر، يُضاف بـ append ويُقرأ كـ ContentMetadata عند الطلب فقط
+    """
+
+    def __init__(self, items=()):
+        self.ids = array('Q')
+        self.titles = []
+        self.urls = []
+        self.type_codes = array('B')
+        self.language_codes = array('B')
+        self._names = []      # الرمز -> النص (مشترك بين النوع واللغة)
+        self._codes = {}      # النص -> الرمز
+        # الحقل الاختياري -> {رقم الصف: القيمة} للصفوف التي لها قيمة فقط
+        self.optional = {name: {} for name in OPTIONAL_FIELDS}
+        for item in items:
+            self.append(item)
+
+    def _code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(sys.intern(name))
+        return code
+
+    def add(self, id, title, url, content_type, language, **optional):
+        """إضافة صف من قيم الحقول مباشرة (دون إنشاء ContentMetadata)"""
+        row = len(self.titles)
+        self.ids.append(int(id))
+        self.titles.append(title)
+        self.urls.append(url)
+        self.type_codes.append(self._code(content_type))
+        self.language_codes.append(self._code(language))
+        for name, value in optional.items():
+            if value is not None:
+                self.optional[name][row] = value
+        return row
+
+    def append(self, metadata):
+        self.add(metadata.id, metadata.title, metadata.url, metadata.content_type, metadata.language,
+                 **{name: getattr(metadata, name) for name in OPTIONAL_FIELDS})
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __bool__(self):
+        return bool(self.titles)
+
+    def _values(self, row):
+        names = self._names
+        values = [self.ids[row], self.titles[row], self.urls[row],
+                  names[self.type_codes[row]], names[self.language_codes[row]]]
+        values.extend(self.optional[name].get(row) for name in OPTIONAL_FIELDS)
+        return values
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return ContentMetadata(*self._values(row))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield ContentMetadata(*self._values(row))
+
+    # ==================== الإحصائيات ====================
+
+    def content_types(self):
+        """Counter(نوع المحتوى -> العدد) من عمود الرموز دون قراءة الصفوف"""
+        return Counter({self._names[code]: count for code, count in Counter(self.type_codes).items()})
+
+    def languages(self):
+        return Counter({self._names[code]: count for code, count in Counter(self.language_codes).items()})
+
+    # ==================== الكتابة ====================
+
+    def iter_json(self, separator=', ', opening='{', closing='}'):
+        """كل صف ككائن JSON نصي"""
+        for row in range(len(self)):
+            yield _json_object(self._values(row), separator, opening, closing)
+
+    def write_jsonl(self, f):
+        """سطر JSON لكل عنصر"""
+        for line in self.iter_json():
+            f.write(line)
+            f.write('\n')
+
+    def write_json(self, f, indent=None, level=0):
+        """مصفوفة JSON بنفس تنسيق json.dump(قائمة القواميس, ensure_ascii=False, indent=indent)"""
+        if not self:
+            f.write('[]')
+            return
+        if indent is None:
+            f.write('[')
+            f.write(', '.join(self.iter_json()))
+            f.write(']')
+            return
+        outer = '\n' + ' ' * (indent * level)
+        item = outer + ' ' * indent
+        field = item + ' ' * indent
+        rows = self.iter_json(separator=',' + field, opening='{' + field, closing=item + '}')
+        f.write('[' + item + next(rows))
+        for text in rows:
+            f.write(',' + item + text)
+        f.write(outer + ']')
+
+def _contains_catalog(value):
+    if isinstance(value, ContentCatalog):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_catalog(item) for item in value.values())
+    return False
+
+def dump_json(data, f, indent=2, level=0):
+    """
+    json.dump(data, f, ensure_ascii=False, indent=indent) مع كتابة أي ContentCatalog داخل
+    القواميس مباشرة من أعمدته (باقي القيم تُكتب بـ json كما هي)
+    """
+    if isinstance(data, ContentCatalog):
+        data.write_json(f, indent, level)
+    elif isinstance(data, dict) and data and _contains_catalog(data):
+        outer = '\n' + ' ' * (indent * level)
+        inner = outer + ' ' * indent
+        f.write('{')
+        for position, (key, value) in enumerate(data.items()):
+            f.write((',' if position else '') + inner + _json_key(key) + ': ')
+            dump_json(value, f, indent, level + 1)
+        f.write(outer + '}')
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=indent)
+        f.write(text.replace('\n', '\n' + ' ' * (indent * level)) if level else text)
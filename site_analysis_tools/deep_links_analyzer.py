@@ -7,229 +7,328 @@
 
 import re
 import json
-import urllib.parse
 from collections import defaultdict, Counter
 from datetime import datetime
-import statistics
+
+from analysis_checkpoint import AnalysisCheckpoint, verify_against_full
+from id_stats import IdStats
+from language_detect import has_arabic
+from link_decode import link_title
+from link_index import EPISODE_RE, load_link_index
+from url_classifier import classify_url
+
+# تسميات التقرير لفئات المصنف المشترك
+CATEGORY_LABELS = {
+    'movies': 'أفلام',
+    'series': 'مسلسلات',
+    'episodes': 'حلقات',
+    'shows': 'عروض تلفزيونية',
+    'mix': 'منوعات',
+    'persons': 'أشخاص/ممثلين'
+}
+
+CHECKPOINT_FILE = 'deep_links_checkpoint.json'
+
+# رقم الموسم في رابط المسلسل (رقم الحلقة بـ EPISODE_RE من الفهرس المشترك)
+SEASON_NUMBER_RE = re.compile(r'الموسم-(\d+)')
 
 class DeepLinksAnalyzer:
-    def __init__(self, filename='site_links.txt'):
+    def __init__(self, filename='site_links.txt', index=None):
         self.filename = filename
+        self.index = index
         self.all_links = []
+        self.total_links = 0
         self.categories = defaultdict(int)
         self.patterns = defaultdict(int)
         self.detailed_analysis = {}
+        # المعرفات الكاملة (للمتوسط والوسيط) تُحفظ مع الحالة
+        self.id_stats = {'movies': IdStats(), 'series': IdStats(), 'persons': IdStats()}
         
     def load_links(self):
-        """تحميل وتنظيف الروابط من الملف"""
-        with open(self.filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('https://ak.sv/'):
-                self.all_links.append(line)
+        """تحميل الروابط من الفهرس المشترك"""
+        if self.index is None:
+            self.index = load_link_index(self.filename)
+        self.all_links.extend(self.index.links)
                 
         print(f"✅ تم تحميل {len(self.all_links):,} رابط بنجاح")
         
-    def analyze_structure(self):
-        """تحليل هيكل الروابط وتصنيفها"""
-        for link in self.all_links:
-            # تحليل نوع المحتوى
-            if '/movie/' in link:
-                self.categories['أفلام'] += 1
-            elif '/series/' in link:
-                self.categories['مسلسلات'] += 1
-            elif '/episode/' in link:
-                self.categories['حلقات'] += 1
-            elif '/shows/' in link:
-                self.categories['عروض تلفزيونية'] += 1
-            elif '/show/' in link:
-                self.categories['عروض'] += 1
-            elif '/mix/' in link:
-                self.categories['منوعات'] += 1
-            elif '/person/' in link:
-                self.categories['أشخاص/ممثلين'] += 1
-            elif link.count('/') == 3:
-                self.categories['صفحات رئيسية'] += 1
-            else:
-                self.categories['أخرى'] += 1
-                
-            # تحليل الأنماط
-            path = link.replace('https://ak.sv/', '')
-            if '/' in path:
-                pattern = path.split('/')[0]
-                self.patterns[pattern] += 1
+    def add_structure(self, link, match):
+        """تصنيف رابط واحد وتسجيل نمط مساره"""
+        # تحليل نوع المحتوى
+        category = match.category
+        if category:
+            self.categories[CATEGORY_LABELS[category]] += 1
+        elif link.count('/') == 3:
+            self.categories['صفحات رئيسية'] += 1
+        else:
+            self.categories['أخرى'] += 1
+            
+        # تحليل الأنماط
+        path = link.replace('https://ak.sv/', '')
+        if '/' in path:
+            pattern = path.split('/')[0]
+            self.patterns[pattern] += 1
                 
-    def analyze_movies(self):
-        """تحليل تفصيلي للأفلام"""
-        movies = [link for link in self.all_links if '/movie/' in link]
-        movie_analysis = {
-            'total_count': len(movies),
+    def analyze_structure(self, links=None):
+        """تحليل هيكل الروابط وتصنيفها"""
+        for link in self.all_links if links is None else links:
+            self.add_structure(link, classify_url(link))
+    
+    # ==================== مجمّعات الأنواع ====================
+    # لكل نوع: قاموس تراكمي في detailed_analysis، ودالة تضيف رابطاً واحداً إليه،
+    # ودالة تحدّث نطاق المعرفات بعد انتهاء الدفعة
+    
+    def movies_accumulator(self):
+        return self.detailed_analysis.setdefault('movies', {
+            'total_count': 0,
             'ids_range': {'min': float('inf'), 'max': 0},
             'languages': defaultdict(int),
             'sample_titles': []
-        }
+        })
         
-        movie_ids = []
-        for movie in movies:
-            # استخراج ID
-            match = re.search(r'/movie/(\d+)/', movie)
-            if match:
-                movie_id = int(match.group(1))
-                movie_ids.append(movie_id)
-                
-            # تحليل اللغة من النص
-            title = movie.split('/')[-1]
-            title = urllib.parse.unquote(title)
-            if re.search(r'[\u0600-\u06FF]', title):  # نص عربي
-                movie_analysis['languages']['عربي'] += 1
-            else:
-                movie_analysis['languages']['أجنبي'] += 1
-                
-            # عينة من العناوين
-            if len(movie_analysis['sample_titles']) < 20:
-                movie_analysis['sample_titles'].append({
-                    'id': movie_id if match else 'غير محدد',
-                    'title': title,
-                    'url': movie
-                })
+    def add_movie(self, movie_analysis, movie, match):
+        movie_analysis['total_count'] += 1
         
-        if movie_ids:
-            movie_analysis['ids_range']['min'] = min(movie_ids)
-            movie_analysis['ids_range']['max'] = max(movie_ids)
-            movie_analysis['average_id'] = statistics.mean(movie_ids)
-            movie_analysis['median_id'] = statistics.median(movie_ids)
+        # استخراج ID
+        if match.rest is not None:
+            movie_id = match.item_id
+            self.id_stats['movies'].add(movie_id)
             
-        self.detailed_analysis['movies'] = movie_analysis
-        
-    def analyze_series(self):
-        """تحليل تفصيلي للمسلسلات"""
-        series = [link for link in self.all_links if '/series/' in link]
-        series_analysis = {
-            'total_count': len(series),
+        # تحليل اللغة من النص
+        title = link_title(movie)
+        if has_arabic(title):  # نص عربي
+            movie_analysis['languages']['عربي'] += 1
+        else:
+            movie_analysis['languages']['أجنبي'] += 1
+            
+        # عينة من العناوين
+        if len(movie_analysis['sample_titles']) < 20:
+            movie_analysis['sample_titles'].append({
+                'id': movie_id if match.rest is not None else 'غير محدد',
+                'title': title,
+                'url': movie
+            })
+            
+    def finish_movies(self, movie_analysis):
+        movie_ids = self.id_stats['movies']
+        if movie_ids:
+            movie_analysis['ids_range']['min'] = movie_ids.min()
+            movie_analysis['ids_range']['max'] = movie_ids.max()
+            movie_analysis['average_id'] = movie_ids.mean()
+            movie_analysis['median_id'] = movie_ids.median()
+    
+    def series_accumulator(self):
+        return self.detailed_analysis.setdefault('series', {
+            'total_count': 0,
             'ids_range': {'min': float('inf'), 'max': 0},
             'languages': defaultdict(int),
             'seasons_pattern': defaultdict(int),
             'sample_titles': []
-        }
+        })
         
-        series_ids = []
-        for serie in series:
-            # استخراج ID
-            match = re.search(r'/series/(\d+)/', serie)
-            if match:
-                series_id = int(match.group(1))
-                series_ids.append(series_id)
-                
-            # تحليل الموسم
-            if 'الموسم' in serie:
-                season_match = re.search(r'الموسم-(\d+)', serie)
-                if season_match:
-                    season = int(season_match.group(1))
-                    series_analysis['seasons_pattern'][f'الموسم {season}'] += 1
-                    
-            # تحليل اللغة
-            title = serie.split('/')[-1]
-            title = urllib.parse.unquote(title)
-            if re.search(r'[\u0600-\u06FF]', title):
-                series_analysis['languages']['عربي'] += 1
-            else:
-                series_analysis['languages']['أجنبي'] += 1
-                
-            # عينة من العناوين
-            if len(series_analysis['sample_titles']) < 20:
-                series_analysis['sample_titles'].append({
-                    'id': series_id if match else 'غير محدد',
-                    'title': title,
-                    'url': serie
-                })
+    def add_series(self, series_analysis, serie, match):
+        series_analysis['total_count'] += 1
         
-        if series_ids:
-            series_analysis['ids_range']['min'] = min(series_ids)
-            series_analysis['ids_range']['max'] = max(series_ids)
-            series_analysis['average_id'] = statistics.mean(series_ids)
+        # استخراج ID
+        if match.rest is not None:
+            series_id = match.item_id
+            self.id_stats['series'].add(series_id)
             
-        self.detailed_analysis['series'] = series_analysis
-        
-    def analyze_episodes(self):
-        """تحليل تفصيلي للحلقات"""
-        episodes = [link for link in self.all_links if '/episode/' in link]
-        episodes_analysis = {
-            'total_count': len(episodes),
+        # تحليل الموسم
+        if 'الموسم' in serie:
+            season_match = SEASON_NUMBER_RE.search(serie)
+            if season_match:
+                season = int(season_match.group(1))
+                series_analysis['seasons_pattern'][f'الموسم {season}'] += 1
+                
+        # تحليل اللغة
+        title = link_title(serie)
+        if has_arabic(title):
+            series_analysis['languages']['عربي'] += 1
+        else:
+            series_analysis['languages']['أجنبي'] += 1
+            
+        # عينة من العناوين
+        if len(series_analysis['sample_titles']) < 20:
+            series_analysis['sample_titles'].append({
+                'id': series_id if match.rest is not None else 'غير محدد',
+                'title': title,
+                'url': serie
+            })
+            
+    def finish_series(self, series_analysis):
+        series_ids = self.id_stats['series']
+        if series_ids:
+            series_analysis['ids_range']['min'] = series_ids.min()
+            series_analysis['ids_range']['max'] = series_ids.max()
+            series_analysis['average_id'] = series_ids.mean()
+    
+    def episodes_accumulator(self):
+        return self.detailed_analysis.setdefault('episodes', {
+            'total_count': 0,
             'languages': defaultdict(int),
             'episode_numbers': defaultdict(int),
             'series_distribution': defaultdict(int),
             'sample_episodes': []
-        }
-        
-        for episode in episodes:
-            # تحليل رقم الحلقة
-            if 'الحلقة' in episode:
-                episodes_analysis['languages']['عربي'] += 1
-                episode_match = re.search(r'الحلقة-(\d+)', episode)
-                if episode_match:
-                    ep_num = int(episode_match.group(1))
-                    episodes_analysis['episode_numbers'][ep_num] += 1
-            else:
-                episodes_analysis['languages']['أجنبي'] += 1
-                
-            # تحليل توزيع المسلسلات
-            parts = episode.split('/')
-            if len(parts) >= 5:
-                series_name = parts[4].split('-')[0]  # أول جزء من اسم المسلسل
-                episodes_analysis['series_distribution'][series_name] += 1
-                
-            # عينة من الحلقات
-            if len(episodes_analysis['sample_episodes']) < 15:
-                episodes_analysis['sample_episodes'].append({
-                    'series': parts[4] if len(parts) >= 5 else 'غير محدد',
-                    'episode': parts[-1] if len(parts) > 5 else 'غير محدد',
-                    'url': episode
-                })
+        })
         
-        self.detailed_analysis['episodes'] = episodes_analysis
+    def add_episode(self, episodes_analysis, episode, match):
+        episodes_analysis['total_count'] += 1
         
-    def analyze_persons(self):
-        """تحليل صفحات الأشخاص/الممثلين"""
-        persons = [link for link in self.all_links if '/person/' in link]
-        persons_analysis = {
-            'total_count': len(persons),
+        # تحليل رقم الحلقة
+        if 'الحلقة' in episode:
+            episodes_analysis['languages']['عربي'] += 1
+            episode_match = EPISODE_RE.search(episode)
+            if episode_match:
+                ep_num = int(episode_match.group(1))
+                episodes_analysis['episode_numbers'][ep_num] += 1
+        else:
+            episodes_analysis['languages']['أجنبي'] += 1
+            
+        # تحليل توزيع المسلسلات
+        parts = episode.split('/')
+        if len(parts) >= 5:
+            series_name = parts[4].split('-')[0]  # أول جزء من اسم المسلسل
+            episodes_analysis['series_distribution'][series_name] += 1
+            
+        # عينة من الحلقات
+        if len(episodes_analysis['sample_episodes']) < 15:
+            episodes_analysis['sample_episodes'].append({
+                'series': parts[4] if len(parts) >= 5 else 'غير محدد',
+                'episode': parts[-1] if len(parts) > 5 else 'غير محدد',
+                'url': episode
+            })
+    
+    def persons_accumulator(self):
+        return self.detailed_analysis.setdefault('persons', {
+            'total_count': 0,
             'ids_range': {'min': float('inf'), 'max': 0},
             'name_patterns': defaultdict(int),
             'sample_persons': []
-        }
+        })
         
-        person_ids = []
-        for person in persons:
-            # استخراج ID
-            match = re.search(r'/person/(\d+)/', person)
-            if match:
-                person_id = int(match.group(1))
-                person_ids.append(person_id)
-                
-            # تحليل الأسماء
-            name = person.split('/')[-1]
-            name = urllib.parse.unquote(name)
-            if re.search(r'[\u0600-\u06FF]', name):
-                persons_analysis['name_patterns']['عربي'] += 1
-            else:
-                persons_analysis['name_patterns']['أجنبي'] += 1
-                
-            # عينة من الأشخاص
-            if len(persons_analysis['sample_persons']) < 15:
-                persons_analysis['sample_persons'].append({
-                    'id': person_id if match else 'غير محدد',
-                    'name': name,
-                    'url': person
-                })
+    def add_person(self, persons_analysis, person, match):
+        persons_analysis['total_count'] += 1
         
+        # استخراج ID
+        if match.rest is not None:
+            person_id = match.item_id
+            self.id_stats['persons'].add(person_id)
+            
+        # تحليل الأسماء
+        name = link_title(person)
+        if has_arabic(name):
+            persons_analysis['name_patterns']['عربي'] += 1
+        else:
+            persons_analysis['name_patterns']['أجنبي'] += 1
+            
+        # عينة من الأشخاص
+        if len(persons_analysis['sample_persons']) < 15:
+            persons_analysis['sample_persons'].append({
+                'id': person_id if match.rest is not None else 'غير محدد',
+                'name': name,
+                'url': person
+            })
+            
+    def finish_persons(self, persons_analysis):
+        person_ids = self.id_stats['persons']
         if person_ids:
-            persons_analysis['ids_range']['min'] = min(person_ids)
-            persons_analysis['ids_range']['max'] = max(person_ids)
+            persons_analysis['ids_range']['min'] = person_ids.min()
+            persons_analysis['ids_range']['max'] = person_ids.max()
+    
+    # ==================== التحليلات المنفصلة ====================
+    
+    def analyze_movies(self, links=None):
+        """تحليل تفصيلي للأفلام"""
+        movie_analysis = self.movies_accumulator()
+        for link in self.all_links if links is None else links:
+            match = classify_url(link)
+            if match.kind == 'movie':
+                self.add_movie(movie_analysis, link, match)
+        self.finish_movies(movie_analysis)
+        
+    def analyze_series(self, links=None):
+        """تحليل تفصيلي للمسلسلات"""
+        series_analysis = self.series_accumulator()
+        for link in self.all_links if links is None else links:
+            match = classify_url(link)
+            if match.kind == 'series':
+                self.add_series(series_analysis, link, match)
+        self.finish_series(series_analysis)
+        
+    def analyze_episodes(self, links=None):
+        """تحليل تفصيلي للحلقات"""
+        episodes_analysis = self.episodes_accumulator()
+        for link in self.all_links if links is None else links:
+            match = classify_url(link)
+            if match.category == 'episodes':
+                self.add_episode(episodes_analysis, link, match)
+        
+    def analyze_persons(self, links=None):
+        """تحليل صفحات الأشخاص/الممثلين"""
+        persons_analysis = self.persons_accumulator()
+        for link in self.all_links if links is None else links:
+            match = classify_url(link)
+            if match.kind == 'person':
+                self.add_person(persons_analysis, link, match)
+        self.finish_persons(persons_analysis)
             
-        self.detailed_analysis['persons'] = persons_analysis
+    def fold_links(self, links):
+        """
+        إضافة دفعة روابط إلى الحالة التراكمية لجميع التحليلات في تمريرة واحدة:
+        يُصنف كل رابط مرة واحدة ثم يُوجه إلى مجمّع نوعه
+        """
+        self.total_links += len(links)
+        movie_analysis = self.movies_accumulator()
+        series_analysis = self.series_accumulator()
+        episodes_analysis = self.episodes_accumulator()
+        persons_analysis = self.persons_accumulator()
+        
+        handlers = {
+            'movie': (self.add_movie, movie_analysis),
+            'series': (self.add_series, series_analysis),
+            'episode': (self.add_episode, episodes_analysis),
+            'show_episode': (self.add_episode, episodes_analysis),
+            'person': (self.add_person, persons_analysis),
+        }
+        
+        add_structure = self.add_structure
+        for link in links:
+            match = classify_url(link)
+            add_structure(link, match)
+            handler = handlers.get(match.kind)
+            if handler:
+                handler[0](handler[1], link, match)
+        
+        self.finish_movies(movie_analysis)
+        self.finish_series(series_analysis)
+        self.finish_persons(persons_analysis)
+        
+    def get_state(self):
+        """الحالة التراكمية بصيغة قابلة للحفظ في JSON"""
+        return {
+            'total_links': self.total_links,
+            'categories': self.categories,
+            'patterns': self.patterns,
+            'detailed_analysis': self.detailed_analysis,
+            'id_stats': {content_type: stats.to_state() for content_type, stats in self.id_stats.items()},
+        }
+        
+    def set_state(self, state):
+        """استعادة الحالة من نقطة حفظ (مع إعادة المفاتيح الرقمية والقواميس الافتراضية)"""
+        self.total_links = state['total_links']
+        self.categories = defaultdict(int, state['categories'])
+        self.patterns = defaultdict(int, state['patterns'])
+        self.id_stats = {content_type: IdStats.from_state(ids) for content_type, ids in state['id_stats'].items()}
+        self.detailed_analysis = state['detailed_analysis']
+        for analysis in self.detailed_analysis.values():
+            for key in ('languages', 'seasons_pattern', 'series_distribution', 'name_patterns'):
+                if key in analysis:
+                    analysis[key] = defaultdict(int, analysis[key])
+        episodes = self.detailed_analysis.get('episodes')
+        if episodes:
+            episodes['episode_numbers'] = defaultdict(
+                int, ((int(number), count) for number, count in episodes['episode_numbers'].items()))
         
     def generate_comprehensive_report(self):
         """إنشاء تقرير شامل ومفصل"""
@@ -237,14 +336,14 @@ class DeepLinksAnalyzer:
         report.append("🎬 تقرير التحليل الشامل العميق لموقع AKWAM")
         report.append("=" * 60)
         report.append(f"📅 تاريخ التحليل: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"📊 إجمالي الروابط المحللة: {len(self.all_links):,}")
+        report.append(f"📊 إجمالي الروابط المحللة: {self.total_links:,}")
         report.append("")
         
         # الإحصائيات العامة
         report.append("📈 الإحصائيات العامة:")
         report.append("-" * 30)
         for category, count in sorted(self.categories.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(self.all_links)) * 100
+            percentage = (count / self.total_links) * 100
             report.append(f"• {category}: {count:,} ({percentage:.1f}%)")
         report.append("")
         
@@ -348,12 +447,41 @@ class DeepLinksAnalyzer:
         print("🚀 بدء التحليل الشامل العميق...")
         
         self.load_links()
-        self.analyze_structure()
-        self.analyze_movies()
-        self.analyze_series() 
-        self.analyze_episodes()
-        self.analyze_persons()
+        self.fold_links(self.all_links)
         
+        return self.save_report()
+    
+    def run_incremental_analysis(self, checkpoint_file=CHECKPOINT_FILE):
+        """تحليل الروابط المضافة منذ آخر نقطة حفظ فقط ثم تحديث نقطة الحفظ"""
+        print("🚀 بدء التحليل التزايدي...")
+        
+        checkpoint = AnalysisCheckpoint(checkpoint_file, self.filename)
+        state = checkpoint.load()
+        if state is not None:
+            self.set_state(state)
+        new_links, tail_links = checkpoint.read_new_links()
+        print(f"✅ {self.total_links:,} رابط من نقطة الحفظ + {len(new_links) + len(tail_links):,} رابط جديد")
+        
+        self.fold_links(new_links)
+        checkpoint.save(self.get_state())
+        # السطر الأخير غير المكتمل يدخل في هذا التقرير فقط
+        self.fold_links(tail_links)
+        
+        return self.save_report()
+    
+    def verify_incremental_analysis(self, checkpoint_file=CHECKPOINT_FILE):
+        """تشغيل تزايدي ثم مقارنته بإعادة حساب كاملة من الصفر"""
+        incremental_report = self.run_incremental_analysis(checkpoint_file)
+        
+        full = DeepLinksAnalyzer(self.filename)
+        full.load_links()
+        full.fold_links(full.all_links)
+        
+        return verify_against_full(self.get_state(), full.get_state(),
+                                   incremental_report, full.generate_comprehensive_report())
+    
+    def save_report(self):
+        """إنشاء التقرير وحفظه"""
         report = self.generate_comprehensive_report()
         
         # حفظ التقرير
@@ -365,7 +493,20 @@ class DeepLinksAnalyzer:
         return report
 
 if __name__ == "__main__":
-    analyzer = DeepLinksAnalyzer()
-    report = analyzer.run_complete_analysis()
+    import argparse
+    parser = argparse.ArgumentParser(description='محلل الروابط المتطور')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--incremental', action='store_true', help='تحليل الروابط الجديدة منذ آخر نقطة حفظ فقط')
+    parser.add_argument('--verify', action='store_true', help='تحليل تزايدي ثم مقارنته بإعادة حساب كاملة')
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE, help='ملف نقطة الحفظ')
+    args = parser.parse_args()
+    
+    analyzer = DeepLinksAnalyzer(args.filename)
+    if args.verify:
+        raise SystemExit(0 if analyzer.verify_incremental_analysis(args.checkpoint) else 1)
+    if args.incremental:
+        report = analyzer.run_incremental_analysis(args.checkpoint)
+    else:
+        report = analyzer.run_complete_analysis()
     print("\n" + "="*60)
     print(report)
\ No newline at end of file
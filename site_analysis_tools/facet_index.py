@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس معاملات صفحات التصفح - لكل معامل (category, tag, page...) قيمه المختلفة مع عدد مرات كل قيمة،
+وتركيبات المعاملات التي تظهر معاً، وأكبر رقم صفحة لكل تركيبة فلاتر (مثل /movies?category=33)،
+بعدادات بدلاً من قوائم تحفظ كل قيمة في كل رابط
+"""
+
+import argparse
+from collections import Counter
+from urllib.parse import unquote_plus, urlencode
+
+from link_index import load_link_index
+
+PAGE_PARAMETER = 'page'
+
+def query_parameters(link):
+    """(المفتاح، القيمة) لكل معامل فيه "=" (نفس تقسيم محلل البنية: ما بين أول "?" والثاني)"""
+    if '?' not in link:
+        return []
+    return [tuple(param.split('=', 1)) for param in link.split('?')[1].split('&') if '=' in param]
+
+def decode_parameter(text):
+    """فك ترميز مفتاح أو قيمة من الاستعلام (أغلبها أرقام وكلمات لا تحتاج فكاً)"""
+    return unquote_plus(text) if '%' in text or '+' in text else text
+
+def facet_url(path, facets, page=None):
+    """رابط صفحة التصفح لتركيبة فلاتر (page=None أو 1 للصفحة الأولى)"""
+    if page and page > 1:
+        facets = tuple(facets) + ((PAGE_PARAMETER, page),)
+    query = urlencode(facets)
+    return f"{path}?{query}" if query else path
+
+class FacetIndex:
+    """فهرس الفلاتر: يُبنى بـ add لكل رابط، ويُدمج مع فهرس آخر بـ += (للمعالجة المجزأة)"""
+
+    def __init__(self, links=()):
+        self.values = {}                # المعامل -> Counter(القيمة -> عدد الروابط)
+        self.combinations = Counter()   # (المعاملات مرتبة) -> عدد الروابط
+        self.max_pages = {}             # (المسار، ((المعامل، القيمة)...) بدون page) -> أكبر صفحة
+        self.links = 0
+        for link in links:
+            self.add(link)
+
+    def add(self, link):
+        """
+        إضافة رابط (الروابط دون معاملات تُتجاهل) - المفاتيح والقيم تُحفظ مفكوكة الترميز
+        فيُعيد facet_url ترميزها مرة واحدة
+        """
+        if '?' not in link:
+            return False
+        parts = link.split('?', 2)
+        page = 1  # صفحة الفلتر بدون رقم صفحة هي الصفحة الأولى
+        keys = []
+        facets = []
+        values = self.values
+        for param in parts[1].split('&'):
+            key, separator, value = param.partition('=')
+            if not separator:
+                continue
+            key = decode_parameter(key)
+            value = decode_parameter(value)
+            counts = values.get(key)
+            if counts is None:
+                counts = values[key] = Counter()
+            counts[value] += 1
+            keys.append(key)
+            if key == PAGE_PARAMETER:
+                if value.isdigit():
+                    page = int(value) or 1
+            else:
+                facets.append((key, value))
+        if not keys:
+            return False
+
+        self.links += 1
+        self.combinations[tuple(keys) if len(keys) == 1 else tuple(sorted(set(keys)))] += 1
+        facet_key = (parts[0], tuple(facets) if len(facets) < 2 else tuple(sorted(facets)))
+        if page > self.max_pages.get(facet_key, 0):
+            self.max_pages[facet_key] = page
+        return True
+
+    def __iadd__(self, other):
+        """دمج فهرس جزئي (ترتيب أول ظهور المعاملات يبقى كما في المعالجة المتتالية)"""
+        for key, counts in other.values.items():
+            if key in self.values:
+                self.values[key].update(counts)
+            else:
+                self.values[key] = Counter(counts)
+        self.combinations.update(other.combinations)
+        for facet_key, page in other.max_pages.items():
+            if page > self.max_pages.get(facet_key, 0):
+                self.max_pages[facet_key] = page
+        self.links += other.links
+        return self
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def __iter__(self):
+        return iter(self.values)
+
+    # ==================== الاستعلامات ====================
+
+    def cardinality(self, key):
+        """عدد القيم المختلفة للمعامل"""
+        return len(self.values.get(key, ()))
+
+    def usage(self, key):
+        """عدد الروابط التي تحتوي المعامل (مع التكرار)"""
+        return sum(self.values.get(key, Counter()).values())
+
+    def top_values(self, key, count=10):
+        return self.values.get(key, Counter()).most_common(count)
+
+    def facets(self, base=None):
+        """[(المسار، الفلاتر، أكبر صفحة)] مرتبة بالمسار ثم الفلاتر"""
+        return [(path, facets, page) for (path, facets), page in sorted(self.max_pages.items())
+                if base is None or path == base]
+
+    def listing_urls(self, base=None):
+        """
+        كل صفحات التصفح حسب الفلاتر: الصفحة الأولى بدون page ثم page=2 حتى أكبر صفحة معروفة
+        (لزاحف يمر على الصفحات دون طلب نفس الصفحة بروابط مختلفة)
+        """
+        for path, facets, max_page in self.facets(base):
+            for page in range(1, max_page + 1):
+                yield facet_url(path, facets, page)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='فهرس معاملات صفحات التصفح')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--urls', action='store_true', help='طباعة كل صفحات التصفح حسب الفلاتر')
+    parser.add_argument('--base', help='مسار قسم واحد (مثل https://ak.sv/movies)')
+    args = parser.parse_args()
+
+    index = FacetIndex(load_link_index(args.filename).links)
+    if args.urls:
+        for url in index.listing_urls(args.base):
+            print(url)
+        raise SystemExit
+
+    print(f"🔧 {index.links:,} رابط بمعاملات، {len(index)} معامل")
+    for key in index:
+        print(f"  {key}: {index.usage(key):,} استخدام، {index.cardinality(key):,} قيمة مختلفة")
+    print("🧩 تركيبات المعاملات:")
+    for keys, count in index.combinations.most_common():
+        print(f"  {' + '.join(keys)}: {count:,}")
+    paged = [(path, facets, page) for path, facets, page in index.facets(args.base) if page > 1]
+    print(f"📄 {len(paged):,} فلتر بأكثر من صفحة:")
+    for path, facets, page in paged:
+        print(f"  {facet_url(path, facets)}: {page} صفحة")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محرك الجلب المتوازي - asyncio يوزع الطلبات على مجموعة خيوط محدودة تستخدم جلسة requests واحدة
+باتصالات دائمة (keep-alive) من مجمع اتصالات بحجم عدد الخيوط، مع حد للطلبات المتزامنة لكل نطاق،
+وإعادة المحاولة تنتظر بـ asyncio.sleep فلا تشغل خيطاً أثناء الانتظار
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# عدد الطلبات المتزامنة (= عدد الخيوط = حجم مجمع الاتصالات لكل نطاق)
+DEFAULT_WORKERS = 16
+
+# أقصى عدد طلبات متزامنة لنفس النطاق
+DEFAULT_PER_HOST = 8
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_DELAY = 2
+
+class FetchResult(NamedTuple):
+    url: str
+    # ناتج دالة المعالجة للاستجابة (None عند الفشل)
+    value: Any
+    # آخر خطأ طلب بعد استنفاد المحاولات، أو الخطأ الذي رفعته دالة المعالجة
+    error: Optional[Exception]
+
+def pooled_session(session=None, workers=DEFAULT_WORKERS, hosts=10):
+    """جلسة (جديدة أو موجودة) بمجمع اتصالات يتسع لكل الخيوط فلا تُفتح اتصالات جديدة وتُغلق لكل طلب"""
+    session = session or requests.Session()
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class FetchEngine:
+    """
+    جلب مجموعة روابط بالتوازي: map(روابط، دالة معالجة) تعيد FetchResult لكل رابط بنفس الترتيب
+    دالة المعالجة handle(url, response) تعمل في خيط الجلب نفسه بعد نجاح الطلب (تحليل HTML وحفظ الملفات)
+    """
+
+    def __init__(self, session=None, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST,
+                 timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, retry_delay=DEFAULT_RETRY_DELAY):
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.session = pooled_session(session, workers)
+
+    def _get(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    async def _fetch(self, loop, executor, limits, url, handle, retries, on_attempt, on_error):
+        host_limit = limits.setdefault(urlparse(url).netloc, asyncio.Semaphore(self.per_host))
+        for attempt in range(retries):
+            try:
+                async with host_limit:
+                    if on_attempt:
+                        on_attempt(url, attempt)
+                    response = await loop.run_in_executor(executor, self._get, url)
+            except requests.exceptions.RequestException as e:
+                if on_error:
+                    on_error(url, attempt, e)
+                if attempt == retries - 1:
+                    return FetchResult(url, None, e)
+                # الانتظار خارج حد النطاق وخارج الخيوط
+                await asyncio.sleep(self.retry_delay)
+                continue
+            try:
+                return FetchResult(url, await loop.run_in_executor(executor, handle, url, response), None)
+            except Exception as e:
+                return FetchResult(url, None, e)
+        return FetchResult(url, None, None)
+
+    async def map_async(self, urls, handle=None, retries=None, on_attempt=None, on_error=None):
+        """
+        on_attempt(url, رقم المحاولة) قبل كل طلب، on_error(url, رقم المحاولة، الخطأ) بعد كل طلب فاشل
+        (بدون handle تكون القيمة هي الاستجابة نفسها)
+        """
+        loop = asyncio.get_running_loop()
+        handle = handle or (lambda url, response: response)
+        retries = retries or self.retries
+        limits = {}  # النطاق -> Semaphore (تُنشأ داخل الحلقة الحالية)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return await asyncio.gather(*(
+                self._fetch(loop, executor, limits, url, handle, retries, on_attempt, on_error)
+                for url in urls))
+
+    def map(self, urls, handle=None, **options):
+        """نسخة متزامنة من map_async (تشغل حلقة asyncio خاصة بها)"""
+        if not urls:
+            return []
+        return asyncio.run(self.map_async(urls, handle, **options))
+
+    async def crawl_async(self, urls, handle=None, expand=None, retries=None, on_attempt=None, on_error=None):
+        """
+        زحف بطابور مشترك (frontier): workers عاملاً تسحب الروابط من asyncio.Queue واحد،
+        و expand(FetchResult) تُستدعى في حلقة asyncio بعد كل رابط وتعيد روابط جديدة تدخل الطابور فوراً
+        (فلا ينتظر الزحف أبطأ صفحة في مستوى كامل قبل البدء بما اكتُشف) - النتائج بترتيب اكتمال الجلب
+        """
+        loop = asyncio.get_running_loop()
+        handle = handle or (lambda url, response: response)
+        retries = retries or self.retries
+        limits = {}
+        frontier = asyncio.Queue()
+        for url in urls:
+            frontier.put_nowait(url)
+        results = []
+
+        async def worker(executor):
+            while True:
+                url = await frontier.get()
+                try:
+                    result = await self._fetch(loop, executor, limits, url, handle, retries, on_attempt, on_error)
+                    results.append(result)
+                    for new_url in (expand(result) if expand else ()):
+                        frontier.put_nowait(new_url)
+                finally:
+                    frontier.task_done()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            workers = [asyncio.create_task(worker(executor)) for _ in range(self.workers)]
+            drained = asyncio.create_task(frontier.join())
+            try:
+                # خطأ في expand ينهي عاملاً: يُرفع بدلاً من انتظار طابور لن يفرغ
+                await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in [drained, *workers]:
+                    task.cancel()
+                await asyncio.gather(drained, *workers, return_exceptions=True)
+            for task in workers:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        return results
+
+    def crawl(self, urls, handle=None, expand=None, **options):
+        """نسخة متزامنة من crawl_async (تشغل حلقة asyncio خاصة بها)"""
+        if not urls:
+            return []
+        return asyncio.run(self.crawl_async(urls, handle, expand, **options))
+
+    def close(self):
+        self.session.close()
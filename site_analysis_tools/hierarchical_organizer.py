@@ -4,29 +4,56 @@
 منظم الروابط الهرمي - ترتيب من الصفحة الرئيسية إلى أعمق المستويات
 """
 
-import re
-import urllib.parse
 from collections import defaultdict, OrderedDict
 
+from language_detect import has_arabic
+from link_decode import decode_component
+from link_index import load_link_index
+from report_writer import COMPRESSION_SUFFIXES, ReportWriter
+from sharded import run_sharded
+from url_classifier import classify_url
+
+HIERARCHICAL_FILE = 'روابط_AKWAM_ترتيب_هرمي_شامل.txt'
+
 class HierarchicalLinksOrganizer:
-    def __init__(self, filename='site_links.txt'):
+    def __init__(self, filename='site_links.txt', index=None, workers=1, compression=None):
         self.filename = filename
+        self.index = index
+        self.workers = workers
+        self.compression = compression
         self.all_links = []
         self.hierarchy = {}
+        self.content_entries = {}
         
     def load_links(self):
-        """تحميل الروابط"""
-        with open(self.filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('https://ak.sv/'):
-                self.all_links.append(line)
+        """تحميل الروابط من الفهرس المشترك"""
+        if self.index is None:
+            self.index = load_link_index(self.filename)
+        self.all_links.extend(self.index.links)
                 
     def categorize_by_depth_and_type(self):
-        """تصنيف الروابط حسب العمق والنوع"""
+        """تصنيف الروابط حسب العمق والنوع (في عمليات متوازية عند workers > 1)"""
+        aggregates = run_sharded(HierarchicalLinksOrganizer.collect_aggregates, self.index.records, self.workers)
+        self.content_entries = aggregates['entries']
+        return aggregates['hierarchy']
+    
+    @staticmethod
+    def collect_aggregates(records):
+        """
+        تجميعات جزئية لمجموعة سجلات متتالية من الفهرس المشترك: الهيكل الهرمي، و(ID، العنوان، الرابط)
+        لكل صفحة محتوى وحلقة - تُدمج تجميعات الأجزاء بترتيبها في sharded
+        """
+        organizer = HierarchicalLinksOrganizer()
+        hierarchy = organizer.categorize_links(records)
+        by_url = {record.url: record for record in records}
+        entries = {}
+        for group in ('content_pages', 'episodes'):
+            for kind, kind_links in hierarchy[group].items():
+                entries[kind] = [(*organizer.extract_id_and_title(link, by_url[link]), link) for link in kind_links]
+        return {'hierarchy': hierarchy, 'entries': entries}
+    
+    def categorize_links(self, records):
+        """بناء الهيكل الهرمي لمجموعة سجلات (النوع والمعرف من السجل دون إعادة تصنيف الرابط)"""
         hierarchy = {
             'root': [],           # الصفحة الرئيسية
             'main_sections': {},  # الأقسام الرئيسية
@@ -36,7 +63,8 @@ class HierarchicalLinksOrganizer:
             'others': []          # روابط أخرى
         }
         
-        for link in self.all_links:
+        for record in records:
+            link = record.url
             # إزالة البروتوكول والدومين
             path = link.replace('https://ak.sv/', '')
             
@@ -65,31 +93,23 @@ class HierarchicalLinksOrganizer:
                     hierarchy['main_sections'][section]['base_links'].append(link)
                     
             elif len(parts) >= 2:
-                section = parts[0]
-                
                 # المحتوى الفردي (أفلام، مسلسلات، أشخاص)
-                if section in ['movie', 'series', 'person', 'mix'] and len(parts) >= 3:
-                    if section not in hierarchy['content_pages']:
-                        hierarchy['content_pages'][section] = []
-                    hierarchy['content_pages'][section].append(link)
-                    
-                # الحلقات
-                elif section == 'episode':
-                    if 'episode' not in hierarchy['episodes']:
-                        hierarchy['episodes']['episode'] = []
-                    hierarchy['episodes']['episode'].append(link)
+                if record.kind in ['movie', 'series', 'person', 'mix'] and record.rest:
+                    if record.kind not in hierarchy['content_pages']:
+                        hierarchy['content_pages'][record.kind] = []
+                    hierarchy['content_pages'][record.kind].append(link)
                     
-                # حلقات العروض
-                elif section == 'show' and len(parts) >= 3 and parts[1] == 'episode':
-                    if 'show_episode' not in hierarchy['episodes']:
-                        hierarchy['episodes']['show_episode'] = []
-                    hierarchy['episodes']['show_episode'].append(link)
+                # الحلقات وحلقات العروض
+                elif record.kind in ['episode', 'show_episode']:
+                    if record.kind not in hierarchy['episodes']:
+                        hierarchy['episodes'][record.kind] = []
+                    hierarchy['episodes'][record.kind].append(link)
                     
                 # العروض
-                elif section in ['shows', 'show']:
-                    if section not in hierarchy['content_pages']:
-                        hierarchy['content_pages'][section] = []
-                    hierarchy['content_pages'][section].append(link)
+                elif record.kind in ['shows', 'show']:
+                    if record.kind not in hierarchy['content_pages']:
+                        hierarchy['content_pages'][record.kind] = []
+                    hierarchy['content_pages'][record.kind].append(link)
                     
                 else:
                     hierarchy['others'].append(link)
@@ -98,293 +118,284 @@ class HierarchicalLinksOrganizer:
         
         return hierarchy
     
-    def extract_id_and_title(self, link):
-        """استخراج ID والعنوان من الرابط"""
-        patterns = [
-            r'/(?:movie|series|person|mix|shows?)/(\d+)/(.+)',
-            r'/episode/(\d+)/([^/]+)/(.+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, link)
-            if match:
-                if len(match.groups()) == 2:
-                    return int(match.group(1)), urllib.parse.unquote(match.group(2))
-                elif len(match.groups()) == 3:
-                    return int(match.group(1)), f"{urllib.parse.unquote(match.group(2))} - {urllib.parse.unquote(match.group(3))}"
+    def extract_id_and_title(self, link, match=None):
+        """استخراج ID والعنوان من الرابط (match: سجل الفهرس إن كان متاحاً)"""
+        match = match or classify_url(link)
+        if match.rest:
+            if match.kind in ['episode', 'show_episode']:
+                series_name, _, episode_name = match.rest.partition('/')
+                if series_name and episode_name:
+                    return match.item_id, f"{decode_component(series_name)} - {decode_component(episode_name)}"
+            else:
+                return match.item_id, decode_component(match.rest)
         
         return 0, link.split('/')[-1]
     
-    def sort_content_intelligently(self, links):
-        """ترتيب المحتوى بذكاء"""
-        sorted_links = []
-        
-        for link in links:
-            id_val, title = self.extract_id_and_title(link)
-            sorted_links.append((id_val, title, link))
+    def sort_content_intelligently(self, links, entries=None):
+        """ترتيب المحتوى بذكاء (entries: ثلاثيات ID والعنوان المستخرجة مسبقاً في مرحلة التجميع)"""
+        if entries is None:
+            entries = []
+            for link in links:
+                id_val, title = self.extract_id_and_title(link)
+                entries.append((id_val, title, link))
         
         # ترتيب حسب ID
-        sorted_links.sort(key=lambda x: x[0])
-        return sorted_links
+        return sorted(entries, key=lambda x: x[0])
     
     def create_hierarchical_file(self):
         """إنشاء ملف مرتب هرمياً"""
         hierarchy = self.categorize_by_depth_and_type()
         
-        output_content = []
-        
-        # العنوان
-        output_content.append("# 🌳 روابط موقع AKWAM - ترتيب هرمي شامل")
-        output_content.append("=" * 60)
-        output_content.append(f"📊 إجمالي الروابط: {len(self.all_links):,}")
-        output_content.append("🎯 مرتب من الصفحة الرئيسية إلى أعمق المستويات")
-        output_content.append("🌳 تنظيم هرمي: رئيسية → أقسام → فئات → محتوى فردي")
-        output_content.append("")
-        
-        # الفهرس
-        output_content.append("## 📋 الفهرس الهرمي")
-        output_content.append("-" * 30)
-        output_content.append("1. 🏠 الصفحة الرئيسية")
-        output_content.append("2. 📂 الأقسام الرئيسية")
-        output_content.append("3. 🎬 صفحات الأفلام")
-        output_content.append("4. 📺 صفحات المسلسلات")
-        output_content.append("5. 👥 صفحات الأشخاص")
-        output_content.append("6. 📹 صفحات الحلقات")
-        output_content.append("7. 📺 صفحات العروض")
-        output_content.append("8. 🎭 صفحات المنوعات")
-        output_content.append("9. 🔗 روابط أخرى")
-        output_content.append("")
-        
-        # 1. الصفحة الرئيسية
-        output_content.append("## 1. 🏠 الصفحة الرئيسية")
-        output_content.append("-" * 40)
-        if hierarchy['root']:
-            for link in hierarchy['root']:
-                output_content.append(f"🏠 {link}")
-        output_content.append("")
-        
-        # 2. الأقسام الرئيسية
-        output_content.append("## 2. 📂 الأقسام الرئيسية")
-        output_content.append("-" * 40)
-        
-        # ترتيب الأقسام حسب الأهمية
-        section_priority = ['movies', 'series', 'shows', 'mix', 'person']
-        
-        for section in section_priority + [s for s in hierarchy['main_sections'].keys() if s not in section_priority]:
-            if section in hierarchy['main_sections']:
-                section_data = hierarchy['main_sections'][section]
-                total_links = len(section_data['base_links']) + len(section_data['with_params'])
-                
-                output_content.append(f"### 📂 /{section}/ ({total_links:,} رابط)")
-                output_content.append("")
-                
-                # الروابط الأساسية
-                if section_data['base_links']:
-                    output_content.append("#### الروابط الأساسية:")
-                    for link in section_data['base_links']:
-                        output_content.append(f"  📌 {link}")
-                    output_content.append("")
-                
-                # الروابط مع المعاملات (مرتبة)
-                if section_data['with_params']:
-                    output_content.append("#### روابط التصفح والفلترة:")
+        with ReportWriter(HIERARCHICAL_FILE, self.compression, deferred_header=True) as report:
+            # 1. الصفحة الرئيسية
+            report.append("## 1. 🏠 الصفحة الرئيسية")
+            report.append("-" * 40)
+            if hierarchy['root']:
+                for link in hierarchy['root']:
+                    report.append(f"🏠 {link}")
+            report.append("")
+            
+            # 2. الأقسام الرئيسية
+            report.append("## 2. 📂 الأقسام الرئيسية")
+            report.append("-" * 40)
+            
+            # ترتيب الأقسام حسب الأهمية
+            section_priority = ['movies', 'series', 'shows', 'mix', 'person']
+            
+            for section in section_priority + [s for s in hierarchy['main_sections'].keys() if s not in section_priority]:
+                if section in hierarchy['main_sections']:
+                    section_data = hierarchy['main_sections'][section]
+                    total_links = len(section_data['base_links']) + len(section_data['with_params'])
                     
-                    # تجميع حسب نوع المعامل
-                    param_groups = defaultdict(list)
-                    for link in section_data['with_params']:
-                        if '?category=' in link:
-                            param_groups['category'].append(link)
-                        elif '?page=' in link:
-                            param_groups['page'].append(link)
-                        elif '?tag=' in link:
-                            param_groups['tag'].append(link)
-                        else:
-                            param_groups['other'].append(link)
+                    report.append(f"### 📂 /{section}/ ({total_links:,} رابط)")
+                    report.append("")
                     
-                    # عرض كل مجموعة
-                    for param_type, param_links in param_groups.items():
-                        if param_links:
-                            output_content.append(f"  🏷️ تصفح حسب {param_type} ({len(param_links)} رابط):")
-                            
-                            # عرض أول 5 روابط من كل نوع
-                            for i, link in enumerate(param_links[:5]):
-                                output_content.append(f"    {i+1}. {link}")
-                            
-                            if len(param_links) > 5:
-                                output_content.append(f"    ... و {len(param_links)-5} رابط آخر")
-                            output_content.append("")
-                
-                output_content.append("")
-        
-        # 3. صفحات الأفلام
-        if 'movie' in hierarchy['content_pages']:
-            movies = hierarchy['content_pages']['movie']
-            sorted_movies = self.sort_content_intelligently(movies)
+                    # الروابط الأساسية
+                    if section_data['base_links']:
+                        report.append("#### الروابط الأساسية:")
+                        for link in section_data['base_links']:
+                            report.append(f"  📌 {link}")
+                        report.append("")
+                    
+                    # الروابط مع المعاملات (مرتبة)
+                    if section_data['with_params']:
+                        report.append("#### روابط التصفح والفلترة:")
+                        
+                        # تجميع حسب نوع المعامل
+                        param_groups = defaultdict(list)
+                        for link in section_data['with_params']:
+                            if '?category=' in link:
+                                param_groups['category'].append(link)
+                            elif '?page=' in link:
+                                param_groups['page'].append(link)
+                            elif '?tag=' in link:
+                                param_groups['tag'].append(link)
+                            else:
+                                param_groups['other'].append(link)
+                        
+                        # عرض كل مجموعة
+                        for param_type, param_links in param_groups.items():
+                            if param_links:
+                                report.append(f"  🏷️ تصفح حسب {param_type} ({len(param_links)} رابط):")
+                                
+                                # عرض أول 5 روابط من كل نوع
+                                for i, link in enumerate(param_links[:5]):
+                                    report.append(f"    {i+1}. {link}")
+                                
+                                if len(param_links) > 5:
+                                    report.append(f"    ... و {len(param_links)-5} رابط آخر")
+                                report.append("")
+                    
+                    report.append("")
             
-            output_content.append(f"## 3. 🎬 صفحات الأفلام ({len(movies):,} فيلم)")
-            output_content.append("-" * 40)
-            output_content.append("مرتبة حسب ID من الأقدم للأحدث:")
-            output_content.append("")
+            # 3. صفحات الأفلام
+            if 'movie' in hierarchy['content_pages']:
+                movies = hierarchy['content_pages']['movie']
+                sorted_movies = self.sort_content_intelligently(movies, self.content_entries.get('movie'))
             
-            # تقسيم إلى مجموعات (كل 1000 فيلم)
-            for i in range(0, len(sorted_movies), 1000):
-                group = sorted_movies[i:i+1000]
-                start_id = group[0][0]
-                end_id = group[-1][0]
-                
-                output_content.append(f"### 🎬 أفلام ID {start_id:,} - {end_id:,} ({len(group)} فيلم)")
-                
-                for j, (id_val, title, link) in enumerate(group[:20]):  # أول 20 من كل مجموعة
-                    output_content.append(f"  {j+1:3d}. [{id_val:>5}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                
-                if len(group) > 20:
-                    output_content.append(f"       ... و {len(group)-20} فيلم آخر في هذا النطاق")
-                output_content.append("")
-        
-        # 4. صفحات المسلسلات
-        if 'series' in hierarchy['content_pages']:
-            series = hierarchy['content_pages']['series']
-            sorted_series = self.sort_content_intelligently(series)
+                report.append(f"## 3. 🎬 صفحات الأفلام ({len(movies):,} فيلم)")
+                report.append("-" * 40)
+                report.append("مرتبة حسب ID من الأقدم للأحدث:")
+                report.append("")
             
-            output_content.append(f"## 4. 📺 صفحات المسلسلات ({len(series):,} مسلسل)")
-            output_content.append("-" * 40)
-            output_content.append("مرتبة حسب ID من الأقدم للأحدث:")
-            output_content.append("")
+                # تقسيم إلى مجموعات (كل 1000 فيلم)
+                for i in range(0, len(sorted_movies), 1000):
+                    group = sorted_movies[i:i+1000]
+                    start_id = group[0][0]
+                    end_id = group[-1][0]
+                    
+                    report.append(f"### 🎬 أفلام ID {start_id:,} - {end_id:,} ({len(group)} فيلم)")
+                    
+                    for j, (id_val, title, link) in enumerate(group[:20]):  # أول 20 من كل مجموعة
+                        report.append(f"  {j+1:3d}. [{id_val:>5}] {title}")
+                        report.append(f"       🔗 {link}")
+                    
+                    if len(group) > 20:
+                        report.append(f"       ... و {len(group)-20} فيلم آخر في هذا النطاق")
+                    report.append("")
             
-            # تقسيم إلى مجموعات (كل 500 مسلسل)
-            for i in range(0, len(sorted_series), 500):
-                group = sorted_series[i:i+500]
-                start_id = group[0][0]
-                end_id = group[-1][0]
-                
-                output_content.append(f"### 📺 مسلسلات ID {start_id:,} - {end_id:,} ({len(group)} مسلسل)")
-                
-                for j, (id_val, title, link) in enumerate(group[:15]):  # أول 15 من كل مجموعة
-                    output_content.append(f"  {j+1:3d}. [{id_val:>5}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                
-                if len(group) > 15:
-                    output_content.append(f"       ... و {len(group)-15} مسلسل آخر في هذا النطاق")
-                output_content.append("")
-        
-        # 5. صفحات الأشخاص
-        if 'person' in hierarchy['content_pages']:
-            persons = hierarchy['content_pages']['person']
-            sorted_persons = self.sort_content_intelligently(persons)
+            # 4. صفحات المسلسلات
+            if 'series' in hierarchy['content_pages']:
+                series = hierarchy['content_pages']['series']
+                sorted_series = self.sort_content_intelligently(series, self.content_entries.get('series'))
             
-            output_content.append(f"## 5. 👥 صفحات الأشخاص ({len(persons):,} شخص)")
-            output_content.append("-" * 40)
+                report.append(f"## 4. 📺 صفحات المسلسلات ({len(series):,} مسلسل)")
+                report.append("-" * 40)
+                report.append("مرتبة حسب ID من الأقدم للأحدث:")
+                report.append("")
             
-            # تقسيم إلى عرب وأجانب
-            arabic_persons = [(id_val, title, link) for id_val, title, link in sorted_persons 
-                             if re.search(r'[\u0600-\u06FF]', title)]
-            foreign_persons = [(id_val, title, link) for id_val, title, link in sorted_persons 
-                              if not re.search(r'[\u0600-\u06FF]', title)]
+                # تقسيم إلى مجموعات (كل 500 مسلسل)
+                for i in range(0, len(sorted_series), 500):
+                    group = sorted_series[i:i+500]
+                    start_id = group[0][0]
+                    end_id = group[-1][0]
+                    
+                    report.append(f"### 📺 مسلسلات ID {start_id:,} - {end_id:,} ({len(group)} مسلسل)")
+                    
+                    for j, (id_val, title, link) in enumerate(group[:15]):  # أول 15 من كل مجموعة
+                        report.append(f"  {j+1:3d}. [{id_val:>5}] {title}")
+                        report.append(f"       🔗 {link}")
+                    
+                    if len(group) > 15:
+                        report.append(f"       ... و {len(group)-15} مسلسل آخر في هذا النطاق")
+                    report.append("")
             
-            if arabic_persons:
-                output_content.append(f"### 🇸🇦 الأشخاص العرب ({len(arabic_persons)} شخص)")
-                for i, (id_val, title, link) in enumerate(arabic_persons[:20]):
-                    output_content.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                if len(arabic_persons) > 20:
-                    output_content.append(f"       ... و {len(arabic_persons)-20} شخص عربي آخر")
-                output_content.append("")
+            # 5. صفحات الأشخاص
+            if 'person' in hierarchy['content_pages']:
+                persons = hierarchy['content_pages']['person']
+                sorted_persons = self.sort_content_intelligently(persons, self.content_entries.get('person'))
             
-            if foreign_persons:
-                output_content.append(f"### 🌍 الأشخاص الأجانب ({len(foreign_persons)} شخص)")
-                for i, (id_val, title, link) in enumerate(foreign_persons[:20]):
-                    output_content.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                if len(foreign_persons) > 20:
-                    output_content.append(f"       ... و {len(foreign_persons)-20} شخص أجنبي آخر")
-                output_content.append("")
-        
-        # 6. صفحات الحلقات
-        if hierarchy['episodes']:
-            output_content.append("## 6. 📹 صفحات الحلقات")
-            output_content.append("-" * 40)
+                report.append(f"## 5. 👥 صفحات الأشخاص ({len(persons):,} شخص)")
+                report.append("-" * 40)
             
-            for episode_type, episodes in hierarchy['episodes'].items():
-                sorted_episodes = self.sort_content_intelligently(episodes)
-                
-                output_content.append(f"### 📹 {episode_type} ({len(episodes):,} حلقة)")
-                
-                for i, (id_val, title, link) in enumerate(sorted_episodes[:15]):
-                    output_content.append(f"  {i+1:3d}. [{id_val:>8}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                
-                if len(sorted_episodes) > 15:
-                    output_content.append(f"       ... و {len(sorted_episodes)-15} حلقة أخرى")
-                output_content.append("")
-        
-        # 7. العروض والمنوعات
-        for content_type in ['shows', 'show', 'mix']:
-            if content_type in hierarchy['content_pages']:
-                content = hierarchy['content_pages'][content_type]
-                sorted_content = self.sort_content_intelligently(content)
-                
-                type_name = "العروض التلفزيونية" if content_type in ['shows', 'show'] else "المنوعات"
-                output_content.append(f"## 7. 📺 {type_name} ({len(content):,} عنصر)")
-                output_content.append("-" * 40)
-                
-                for i, (id_val, title, link) in enumerate(sorted_content[:20]):
-                    output_content.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
-                    output_content.append(f"       🔗 {link}")
-                
-                if len(sorted_content) > 20:
-                    output_content.append(f"       ... و {len(sorted_content)-20} عنصر آخر")
-                output_content.append("")
-        
-        # 8. روابط أخرى
-        if hierarchy['others']:
-            output_content.append(f"## 8. 🔗 روابط أخرى ({len(hierarchy['others'])} رابط)")
-            output_content.append("-" * 40)
-            for i, link in enumerate(hierarchy['others']):
-                output_content.append(f"  {i+1:3d}. {link}")
-            output_content.append("")
-        
-        # الخلاصة
-        output_content.append("## 📊 ملخص التنظيم الهرمي")
-        output_content.append("-" * 40)
-        output_content.append(f"🏠 الصفحة الرئيسية: {len(hierarchy['root'])} رابط")
-        output_content.append(f"📂 الأقسام الرئيسية: {len(hierarchy['main_sections'])} قسم")
-        
-        total_content = 0
-        for content_type, content_list in hierarchy['content_pages'].items():
-            count = len(content_list)
-            total_content += count
-            type_name = {
-                'movie': 'الأفلام',
-                'series': 'المسلسلات', 
-                'person': 'الأشخاص',
-                'shows': 'العروض',
-                'show': 'العروض',
-                'mix': 'المنوعات'
-            }.get(content_type, content_type)
-            output_content.append(f"📋 {type_name}: {count:,} عنصر")
-        
-        total_episodes = sum(len(episodes) for episodes in hierarchy['episodes'].values())
-        output_content.append(f"📹 الحلقات: {total_episodes:,} حلقة")
-        output_content.append(f"🔗 أخرى: {len(hierarchy['others'])} رابط")
-        output_content.append("")
-        output_content.append(f"📊 المجموع: {len(self.all_links):,} رابط")
-        
-        output_content.append("")
-        output_content.append("=" * 60)
-        output_content.append("🌳 تم تنظيم جميع الروابط في هيكل هرمي شامل")
-        output_content.append("📋 لم يتم إهمال أي رابط واحد من الـ 18,114 رابط")
-        output_content.append("🎯 ترتيب ذكي من الصفحة الرئيسية إلى أعمق المستويات")
-        
-        # حفظ الملف
-        with open('روابط_AKWAM_ترتيب_هرمي_شامل.txt', 'w', encoding='utf-8') as f:
-            f.write('\n'.join(output_content))
+                # تقسيم إلى عرب وأجانب
+                arabic_persons = [(id_val, title, link) for id_val, title, link in sorted_persons 
+                                 if has_arabic(title)]
+                foreign_persons = [(id_val, title, link) for id_val, title, link in sorted_persons 
+                                  if not has_arabic(title)]
+            
+                if arabic_persons:
+                    report.append(f"### 🇸🇦 الأشخاص العرب ({len(arabic_persons)} شخص)")
+                    for i, (id_val, title, link) in enumerate(arabic_persons[:20]):
+                        report.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
+                        report.append(f"       🔗 {link}")
+                    if len(arabic_persons) > 20:
+                        report.append(f"       ... و {len(arabic_persons)-20} شخص عربي آخر")
+                    report.append("")
+            
+                if foreign_persons:
+                    report.append(f"### 🌍 الأشخاص الأجانب ({len(foreign_persons)} شخص)")
+                    for i, (id_val, title, link) in enumerate(foreign_persons[:20]):
+                        report.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
+                        report.append(f"       🔗 {link}")
+                    if len(foreign_persons) > 20:
+                        report.append(f"       ... و {len(foreign_persons)-20} شخص أجنبي آخر")
+                    report.append("")
+            
+            # 6. صفحات الحلقات
+            if hierarchy['episodes']:
+                report.append("## 6. 📹 صفحات الحلقات")
+                report.append("-" * 40)
+            
+                for episode_type, episodes in hierarchy['episodes'].items():
+                    sorted_episodes = self.sort_content_intelligently(episodes, self.content_entries.get(episode_type))
+                    
+                    report.append(f"### 📹 {episode_type} ({len(episodes):,} حلقة)")
+                    
+                    for i, (id_val, title, link) in enumerate(sorted_episodes[:15]):
+                        report.append(f"  {i+1:3d}. [{id_val:>8}] {title}")
+                        report.append(f"       🔗 {link}")
+                    
+                    if len(sorted_episodes) > 15:
+                        report.append(f"       ... و {len(sorted_episodes)-15} حلقة أخرى")
+                    report.append("")
+            
+            # 7. العروض والمنوعات
+            for content_type in ['shows', 'show', 'mix']:
+                if content_type in hierarchy['content_pages']:
+                    content = hierarchy['content_pages'][content_type]
+                    sorted_content = self.sort_content_intelligently(content, self.content_entries.get(content_type))
+                    
+                    type_name = "العروض التلفزيونية" if content_type in ['shows', 'show'] else "المنوعات"
+                    report.append(f"## 7. 📺 {type_name} ({len(content):,} عنصر)")
+                    report.append("-" * 40)
+                    
+                    for i, (id_val, title, link) in enumerate(sorted_content[:20]):
+                        report.append(f"  {i+1:3d}. [{id_val:>5}] {title}")
+                        report.append(f"       🔗 {link}")
+                    
+                    if len(sorted_content) > 20:
+                        report.append(f"       ... و {len(sorted_content)-20} عنصر آخر")
+                    report.append("")
+            
+            # 8. روابط أخرى
+            if hierarchy['others']:
+                report.append(f"## 8. 🔗 روابط أخرى ({len(hierarchy['others'])} رابط)")
+                report.append("-" * 40)
+                for i, link in enumerate(hierarchy['others']):
+                    report.append(f"  {i+1:3d}. {link}")
+                report.append("")
+            
+            # الخلاصة
+            report.append("## 📊 ملخص التنظيم الهرمي")
+            report.append("-" * 40)
+            report.append(f"🏠 الصفحة الرئيسية: {len(hierarchy['root'])} رابط")
+            report.append(f"📂 الأقسام الرئيسية: {len(hierarchy['main_sections'])} قسم")
+            
+            total_content = 0
+            for content_type, content_list in hierarchy['content_pages'].items():
+                count = len(content_list)
+                total_content += count
+                type_name = {
+                    'movie': 'الأفلام',
+                    'series': 'المسلسلات', 
+                    'person': 'الأشخاص',
+                    'shows': 'العروض',
+                    'show': 'العروض',
+                    'mix': 'المنوعات'
+                }.get(content_type, content_type)
+                report.append(f"📋 {type_name}: {count:,} عنصر")
+            
+            total_episodes = sum(len(episodes) for episodes in hierarchy['episodes'].values())
+            report.append(f"📹 الحلقات: {total_episodes:,} حلقة")
+            report.append(f"🔗 أخرى: {len(hierarchy['others'])} رابط")
+            report.append("")
+            report.append(f"📊 المجموع: {len(self.all_links):,} رابط")
+            
+            report.append("")
+            report.append("=" * 60)
+            report.append("🌳 تم تنظيم جميع الروابط في هيكل هرمي شامل")
+            report.append("📋 لم يتم إهمال أي رابط واحد من الـ 18,114 رابط")
+            report.append("🎯 ترتيب ذكي من الصفحة الرئيسية إلى أعمق المستويات")
+            
+            # العنوان والفهرس يُكتبان بعد الأقسام ويوضعان في أول الملف
+            # العنوان
+            report.header("# 🌳 روابط موقع AKWAM - ترتيب هرمي شامل")
+            report.header("=" * 60)
+            report.header(f"📊 إجمالي الروابط: {len(self.all_links):,}")
+            report.header("🎯 مرتب من الصفحة الرئيسية إلى أعمق المستويات")
+            report.header("🌳 تنظيم هرمي: رئيسية → أقسام → فئات → محتوى فردي")
+            report.header("")
+            
+            # الفهرس
+            report.header("## 📋 الفهرس الهرمي")
+            report.header("-" * 30)
+            report.header("1. 🏠 الصفحة الرئيسية")
+            report.header("2. 📂 الأقسام الرئيسية")
+            report.header("3. 🎬 صفحات الأفلام")
+            report.header("4. 📺 صفحات المسلسلات")
+            report.header("5. 👥 صفحات الأشخاص")
+            report.header("6. 📹 صفحات الحلقات")
+            report.header("7. 📺 صفحات العروض")
+            report.header("8. 🎭 صفحات المنوعات")
+            report.header("9. 🔗 روابط أخرى")
+            report.header("")
         
-        print(f"✅ تم إنشاء الملف الهرمي: روابط_AKWAM_ترتيب_هرمي_شامل.txt")
+        print(f"✅ تم إنشاء الملف الهرمي: {report.path}")
         print(f"🌳 تم تنظيم {len(self.all_links):,} رابط في هيكل هرمي شامل")
         print("📋 جميع الروابط منظمة من الرئيسية إلى أعمق المستويات")
         
-        return output_content
+        return report.path
     
     def run_hierarchical_organization(self):
         """تشغيل التنظيم الهرمي"""
@@ -398,5 +409,12 @@ class HierarchicalLinksOrganizer:
         return result
 
 if __name__ == "__main__":
-    organizer = HierarchicalLinksOrganizer()
+    import argparse
+    parser = argparse.ArgumentParser(description='منظم الروابط الهرمي')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--compress', choices=[name for name in COMPRESSION_SUFFIXES if name],
+                        help='ضغط ملف التقرير')
+    args = parser.parse_args()
+    
+    organizer = HierarchicalLinksOrganizer(args.filename, compression=args.compress)
     organizer.run_hierarchical_organization()
\ No newline at end of file
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ذاكرة HTTP على القرص لتشغيلات التحليل المتكررة - محول requests يحفظ صفحات GET الناجحة مع
+ETag و Last-Modified، ويعيد التحقق منها بـ If-None-Match / If-Modified-Since فتُعاد الصفحة
+غير المتغيرة (304) من القرص دون نقل محتواها، ويحترم Cache-Control و Expires.
+كل الجلسات التي يُركب عليها (install_cache) تتشارك نفس المجلد
+"""
+
+import argparse
+import email.utils
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = '.http_cache'
+
+# ترويسات الاستجابة 304 التي تحدث النسخة المحفوظة
+REFRESH_HEADERS = ('Cache-Control', 'Expires', 'Date', 'ETag', 'Last-Modified')
+
+def cache_directives(value):
+    """'max-age=60, no-cache' -> {'max-age': '60', 'no-cache': ''}"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+def _http_date(value):
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def freshness_lifetime(headers):
+    """
+    مدة صلاحية الاستجابة بالثواني من max-age أو Expires (0 إذا لم تُحدد فيُعاد التحقق في كل طلب)
+    """
+    directives = cache_directives(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+    for name in ('s-maxage', 'max-age'):
+        if directives.get(name, '').isdigit():
+            return int(directives[name])
+    expires = _http_date(headers.get('Expires'))
+    if expires is not None:
+        date = _http_date(headers.get('Date')) or time.time()
+        return max(0, expires - date)
+    return 0
+
+def is_storable(response):
+    if response.request.method != 'GET' or response.status_code != 200:
+        return False
+    directives = cache_directives(response.headers.get('Cache-Control'))
+    return 'no-store' not in directives and response.headers.get('Vary', '').strip() != '*'
+
+class CachingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter بذاكرة على القرص: stats يعد hits (من القرص دون طلب)، revalidated (304)،
+    misses (تحميل كامل)، stored، و bytes_saved (حجم المحتوى الذي لم يُنقل)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = cache_dir
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _count(self, **counts):
+        with self._lock:
+            self.stats.update(counts)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.json', base + '.body'
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return entry, body
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    def _store(self, url, entry, body=None):
+        meta_path, body_path = self._paths(url)
+        if body is not None:
+            self._write(body_path, body)
+        self._write(meta_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def _entry(self, response, stored_at):
+        # المحتوى يُحفظ بعد فك الضغط
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        return {
+            'url': response.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'stored_at': stored_at,
+        }
+
+    def _cached_response(self, request, entry, body):
+        response = Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry['url']
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or 'no-store' in cache_directives(request.headers.get('Cache-Control')):
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry, body = self._load(url)
+        now = time.time()
+        if entry is not None:
+            if now - entry['stored_at'] < freshness_lifetime(entry['headers']):
+                self._count(hits=1, bytes_saved=len(body))
+                return self._cached_response(request, entry, body)
+            validators = CaseInsensitiveDict(entry['headers'])
+            if 'ETag' in validators:
+                request.headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                request.headers['If-Modified-Since'] = validators['Last-Modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            headers = entry['headers']
+            for name in REFRESH_HEADERS:
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            entry['stored_at'] = now
+            self._store(url, entry)
+            response.close()
+            self._count(revalidated=1, bytes_saved=len(body))
+            return self._cached_response(request, entry, body)
+
+        self._count(misses=1)
+        # الاستجابات المقروءة على أجزاء (stream=True) لا تُحفظ حتى لا يُقرأ محتواها هنا
+        if not stream and is_storable(response):
+            self._store(url, self._entry(response, now), response.content)
+            self._count(stored=1)
+        return response
+
+    def summary(self):
+        stats = self.stats
+        requests_count = stats['hits'] + stats['revalidated'] + stats['misses']
+        return (f"💾 ذاكرة HTTP: {requests_count} طلب - {stats['hits']} من القرص، "
+                f"{stats['revalidated']} لم تتغير (304)، {stats['misses']} تحميل كامل، "
+                f"{stats['bytes_saved'] / 1024:.1f} KB لم تُنقل")
+
+def install_cache(session, cache_dir=DEFAULT_CACHE_DIR, **adapter_options):
+    """تركيب الذاكرة على جلسة requests لكل روابط http و https (يعيد المحول لقراءة الإحصائيات)"""
+    adapter = CachingAdapter(cache_dir, **adapter_options)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
+
+def clear_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """حذف كل الصفحات المحفوظة (عدد الملفات المحذوفة)"""
+    removed = 0
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            os.remove(os.path.join(root, name))
+            removed += 1
+    return removed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='ذاكرة HTTP المشتركة لأدوات التحليل')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true', help='حذف كل الصفحات المحفوظة')
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"🗑️ تم حذف {clear_cache(args.cache_dir)} ملف")
+    else:
+        entries = size = 0
+        for root, _, files in os.walk(args.cache_dir):
+            for name in files:
+                if name.endswith('.body'):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(root, name))
+        print(f"💾 {entries} صفحة محفوظة ({size / 1024 / 1024:.1f} MB) في {args.cache_dir}")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محرك إحصائيات المعرفات - تخزين معرفات كل نوع محتوى في array('I') (4 بايت لكل معرف)
+مع حساب المدى والمتوسط والوسيط والمئينات والفجوات وكثافة المعرفات بتمريرات متجهة
+(NumPy اختيارية: تُستخدم إن كانت مثبتة، والنتائج مطابقة للمسار القياسي)
+"""
+
+import base64
+import heapq
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # المسار القياسي يكفي للملفات الصغيرة
+    np = None
+
+TYPECODE = 'I'
+
+# حدود فئات مدرج الفجوات: [0,1) معرفات مكررة، [1,2) متتالية، ثم مراتب عشرية
+GAP_EDGES = (0, 1, 2, 10, 100, 1000, 10000)
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+class IdStats:
+    """معرفات نوع محتوى واحد مع إحصائياتها (الترتيب يُحسب مرة ويُعاد استخدامه حتى الإضافة التالية)"""
+
+    def __init__(self, ids=(), use_numpy=True):
+        self.ids = array(TYPECODE, ids)
+        self.use_numpy = use_numpy and np is not None
+        self._sorted = None
+
+    def add(self, item_id):
+        self.ids.append(item_id)
+        self._sorted = None
+
+    def extend(self, ids):
+        self.ids.extend(ids)
+        self._sorted = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    # ==================== التخزين ====================
+
+    def to_state(self):
+        """المعرفات كنص base64 (little-endian) لحفظها في نقاط الحفظ بدلاً من قائمة JSON"""
+        data = array(TYPECODE, self.ids)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        return base64.b64encode(data.tobytes()).decode('ascii')
+
+    @classmethod
+    def from_state(cls, state, use_numpy=True):
+        stats = cls(use_numpy=use_numpy)
+        stats.ids.frombytes(base64.b64decode(state))
+        if sys.byteorder == 'big':
+            stats.ids.byteswap()
+        return stats
+
+    # ==================== التمريرات الأساسية ====================
+
+    def _as_numpy(self, data):
+        # عرض دون نسخ؛ لا يُحتفظ به حتى لا يمنع إلحاق معرفات جديدة بالمصفوفة
+        return np.frombuffer(data, dtype=np.dtype(f'u{data.itemsize}'))
+
+    def _to_array(self, values):
+        result = array(TYPECODE)
+        result.frombytes(values.astype(np.dtype(f'u{result.itemsize}')).tobytes())
+        return result
+
+    def sorted_ids(self):
+        """المعرفات مرتبة تصاعدياً (array)"""
+        if self._sorted is None:
+            if self.use_numpy:
+                self._sorted = self._to_array(np.sort(self._as_numpy(self.ids)))
+            else:
+                self._sorted = array(TYPECODE, sorted(self.ids))
+        return self._sorted
+
+    def min(self):
+        if not self.ids:
+            return None
+        if self._sorted is not None:
+            return self._sorted[0]
+        return int(self._as_numpy(self.ids).min()) if self.use_numpy else min(self.ids)
+
+    def max(self):
+        if not self.ids:
+            return None
+        if self._sorted is not None:
+            return self._sorted[-1]
+        return int(self._as_numpy(self.ids).max()) if self.use_numpy else max(self.ids)
+
+    def total(self):
+        """مجموع المعرفات (عدد صحيح دقيق)"""
+        if self.use_numpy:
+            return int(self._as_numpy(self.ids).sum(dtype=np.uint64))
+        return sum(self.ids)
+
+    def mean(self):
+        """المتوسط بنفس دلالة statistics.mean (عدد صحيح إذا كانت القسمة تامة)"""
+        if not self.ids:
+            return None
+        total, count = self.total(), len(self.ids)
+        return total // count if total % count == 0 else total / count
+
+    def median(self):
+        """الوسيط بنفس دلالة statistics.median"""
+        count = len(self.ids)
+        if not count:
+            return None
+        ordered = self.sorted_ids()
+        middle = count // 2
+        if count % 2:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
+
+    def percentile(self, percent):
+        """المئين بالاستيفاء الخطي بين أقرب رتبتين (طريقة numpy.percentile الافتراضية)"""
+        if not self.ids:
+            return None
+        ordered = self.sorted_ids()
+        rank = (len(ordered) - 1) * percent / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    def percentiles(self, percents=DEFAULT_PERCENTILES):
+        return {percent: self.percentile(percent) for percent in percents}
+
+    # ==================== الفجوات والكثافة ====================
+
+    def gaps(self):
+        """الفروق بين كل معرفين متتاليين بعد الترتيب (array بطول n-1)"""
+        ordered = self.sorted_ids()
+        if self.use_numpy:
+            return self._to_array(np.diff(self._as_numpy(ordered)))
+        return array(TYPECODE, (b - a for a, b in zip(ordered, islice(ordered, 1, None))))
+
+    def gaps_over(self, threshold):
+        """الفجوات الأكبر من threshold بترتيب مواضعها في نطاق المعرفات"""
+        gaps = self.gaps()
+        if self.use_numpy:
+            values = self._as_numpy(gaps)
+            return self._to_array(values[values > threshold])
+        return array(TYPECODE, (gap for gap in gaps if gap > threshold))
+
+    def gap_histogram(self, edges=GAP_EDGES):
+        """عدد الفجوات في كل فئة: [(الحد الأدنى، الحد الأعلى أو None للفئة الأخيرة، العدد)]"""
+        gaps = self.gaps()
+        if self.use_numpy:
+            counts = np.bincount(np.searchsorted(edges, self._as_numpy(gaps), side='right'),
+                                 minlength=len(edges) + 1).tolist()
+        else:
+            found = Counter(bisect_right(edges, gap) for gap in gaps)
+            counts = [found[position] for position in range(len(edges) + 1)]
+        bounds = list(edges[1:]) + [None]
+        return [(low, high, counts[position + 1]) for position, (low, high) in enumerate(zip(edges, bounds))]
+
+    def largest_gaps(self, count=10):
+        """أكبر الفجوات: [(الفجوة، المعرف قبلها، المعرف بعدها)] تنازلياً، والتعادل بالأسبق"""
+        gaps = self.gaps()
+        ordered = self.sorted_ids()
+        if self.use_numpy:
+            positions = np.argsort(-self._as_numpy(gaps).astype(np.int64), kind='stable')[:count].tolist()
+        else:
+            positions = heapq.nlargest(count, range(len(gaps)), key=gaps.__getitem__)
+        return [(gaps[position], ordered[position], ordered[position + 1]) for position in positions]
+
+    def density(self, bucket_size=1000):
+        """عدد المعرفات في كل نطاق بطول bucket_size: {بداية النطاق: العدد} تصاعدياً (النطاقات غير الفارغة)"""
+        ordered = self.sorted_ids()
+        if self.use_numpy:
+            buckets, counts = np.unique(self._as_numpy(ordered) // bucket_size, return_counts=True)
+            return {int(bucket) * bucket_size: int(found) for bucket, found in zip(buckets, counts)}
+        return {bucket * bucket_size: found
+                for bucket, found in Counter(item_id // bucket_size for item_id in ordered).items()}
+
+    def summary(self, percents=DEFAULT_PERCENTILES):
+        """ملخص الإحصائيات الأساسية"""
+        return {
+            'count': len(self.ids),
+            'min': self.min(),
+            'max': self.max(),
+            'mean': self.mean(),
+            'median': self.median(),
+            'percentiles': self.percentiles(percents) if self.ids else {},
+        }
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مطابق الكلمات المفتاحية المتعددة (Aho-Corasick) - آلة حالات تُبنى مرة واحدة من جداول الكلمات،
+ثم تجد كل الوسوم (الأنواع، مؤشرات الجودة...) في تمريرة خطية واحدة على النص
+مهما كبر عدد الكلمات، مع دعم الكلمات العربية واللاتينية ومطابقة الكلمات الكاملة
+"""
+
+import argparse
+from collections import Counter, deque
+
+# جدول الأنواع: الترتيب مهم، فالرابط يُنسب لأول نوع تطابق إحدى كلماته
+GENRE_KEYWORDS = {
+    'أكشن': ['action', 'fight', 'war', 'battle', 'combat'],
+    'كوميديا': ['comedy', 'funny', 'laugh', 'humor'],
+    'دراما': ['drama', 'life', 'family', 'love'],
+    'رعب': ['horror', 'scary', 'ghost', 'demon'],
+    'خيال علمي': ['sci-fi', 'space', 'future', 'robot'],
+    'رومانسي': ['romance', 'love', 'wedding', 'heart'],
+    'إثارة': ['thriller', 'suspense', 'mystery'],
+    'مغامرة': ['adventure', 'journey', 'quest'],
+    'جريمة': ['crime', 'police', 'detective', 'murder'],
+    'تاريخي': ['history', 'historical', 'ancient'],
+    'وثائقي': ['documentary', 'real', 'true'],
+    'أنمي': ['anime', 'animation', 'cartoon']
+}
+
+# مؤشرات الجودة بترتيب عرضها
+QUALITY_KEYWORDS = {
+    'HD': ['hd'],
+    '4K': ['4k'],
+    'BluRay': ['bluray'],
+    'مترجم': ['مترجم'],
+    'مدبلج': ['مدبلج'],
+}
+
+# فاصل بين النصوص الممسوحة معاً (لا يظهر في أي كلمة فلا تعبره مطابقة)
+TEXT_SEPARATOR = '\n'
+
+NO_MATCH = float('inf')
+
+class KeywordMatcher:
+    """
+    آلة Aho-Corasick لجدول {وسم: [كلمات]}؛ رتبة الوسم هي ترتيب ظهوره في الجدول
+    whole_tokens=True يقبل المطابقة فقط إذا لم تكن ملاصقة لحرف أو رقم من الجهتين
+    (الشرطات والشرطات المائلة وعلامات الترقيم حدود كلمات)
+    """
+
+    def __init__(self, keywords=None, whole_tokens=False, ignore_case=True):
+        self.whole_tokens = whole_tokens
+        self.ignore_case = ignore_case
+        self.tags = []
+        self._ranks = {}
+        self._goto = [{}]
+        self._keywords = [()]  # لكل حالة: (طول الكلمة، رتبة الوسم) للكلمات المنتهية عندها
+        self._built = False
+        for tag, tag_keywords in (keywords or {}).items():
+            for keyword in tag_keywords:
+                self.add(tag, keyword)
+
+    def add(self, tag, keyword):
+        """إضافة كلمة لوسم (يمكن إضافة كلمات بعد الاستخدام، فتُعاد البنية عند المسح التالي)"""
+        if self.ignore_case:
+            keyword = keyword.lower()
+        if not keyword or TEXT_SEPARATOR in keyword:
+            raise ValueError(f"كلمة مفتاحية غير صالحة: {keyword!r}")
+        if tag not in self._ranks:
+            self._ranks[tag] = len(self.tags)
+            self.tags.append(tag)
+        rank = self._ranks[tag]
+
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._keywords.append(())
+            state = nxt
+        if (len(keyword), rank) not in self._keywords[state]:
+            self._keywords[state] += ((len(keyword), rank),)
+        self._built = False
+
+    def __len__(self):
+        return sum(len(found) for found in self._keywords)
+
+    def build(self):
+        """
+        حساب روابط الفشل بالعرض أولاً، ثم جدول انتقالات كامل لكل حالة (دون انتقالات الجذر
+        المشتركة) وكل المطابقات المنتهية عند كل حالة، فيصبح كل حرف بحثاً واحداً في قاموس
+        """
+        goto = self._goto
+        fail = [0] * len(goto)
+        self._delta = delta = [{} for _ in goto]
+        self._matches = matches = list(self._keywords)
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                suffix = fail[state]
+                while suffix and char not in goto[suffix]:
+                    suffix = fail[suffix]
+                fail[nxt] = goto[suffix].get(char, 0) if state else 0
+            if state:
+                # الحالة الأقصر (fail) حُسبت قبلها لأن العرض أولاً يمر بالأعمق لاحقاً
+                delta[state] = {**delta[fail[state]], **goto[state]}
+                matches[state] = matches[state] + matches[fail[state]]
+
+        # أفضل (أصغر) رتبة وسم منتهية عند كل حالة، لمسار "أول وسم" السريع
+        self._best = [min((rank for _, rank in found), default=NO_MATCH) for found in matches]
+        self._built = True
+
+    def _prepare(self, texts):
+        if not self._built:
+            self.build()
+        text = TEXT_SEPARATOR.join(texts)
+        return text.lower() if self.ignore_case else text
+
+    def _is_token(self, text, end, length):
+        start = end - length
+        return ((start == 0 or not text[start - 1].isalnum())
+                and (end == len(text) or not text[end].isalnum()))
+
+    def iter_matches(self, *texts):
+        """كل المطابقات: (موضع البداية، الكلمة، الوسم) بترتيب موضع النهاية"""
+        text = self._prepare(texts)
+        root, delta, matches = self._goto[0], self._delta, self._matches
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char) or root.get(char, 0)
+            for length, rank in matches[state]:
+                if not self.whole_tokens or self._is_token(text, end, length):
+                    yield end - length, text[end - length:end], self.tags[rank]
+
+    def first_tag(self, *texts):
+        """الوسم الأعلى رتبة (الأسبق في الجدول) الذي تطابقت إحدى كلماته، أو None"""
+        if self.whole_tokens:
+            found = min((self._ranks[tag] for _, _, tag in self.iter_matches(*texts)), default=NO_MATCH)
+        else:
+            text = self._prepare(texts)
+            root, delta, best = self._goto[0], self._delta, self._best
+            state = 0
+            found = NO_MATCH
+            for char in text:
+                state = delta[state].get(char) or root.get(char, 0)
+                if best[state] < found:
+                    found = best[state]
+                    if not found:
+                        break
+        return self.tags[found] if found is not NO_MATCH else None
+
+    def find_tags(self, *texts):
+        """كل الوسوم المطابقة مرة واحدة بترتيب الجدول"""
+        ranks = {self._ranks[tag] for _, _, tag in self.iter_matches(*texts)}
+        return [self.tags[rank] for rank in sorted(ranks)]
+
+if __name__ == "__main__":
+    from link_decode import link_title
+    from link_index import load_link_index
+
+    parser = argparse.ArgumentParser(description='وسم الروابط بالأنواع ومؤشرات الجودة')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--whole-tokens', action='store_true', help='مطابقة الكلمات الكاملة فقط')
+    args = parser.parse_args()
+
+    links = load_link_index(args.filename).links
+    genres = KeywordMatcher(GENRE_KEYWORDS, whole_tokens=args.whole_tokens)
+    quality = KeywordMatcher(QUALITY_KEYWORDS, whole_tokens=args.whole_tokens)
+
+    genre_counts = Counter(genres.first_tag(link, link_title(link)) or 'عام' for link in links)
+    quality_counts = Counter(tag for link in links for tag in quality.find_tags(link))
+
+    print(f"🏷️ الأنواع ({len(links):,} رابط، {len(genres)} كلمة):")
+    for genre, count in genre_counts.most_common():
+        print(f"  {genre:<12} {count:,}")
+    print("💎 مؤشرات الجودة:")
+    for tag, count in quality_counts.most_common():
+        print(f"  {tag:<12} {count:,}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+كشف لغة العناوين والصفحات - عد الحروف العربية واللاتينية في تمريرة واحدة على بايتات UTF-8
+(كل حرف في النطاق U+0600-U+06FF يبدأ ببايت من 0xD8 إلى 0xDB، والحروف اللاتينية بايت واحد)،
+مع واجهة دفعات تصنف قائمة عناوين كاملة بعمليات متجهة عند توفر NumPy
+"""
+
+import argparse
+import re
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # الدفعات تُصنف نصاً نصاً
+    np = None
+
+ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
+
+# البايت الأول لكل حرف من U+0600 إلى U+06FF في UTF-8
+ARABIC_LEAD_BYTES = bytes(range(0xD8, 0xDC))
+LATIN_BYTES = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+# كل البايتات الأخرى تُحذف بـ bytes.translate فيبقى حرف واحد لكل حرف عربي أو لاتيني
+NON_LETTER_BYTES = bytes(set(range(256)) - set(ARABIC_LEAD_BYTES) - set(LATIN_BYTES))
+
+# فاصل النصوص في واجهة الدفعات (يبقى بعد التصفية ليحدد حدود كل نص)
+TEXT_SEPARATOR = '\x00'
+NON_LETTER_BYTES_KEEP_SEPARATOR = NON_LETTER_BYTES.replace(TEXT_SEPARATOR.encode(), b'')
+
+# حدود نسبة الحروف العربية بين الحروف المعدودة
+ARABIC_THRESHOLD = 0.7
+MIXED_THRESHOLD = 0.3
+
+LANGUAGE_LABELS = ('unknown', 'arabic', 'mixed', 'english')
+
+class ScriptCounts(NamedTuple):
+    arabic: int     # حروف U+0600-U+06FF
+    latin: int      # a-z و A-Z
+    other: int      # باقي الحروف (أرقام، رموز، مسافات، نصوص أخرى)
+
+def _encode(text):
+    return text.encode('utf-8', 'surrogatepass')
+
+def script_counts(text):
+    """عدد الحروف العربية واللاتينية والأخرى في النص"""
+    letters = _encode(text).translate(None, NON_LETTER_BYTES)
+    latin = len(letters.translate(None, ARABIC_LEAD_BYTES))
+    arabic = len(letters) - latin
+    return ScriptCounts(arabic, latin, len(text) - arabic - latin)
+
+def has_arabic(text):
+    """هل يحتوي النص على حرف عربي واحد على الأقل (يتوقف عند أول حرف)"""
+    return ARABIC_RE.search(text) is not None
+
+def language_label(arabic, latin):
+    """arabic / mixed / english حسب نسبة الحروف العربية، أو unknown إذا لم توجد حروف"""
+    total = arabic + latin
+    if total == 0:
+        return 'unknown'
+    arabic_ratio = arabic / total
+    if arabic_ratio > ARABIC_THRESHOLD:
+        return 'arabic'
+    elif arabic_ratio > MIXED_THRESHOLD:
+        return 'mixed'
+    else:
+        return 'english'
+
+def detect_language(text):
+    """كشف لغة نص واحد"""
+    counts = script_counts(text)
+    return language_label(counts.arabic, counts.latin)
+
+def batch_script_counts(texts):
+    """
+    عدد الحروف لقائمة نصوص: (مصفوفة الحروف العربية، مصفوفة اللاتينية)
+    النصوص تُدمج بفاصل وتُرمز وتُصفى مرة واحدة، ثم تُحسب المجاميع عند حدود كل نص بـ NumPy
+    """
+    joined = TEXT_SEPARATOR.join(texts)
+    letters = _encode(joined).translate(None, NON_LETTER_BYTES_KEEP_SEPARATOR)
+    data = np.frombuffer(letters, dtype=np.uint8)
+    separators = np.flatnonzero(data == ord(TEXT_SEPARATOR))
+    if len(separators) != len(texts) - 1:
+        # أحد النصوص يحتوي على الفاصل نفسه
+        counts = [script_counts(text) for text in texts]
+        return (np.array([count.arabic for count in counts], dtype=np.int64),
+                np.array([count.latin for count in counts], dtype=np.int64))
+
+    starts = np.concatenate(([0], separators + 1))
+    ends = np.concatenate((separators, [len(data)]))
+    arabic_total = np.concatenate(([0], np.cumsum(data >= ARABIC_LEAD_BYTES[0])))
+    arabic = arabic_total[ends] - arabic_total[starts]
+    return arabic, ends - starts - arabic
+
+def detect_languages(texts):
+    """كشف لغة قائمة نصوص (نفس نتائج detect_language لكل نص)"""
+    if np is None or not texts:
+        return [detect_language(text) for text in texts]
+
+    arabic, latin = batch_script_counts(texts)
+    total = arabic + latin
+    arabic_ratio = arabic / np.maximum(total, 1)
+    labels = np.select(
+        [total == 0, arabic_ratio > ARABIC_THRESHOLD, arabic_ratio > MIXED_THRESHOLD],
+        [0, 1, 2], default=3)
+    return np.array(LANGUAGE_LABELS, dtype=object)[labels].tolist()
+
+if __name__ == "__main__":
+    from collections import Counter
+
+    from link_decode import link_title
+    from link_index import load_link_index
+
+    parser = argparse.ArgumentParser(description='توزيع لغات عناوين الروابط')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    args = parser.parse_args()
+
+    titles = [link_title(link) for link in load_link_index(args.filename).links]
+    print(f"🌐 لغات العناوين ({len(titles):,} عنوان):")
+    for language, count in Counter(detect_languages(titles)).most_common():
+        print(f"  {language:<8} {count:,}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ذاكرة مؤقتة مشتركة لفك ترميز النسبة المئوية واستخراج عناوين الروابط
+(الرابط نفسه يُفك ترميزه في كل منظم وكل تحليل، والعناوين العربية الطويلة مكلفة)
+"""
+
+import urllib.parse
+from functools import lru_cache
+
+from url_canonical import repair_mojibake
+
+# الحد الأقصى لعدد العناصر في كل ذاكرة (الأقدم استخداماً يُحذف أولاً)
+DECODE_CACHE_SIZE = 1 << 17
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_component(text):
+    """فك ترميز جزء من رابط (اسم، slug، معرف مع عنوان...)"""
+    return urllib.parse.unquote(text)
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def link_title(link):
+    """العنوان المفكوك: آخر جزء من مسار الرابط (المفتاح هو الرابط الخام)"""
+    return urllib.parse.unquote(link.split('/')[-1])
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_repaired(text):
+    """فك ترميز جزء من رابط ثم إصلاح الأسماء المحفوظة بترميز خاطئ مثل 'Ø§ÙÙ...' (أغلب روابط الملف)"""
+    return repair_mojibake(decode_component(text))
+
+
+CACHES = {
+    'decode_component': decode_component,
+    'link_title': link_title,
+    'decode_repaired': decode_repaired,
+}
+
+
+def cache_stats():
+    """إحصائيات كل ذاكرة: الإصابات، الإخفاقات، الحجم الحالي، نسبة الإصابة"""
+    stats = {}
+    for name, cached in CACHES.items():
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def print_cache_stats():
+    print("🗃️ ذاكرة فك الترميز:")
+    for name, stats in cache_stats().items():
+        print(f"  {name:<18} إصابات {stats['hits']:,} / إخفاقات {stats['misses']:,}"
+              f"  ({stats['hit_rate'] * 100:.1f}%)  الحجم {stats['size']:,}")
+
+
+def clear_caches():
+    for cached in CACHES.values():
+        cached.cache_clear()
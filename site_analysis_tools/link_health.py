@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فحص الروابط المعطلة - طلبات HEAD متوازية عبر جلسة واحدة باتصالات دائمة، مع الرجوع إلى GET لأول بايت
+(Range: bytes=0-0) للخوادم التي ترفض HEAD، ونتيجة كل رابط تُحفظ لمدة محددة (TTL) فيُفحص الرابط مرة
+واحدة في التشغيل مهما تكرر في الصفحات (روابط القوائم والتذييل)، ويمكن حفظ النتائج لتشغيلات لاحقة
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import requests
+
+from fetch_engine import pooled_session
+
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 10
+
+# مدة صلاحية نتيجة الفحص بالثواني
+DEFAULT_TTL = 6 * 60 * 60
+
+# فشل الاتصال أو انتهاء المهلة (status_code = 0) قد يكون عارضاً: يُعاد فحصه بعد مدة قصيرة ولا يُحفظ
+FAILURE_TTL = 60
+
+# ردود HEAD التي قد تعني أن الخادم لا يدعم HEAD نفسه فيُعاد الفحص بـ GET
+HEAD_FALLBACK_STATUSES = frozenset({400, 403, 405, 501})
+
+class LinkStatus(NamedTuple):
+    url: str
+    # 0 عند فشل الاتصال
+    status_code: int
+    # None للرابط السليم
+    error: Optional[str]
+    checked_at: float
+
+    @property
+    def broken(self):
+        return self.error is not None
+
+    def as_dict(self):
+        """نفس صيغة broken_links.json"""
+        return {'url': self.url, 'status_code': self.status_code, 'error': self.error}
+
+class LinkHealthChecker:
+    """
+    check_many(روابط) -> {الرابط: LinkStatus}، و broken(روابط) للمعطلة فقط بترتيب أول ظهور
+    الرابط الذي يُفحص حالياً لصفحة أخرى لا يُطلب مرة ثانية بل تُنتظر نتيجته
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, ttl=DEFAULT_TTL, user_agent=None,
+                 session=None, cache_file=None, failure_ttl=FAILURE_TTL):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.cache_file = cache_file
+        self.session = pooled_session(session, workers)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='links')
+        self._lock = threading.Lock()
+        self._pending = {}   # الرابط -> Future
+        self.results = {}    # الرابط -> LinkStatus
+        self.stats = Counter()
+        if cache_file:
+            self.load(cache_file)
+
+    # ==================== الفحص ====================
+
+    def _ranged_get(self, url):
+        with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True, allow_redirects=True,
+                              timeout=self.timeout) as response:
+            return response.status_code
+
+    def _request(self, url):
+        try:
+            status = self.session.head(url, allow_redirects=True, timeout=self.timeout).status_code
+            if status in HEAD_FALLBACK_STATUSES:
+                status = self._ranged_get(url)
+                with self._lock:
+                    self.stats['get_fallbacks'] += 1
+        except requests.exceptions.RequestException as e:
+            return LinkStatus(url, 0, str(e), time.time())
+        except Exception as e:
+            return LinkStatus(url, 0, f"Unknown error: {str(e)}", time.time())
+        return LinkStatus(url, status, f"HTTP {status}" if status >= 400 else None, time.time())
+
+    def _check(self, url):
+        status = self._request(url)
+        with self._lock:
+            self.results[url] = status
+            self._pending.pop(url, None)
+            self.stats['checked'] += 1
+        return status
+
+    def _fresh(self, url, now):
+        status = self.results.get(url)
+        if status is None:
+            return None
+        ttl = self.ttl if status.status_code else self.failure_ttl
+        return status if now - status.checked_at < ttl else None
+
+    def check_many(self, urls):
+        now = time.time()
+        results = {}
+        futures = {}
+        with self._lock:
+            for url in dict.fromkeys(urls):
+                status = self._fresh(url, now)
+                if status is not None:
+                    results[url] = status
+                    self.stats['cache_hits'] += 1
+                    continue
+                future = self._pending.get(url)
+                if future is None:
+                    future = self._pending[url] = self.executor.submit(self._check, url)
+                futures[url] = future
+        for url, future in futures.items():
+            results[url] = future.result()
+        return results
+
+    def check(self, url):
+        return self.check_many([url])[url]
+
+    def broken(self, urls):
+        """LinkStatus للروابط المعطلة (كل رابط مرة واحدة بترتيب أول ظهور)"""
+        statuses = self.check_many(urls)
+        return [statuses[url] for url in dict.fromkeys(urls) if statuses[url].broken]
+
+    # ==================== حفظ النتائج ====================
+
+    def load(self, filename):
+        """قراءة نتائج تشغيل سابق (النتائج المنتهية تُفحص من جديد عند طلبها، وفشل الاتصال لا يُقرأ)"""
+        try:
+            with open(filename, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for entry in entries:
+            status = LinkStatus(**entry)
+            if status.status_code:
+                self.results[status.url] = status
+
+    def save(self, filename=None):
+        """حفظ النتائج التي ردّ فيها الخادم فقط (فشل الاتصال يُعاد فحصه في التشغيل التالي)"""
+        filename = filename or self.cache_file
+        with self._lock:
+            entries = [status._asdict() for status in self.results.values() if status.status_code]
+        with open(filename + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(filename + '.tmp', filename)
+
+    def summary(self):
+        return (f"🔗 فحص الروابط: {self.stats['checked']} رابط فُحص، {self.stats['cache_hits']} من النتائج السابقة، "
+                f"{sum(status.broken for status in self.results.values())} معطل")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='فحص الروابط المعطلة بالتوازي')
+    parser.add_argument('filename', help='ملف روابط (رابط في كل سطر)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--cache-file', help='ملف نتائج الفحص السابقة (يُحدث بعد الفحص)')
+    args = parser.parse_args()
+
+    with open(args.filename, encoding='utf-8') as f:
+        links = [line.strip() for line in f if line.strip().startswith('http')]
+
+    with LinkHealthChecker(workers=args.workers, cache_file=args.cache_file) as checker:
+        start = time.perf_counter()
+        broken = checker.broken(links)
+        for status in broken:
+            print(f"❌ {status.url} -> {status.error}")
+        print(checker.summary())
+        print(f"⏱️ {time.perf_counter() - start:.2f} ثانية")
+        if args.cache_file:
+            checker.save()
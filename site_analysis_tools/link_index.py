@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس الروابط المشترك - تحليل ملف site_links.txt مرة واحدة لجميع المنظمات والمحللات
+"""
+
+import os
+import re
+import sys
+import urllib.parse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from link_decode import decode_repaired, link_title
+from link_stream import iter_links
+from url_classifier import CONTENT_CATEGORIES, classify_url
+
+# أرقام المواسم المكتوبة بالحروف كما تظهر في روابط الموقع
+SEASON_ORDINALS = {
+    'الاول': 1, 'الأول': 1, 'الثاني': 2, 'الثالث': 3, 'الرابع': 4, 'الخامس': 5,
+    'السادس': 6, 'السابع': 7, 'الثامن': 8, 'التاسع': 9, 'العاشر': 10,
+    'الحادي-عشر': 11, 'الثاني-عشر': 12, 'الثالث-عشر': 13, 'الرابع-عشر': 14,
+    'الخامس-عشر': 15, 'السادس-عشر': 16, 'السابع-عشر': 17, 'الثامن-عشر': 18,
+    'التاسع-عشر': 19, 'العشرون': 20,
+}
+
+ARABIC_RE = re.compile(r'[؀-ۿ]')
+SEASON_RE = re.compile(r'-?الموسم-(' + '|'.join(sorted(SEASON_ORDINALS, key=len, reverse=True)) + r'|\d+)')
+EPISODE_RE = re.compile(r'الحلقة-(\d+)')
+
+
+@dataclass(slots=True)
+class LinkRecord:
+    url: str
+    kind: str
+    section: str
+    item_id: Optional[int] = None
+    # كل ما بعد "/<id>/" كما في UrlMatch (None إذا لم تتبع المعرف شرطة)
+    rest: Optional[str] = None
+    slug: str = ''
+    title: str = ''
+    series_slug: Optional[str] = None
+    season: Optional[int] = None
+    episode: Optional[int] = None
+    query: Dict[str, str] = field(default_factory=dict)
+    is_arabic: bool = False
+
+    @property
+    def category(self):
+        return CONTENT_CATEGORIES.get(self.kind)
+
+    @property
+    def content_id(self):
+        """معرف المحتوى كما تستخدمه أدوات الترتيب (0 إذا لم يتبع المعرف مسار)"""
+        return self.item_id if self.rest is not None else 0
+
+
+def parse_season(text):
+    """استخراج رقم الموسم من نص مفكوك الترميز"""
+    match = SEASON_RE.search(text)
+    if not match:
+        return None
+    value = match.group(1)
+    return int(value) if value.isdigit() else SEASON_ORDINALS[value]
+
+
+def parse_link(url):
+    """تحليل رابط واحد إلى سجل مكتمل الحقول"""
+    match = classify_url(url)
+    # أسماء الأقسام تتكرر في آلاف السجلات: نسخة واحدة من كل اسم
+    record = LinkRecord(url=url, kind=match.kind, section=sys.intern(match.section), item_id=match.item_id,
+                        rest=match.rest)
+    record.slug = match.slug or ''
+    # يملأ ذاكرة العناوين المشتركة فتجدها المنظمات جاهزة لاحقاً
+    record.title = link_title(url)
+    record.is_arabic = bool(ARABIC_RE.search(record.title))
+
+    query = url.split('#', 1)[0].partition('?')[2]
+    if query:
+        record.query = dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+
+    if match.kind in ('episode', 'show_episode'):
+        rest = [s for s in record.slug.split('/') if s]
+        if rest:
+            series_part = decode_repaired(rest[0])
+            record.series_slug = series_part.split('-الموسم')[0]
+            record.season = parse_season(series_part)
+        if len(rest) > 1:
+            episode_match = EPISODE_RE.search(decode_repaired(rest[1]))
+            if episode_match:
+                record.episode = int(episode_match.group(1))
+    elif match.kind == 'series' and record.slug:
+        decoded = decode_repaired(record.slug)
+        record.series_slug = decoded.split('-الموسم')[0]
+        record.season = parse_season(decoded)
+
+    return record
+
+
+class LinkIndex:
+    """فهرس مبني مرة واحدة يحمل سجلات جميع الروابط بترتيب الملف"""
+
+    def __init__(self, records=None):
+        self.records: List[LinkRecord] = []
+        self.links: List[str] = []
+        self.by_section = defaultdict(list)
+        self.by_kind = defaultdict(list)
+        for record in records or []:
+            self.add(record)
+
+    def add(self, record):
+        self.records.append(record)
+        self.links.append(record.url)
+        self.by_section[record.section].append(record)
+        self.by_kind[record.kind].append(record)
+
+    def section(self, name):
+        """سجلات قسم معين بترتيب ظهورها"""
+        return self.by_section.get(name, [])
+
+    def kind(self, name):
+        """سجلات نوع محتوى معين (movie, series, episode, show_episode...)"""
+        return self.by_kind.get(name, [])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @classmethod
+    def from_file(cls, filename='site_links.txt'):
+        """بناء الفهرس من ملف الروابط (قراءة متدفقة دون تحميل الملف كنص)"""
+        index = cls()
+        for link in iter_links(filename):
+            index.add(parse_link(link))
+        return index
+
+
+_index_cache = {}
+
+
+def load_link_index(filename='site_links.txt'):
+    """تحميل الفهرس مع إعادة استخدامه طالما لم يتغير الملف"""
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _index_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    index = LinkIndex.from_file(path)
+    _index_cache[path] = (key, index)
+    return index
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محرك نقاط الشعبية - استخراج متجه خصائص رقمي لكل رابط مرة واحدة،
+ثم حساب النقاط لدفعات كاملة بأوزان قابلة للتعديل، واختيار الأفضل K بكومة
+مع وضع "شرح النقاط" لمعرفة مساهمة كل معيار
+"""
+
+import argparse
+import heapq
+import re
+from typing import NamedTuple
+
+from language_detect import has_arabic
+from link_decode import link_title
+from url_classifier import classify_url
+
+try:
+    import numpy as np
+except ImportError:  # الحساب بحلقة Python عادية
+    np = None
+
+SEASON_NUMBER_RE = re.compile(r'الموسم-(\d+)')
+
+# أوزان المعايير (نفس قيم calculate_popularity_score الأصلية)
+DEFAULT_WEIGHTS = {
+    'id': 30,               # ID / id_scale * الوزن
+    'id_scale': 25000,      # تقدير للحد الأقصى للمعرفات
+    'arabic': 15,           # محتوى عربي
+    'long_title': 10,       # عنوان أطول من 20 حرفاً
+    'medium_title': 5,      # عنوان أطول من 10 أحرف
+    'long_series': 20,      # مسلسل بموسم أكبر من 3
+    'multi_season': 10,     # مسلسل بموسم أكبر من 1
+    'translated': 10,       # مترجم أو مدبلج
+}
+
+class LinkFeatures(NamedTuple):
+    """متجه خصائص رابط واحد"""
+    item_id: int        # معرف المحتوى (0 إذا لم يتبع المعرف مسار)
+    arabic: bool        # يحتوي الرابط على حروف عربية
+    title_length: int   # طول العنوان المفكوك
+    season: int         # رقم الموسم لروابط المسلسلات (0 إن لم يوجد)
+    subtitled: bool     # مترجم
+    dubbed: bool        # مدبلج
+
+def extract_features(link, match=None, title=None):
+    """
+    استخراج متجه الخصائص من الرابط (تصنيف ومطابقات نصية مرة واحدة)،
+    مع match و title من سجل الفهرس المشترك لا يُعاد تصنيف الرابط ولا فك ترميز عنوانه
+    """
+    match = match or classify_url(link)
+    season = 0
+    if '/series/' in link and 'الموسم' in link:
+        season_match = SEASON_NUMBER_RE.search(link)
+        if season_match:
+            season = int(season_match.group(1))
+    return LinkFeatures(
+        item_id=match.item_id if match.rest is not None else 0,
+        arabic=has_arabic(link),
+        title_length=len(link_title(link) if title is None else title),
+        season=season,
+        subtitled='مترجم' in link,
+        dubbed='مدبلج' in link,
+    )
+
+class LinkScorer:
+    """حساب نقاط الشعبية من متجهات الخصائص بأوزان قابلة للتعديل"""
+
+    def __init__(self, weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+    def contributions(self, features):
+        """مساهمة كل معيار بالنقاط، بنفس ترتيب الجمع في الحساب"""
+        w = self.weights
+        points = []
+        if features.item_id:
+            points.append(('id', features.item_id / w['id_scale'] * w['id']))
+        if features.arabic:
+            points.append(('arabic', w['arabic']))
+        if features.title_length > 20:
+            points.append(('long_title', w['long_title']))
+        elif features.title_length > 10:
+            points.append(('medium_title', w['medium_title']))
+        if features.season > 3:
+            points.append(('long_series', w['long_series']))
+        elif features.season > 1:
+            points.append(('multi_season', w['multi_season']))
+        if features.subtitled or features.dubbed:
+            points.append(('translated', w['translated']))
+        return points
+
+    def score_features(self, features):
+        score = 0
+        for _, value in self.contributions(features):
+            score += value
+        return score
+
+    def score(self, link):
+        return self.score_features(extract_features(link))
+
+    def score_batch(self, features_list):
+        """نقاط دفعة كاملة من متجهات الخصائص (عمليات متجهة مع NumPy)"""
+        if np is None or not features_list:
+            return [self.score_features(features) for features in features_list]
+
+        w = self.weights
+        count = len(features_list)
+        item_id, arabic, title_length, season, subtitled, dubbed = (
+            np.fromiter(column, dtype=np.int64, count=count) for column in zip(*features_list))
+        # الجمع بنفس ترتيب score_features حتى تتطابق القيم العشرية تماماً
+        scores = np.where(item_id > 0, item_id / w['id_scale'] * w['id'], 0.0)
+        scores += np.where(arabic > 0, w['arabic'], 0)
+        scores += np.where(title_length > 20, w['long_title'],
+                           np.where(title_length > 10, w['medium_title'], 0))
+        scores += np.where(season > 3, w['long_series'], np.where(season > 1, w['multi_season'], 0))
+        scores += np.where((subtitled > 0) | (dubbed > 0), w['translated'], 0)
+        return scores.tolist()
+
+    @staticmethod
+    def rank_keys(links, scores, ids):
+        """مفتاح الترتيب لكل رابط: النقاط ثم المعرف تنازلياً"""
+        return {link: (-score, -item_id) for link, score, item_id in zip(links, scores, ids)}
+
+    @staticmethod
+    def top_k(links, k, rank_keys):
+        """
+        أفضل k روابط حسب مفاتيح rank_keys المحسوبة مسبقاً
+        مطابق لأول k عناصر من الترتيب الكامل المستقر، بزمن O(n log k)
+        """
+        return heapq.nsmallest(k, links, key=rank_keys.__getitem__)
+
+    def explain(self, link):
+        """شرح نقاط رابط: (الخصائص، [(المعيار، النقاط)...]، المجموع)"""
+        features = extract_features(link)
+        points = self.contributions(features)
+        return features, points, self.score_features(features)
+
+    def format_explanation(self, link):
+        features, points, total = self.explain(link)
+        lines = [f"🔗 {link}", f"📐 الخصائص: {dict(features._asdict())}"]
+        for name, value in points:
+            lines.append(f"  + {name:<14} {value:6.1f}")
+        lines.append(f"  = المجموع        {total:6.1f}")
+        return '\n'.join(lines)
+
+def parse_weights(items):
+    """أوزان من سطر الأوامر بصيغة name=value"""
+    weights = {}
+    for item in items:
+        name, _, value = item.partition('=')
+        if name not in DEFAULT_WEIGHTS:
+            raise SystemExit(f"❌ وزن غير معروف: {name} (المتاح: {', '.join(DEFAULT_WEIGHTS)})")
+        weights[name] = float(value)
+    return weights
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='شرح نقاط الشعبية لروابط AKWAM')
+    parser.add_argument('links', nargs='+', help='الروابط المطلوب شرح نقاطها')
+    parser.add_argument('--weight', action='append', default=[], metavar='NAME=VALUE',
+                        help='تعديل وزن معيار (يمكن تكراره)')
+    args = parser.parse_args()
+
+    scorer = LinkScorer(parse_weights(args.weight))
+    for link in args.links:
+        print(scorer.format_explanation(link))
+        print()
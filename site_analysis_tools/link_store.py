@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مخزن الروابط الدائم - قاعدة SQLite تحفظ الروابط المحللة مع إدخال تزايدي
+لا يُعاد فيه تحليل إلا الأسطر الجديدة، وتُولَّد التقارير منه باستعلامات مفهرسة
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from link_index import LinkIndex, parse_link
+from link_stream import complete_length, iter_links, prefix_digest
+from links_organizer import CATEGORY_NAMES, ORGANIZED_FILE, link_category, write_organized_links
+from report_writer import COMPRESSION_SUFFIXES
+
+DEFAULT_DB = 'akwam_links.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    section TEXT NOT NULL,
+    category TEXT NOT NULL,
+    item_id INTEGER,
+    sort_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    is_arabic INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_links_section_id ON links(section, item_id);
+CREATE INDEX IF NOT EXISTS idx_links_category_sort ON links(category, sort_id);
+
+CREATE TABLE IF NOT EXISTS content_items (
+    link_id INTEGER PRIMARY KEY REFERENCES links(id),
+    kind TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    slug TEXT,
+    series_slug TEXT,
+    season INTEGER,
+    episode INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_content_kind_id ON content_items(kind, item_id);
+CREATE INDEX IF NOT EXISTS idx_content_series ON content_items(series_slug, season, episode);
+
+CREATE TABLE IF NOT EXISTS query_params (
+    link_id INTEGER NOT NULL REFERENCES links(id),
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_query_name_value ON query_params(name, value);
+
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+class LinkStore:
+    """مخزن روابط دائم فوق sqlite3 (ترتيب id هو ترتيب أول ظهور للرابط)"""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==================== الإدخال ====================
+
+    def resume_offset(self, path):
+        """موضع الاستئناف إذا كان الملف قد نما بإضافات في نهايته فقط، وإلا 0"""
+        row = self.conn.execute("SELECT offset, digest FROM sources WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return 0
+        offset, digest = row
+        return offset if prefix_digest(path, offset) == digest else 0
+
+    def add_link(self, url):
+        """إضافة رابط واحد إن لم يكن موجوداً (يعيد True إذا أضيف)"""
+        # النوع والقسم والمعرف من سجل واحد دون تصنيف الرابط مرة ثانية
+        record = parse_link(url)
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO links (url, kind, section, category, item_id, sort_id, title, is_arabic) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, record.kind, record.section, link_category(url, record), record.item_id,
+             record.content_id, record.title, int(record.is_arabic)),
+        )
+        if not cursor.rowcount:
+            return False
+
+        link_id = cursor.lastrowid
+        if record.category:
+            self.conn.execute(
+                "INSERT INTO content_items (link_id, kind, item_id, slug, series_slug, season, episode) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (link_id, record.kind, record.item_id, record.slug if record.rest is not None else None,
+                 record.series_slug, record.season, record.episode),
+            )
+        if record.query:
+            self.conn.executemany(
+                "INSERT INTO query_params (link_id, name, value) VALUES (?, ?, ?)",
+                [(link_id, name, value) for name, value in record.query.items()],
+            )
+        return True
+
+    def ingest(self, filename='site_links.txt'):
+        """
+        إدخال أسطر الملف الجديدة فقط، ويعيد (عدد الأسطر المقروءة، عدد الروابط المضافة)
+        السطر الأخير غير المنتهي بفاصل أسطر يُترك حتى يكتمل، حتى لا يُحفظ رابط مقطوع
+        من ملف زحف ما زال يُكتب
+        """
+        path = os.path.abspath(filename)
+        start = self.resume_offset(path)
+        offset = complete_length(path)
+
+        scanned = added = 0
+        with self.conn:
+            for _, line_end, link in iter_links(path, start, with_offsets=True):
+                if line_end > offset:
+                    break
+                scanned += 1
+                added += self.add_link(link)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, offset, digest, ingested_at) VALUES (?, ?, ?, ?)",
+                (path, offset, prefix_digest(path, offset), datetime.now().isoformat()),
+            )
+        return scanned, added
+
+    # ==================== الاستعلام ====================
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def category_counts(self):
+        """عدد الروابط في كل فئة"""
+        return dict(self.conn.execute("SELECT category, COUNT(*) FROM links GROUP BY category"))
+
+    def category_links(self, category):
+        """روابط فئة بترتيب الملف المنظم: المحتوى حسب المعرف، والصفحات أبجدياً"""
+        if category in ('main_pages', 'others'):
+            sql = "SELECT url FROM links WHERE category = ? ORDER BY url"
+        else:
+            sql = "SELECT url FROM links WHERE category = ? ORDER BY sort_id, id"
+        return [url for url, in self.conn.execute(sql, (category,))]
+
+    def organized_links(self):
+        """الفئات المرتبة كما يبنيها منظم الروابط"""
+        return {name: self.category_links(name) for name in CATEGORY_NAMES}
+
+    def section_links(self, section, min_id=None, max_id=None):
+        """روابط قسم معين مرتبة بالمعرف، مع نطاق معرفات اختياري"""
+        sql = "SELECT url FROM links WHERE section = ?"
+        params = [section]
+        if min_id is not None:
+            sql += " AND item_id >= ?"
+            params.append(min_id)
+        if max_id is not None:
+            sql += " AND item_id <= ?"
+            params.append(max_id)
+        sql += " ORDER BY item_id, id"
+        return [url for url, in self.conn.execute(sql, params)]
+
+    def series_links(self, series_slug):
+        """روابط مسلسل (المسلسل وحلقاته) مرتبة بالموسم ثم الحلقة"""
+        sql = ("SELECT l.url FROM content_items c JOIN links l ON l.id = c.link_id "
+               "WHERE c.series_slug = ? ORDER BY c.season, c.episode, l.id")
+        return [url for url, in self.conn.execute(sql, (series_slug,))]
+
+    def links_with_param(self, name, value=None):
+        """الروابط التي تحمل معامل استعلام معين (وقيمة معينة اختيارياً)"""
+        sql = "SELECT l.url FROM query_params q JOIN links l ON l.id = q.link_id WHERE q.name = ?"
+        params = [name]
+        if value is not None:
+            sql += " AND q.value = ?"
+            params.append(value)
+        return [url for url, in self.conn.execute(sql + " ORDER BY l.id", params)]
+
+    def load_index(self):
+        """فهرس روابط كامل من المخزن لتمريره للمنظمات (index=...)"""
+        return LinkIndex(parse_link(url) for url, in self.conn.execute("SELECT url FROM links ORDER BY id"))
+
+    def write_report(self, output_file=ORGANIZED_FILE, compression=None):
+        """توليد الملف المنظم من الاستعلامات المفهرسة بدلاً من إعادة فحص الملف"""
+        write_organized_links(self.organized_links(), self.count(), output_file, compression)
+
+def main():
+    parser = argparse.ArgumentParser(description='مخزن روابط AKWAM الدائم')
+    parser.add_argument('--db', default=DEFAULT_DB, help='ملف قاعدة البيانات')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='إدخال الروابط الجديدة من ملف')
+    ingest_parser.add_argument('file', nargs='?', default='site_links.txt')
+
+    report_parser = commands.add_parser('report', help='توليد الملف المنظم من المخزن')
+    report_parser.add_argument('--output', default=ORGANIZED_FILE)
+    report_parser.add_argument('--compress', choices=[name for name in COMPRESSION_SUFFIXES if name],
+                               help='ضغط ملف التقرير')
+
+    commands.add_parser('stats', help='إحصائيات المخزن')
+    args = parser.parse_args()
+
+    with LinkStore(args.db) as store:
+        start = time.time()
+        if args.command == 'ingest':
+            scanned, added = store.ingest(args.file)
+            print(f"📥 تم فحص {scanned:,} سطر وإضافة {added:,} رابط جديد في {time.time() - start:.2f} ثانية")
+            print(f"📦 إجمالي الروابط في المخزن: {store.count():,}")
+        elif args.command == 'report':
+            store.write_report(args.output, args.compress)
+            print(f"⏱️ تم توليد التقرير في {time.time() - start:.2f} ثانية")
+        else:
+            print(f"📦 إجمالي الروابط: {store.count():,}")
+            for category, count in sorted(store.category_counts().items(), key=lambda item: -item[1]):
+                print(f"  {category}: {count:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قارئ روابط متدفق - يربط ملف الروابط بالذاكرة (mmap) ويعيد الروابط واحداً تلو الآخر
+دون تحميل الملف كاملاً كنص، ليعمل بذاكرة ثابتة على ملفات الزحف الضخمة
+"""
+
+import hashlib
+import mmap
+import re
+from contextlib import contextmanager
+
+from url_classifier import BASE_URL
+
+PREFIX = BASE_URL.encode()
+
+# رابط الموقع حتى نهاية السطر (".*" في البايتات تتوقف عند \n فقط، و \r يُعالج لاحقاً)
+LINE_RE = re.compile(re.escape(PREFIX) + rb'.*')
+LINE_BREAKS = b'\r\n'
+
+# حجم الجزء الذي يُنسخ من الملف في كل مرة (ينتهي دائماً بنهاية سطر)
+CHUNK_SIZE = 1 << 16
+
+# روابط داخل نص حر: المسافات البيضاء ASCII تفصل الروابط في البايتات والنص معاً
+RAW_URL_RE = re.compile(re.escape(BASE_URL.encode()) + rb'[^ \t\n\r\f\v]*')
+URL_RE = re.compile(r'https://ak\.sv/[^\s\n\r\t]*')
+
+@contextmanager
+def mapped_file(filename):
+    """ربط الملف بالذاكرة للقراءة فقط (None للملف الفارغ)"""
+    with open(filename, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # لا يمكن ربط ملف فارغ
+            yield None
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+def iter_chunks(buffer, start=0):
+    """تقسيم المخزن إلى أجزاء (بداية، نهاية) تنتهي كل منها بنهاية سطر"""
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b'\n', min(start + CHUNK_SIZE, size))
+        end = size if end < 0 else end + 1
+        yield start, end
+        start = end
+
+def scan_chunk(chunk, base=0):
+    """المسار الدقيق: (بداية، نهاية، رابط) لكل سطر يبدأ برابط الموقع بعد strip"""
+    for match in LINE_RE.finditer(chunk):
+        line_start, line_end = match.span()
+        if line_start > 0 and chunk[line_start - 1] not in LINE_BREAKS:
+            # يسبق الرابط نص في نفس السطر: يُقبل فقط إذا كان مسافات بيضاء
+            line_start = max(chunk.rfind(b'\n', 0, line_start), chunk.rfind(b'\r', 0, line_start)) + 1
+            if chunk[line_start:match.start()].decode('utf-8').strip():
+                line_start = None
+
+        raw = match.group()
+        if b'\r' not in raw:
+            if line_start is not None:
+                yield base + line_start, base + line_end, raw.decode('utf-8').strip()
+            continue
+
+        # \r فاصل أسطر في وضع النص: كل جزء بعده سطر مستقل
+        offset = match.start()
+        for i, part in enumerate(raw.split(b'\r')):
+            if i > 0:
+                line_start = offset
+            line = part.decode('utf-8').strip()
+            if line_start is not None and line.startswith(BASE_URL):
+                yield base + line_start, base + offset + len(part), line
+            offset += len(part) + 1
+
+def iter_links(filename='site_links.txt', start=0, with_offsets=False):
+    """
+    إعادة روابط الملف سطراً بسطر بنفس قواعد التحميل السابقة
+    (السطر بعد strip يجب أن يبدأ برابط الموقع)
+
+    start: إزاحة بالبايت لبدء القراءة منها (يجب أن تكون بداية سطر)
+    with_offsets: إعادة (بداية السطر، نهاية السطر، الرابط) بدلاً من الرابط فقط
+    """
+    with mapped_file(filename) as buffer:
+        if buffer is None:
+            return
+        for chunk_start, chunk_end in iter_chunks(buffer, start):
+            chunk = buffer[chunk_start:chunk_end]
+            # المسار السريع: كل ظهور للرابط في بداية سطر ولا يوجد \r
+            if (not with_offsets and b'\r' not in chunk
+                    and chunk.count(PREFIX) == chunk.count(b'\n' + PREFIX) + chunk.startswith(PREFIX)):
+                for raw in LINE_RE.findall(chunk):
+                    yield raw.decode('utf-8').strip()
+                continue
+
+            for line_start, line_end, line in scan_chunk(chunk, chunk_start):
+                yield (line_start, line_end, line) if with_offsets else line
+
+def complete_length(filename):
+    """طول الجزء المكتمل من الملف بالبايت (حتى آخر فاصل أسطر)"""
+    with mapped_file(filename) as buffer:
+        if buffer is None:
+            return 0
+        if buffer[-1] in LINE_BREAKS:
+            return len(buffer)
+        return max(buffer.rfind(b'\n'), buffer.rfind(b'\r')) + 1
+
+def prefix_digest(filename, length):
+    """بصمة أول length بايت من الملف للتحقق من أن الإضافات جاءت في نهايته فقط"""
+    digest = hashlib.blake2b(digest_size=16)
+    if length:
+        with mapped_file(filename) as buffer:
+            if buffer is None or len(buffer) < length:
+                return None
+            for offset in range(0, length, CHUNK_SIZE):
+                digest.update(buffer[offset:min(offset + CHUNK_SIZE, length)])
+    return digest.hexdigest()
+
+def find_links(filename):
+    """
+    استخراج كل روابط الموقع من نص حر بنفس نتائج
+    re.findall(r'https://ak\\.sv/[^\\s\\n\\r\\t]*', content) دون قراءة الملف كاملاً
+    """
+    with mapped_file(filename) as buffer:
+        if buffer is None:
+            return
+        for match in RAW_URL_RE.finditer(buffer):
+            # قد يحتوي المقطع على مسافات Unicode تقطع الرابط في النص
+            yield from URL_RE.findall(match.group().decode('utf-8'))
+
+if __name__ == "__main__":
+    import sys
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'site_links.txt'
+    count = sum(1 for _ in iter_links(filename))
+    print(f"📥 {count:,} رابط في {filename}")
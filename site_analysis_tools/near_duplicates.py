@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+كشف المحتوى شبه المكرر - نفس الفيلم أو المسلسل تحت أكثر من رابط (مترجم ومدبلج، عنوان محفوظ
+بترميزين مختلفين، اختلافات كتابة بسيطة) بتقطيع العناوين إلى أجزاء حروف ثم بصمات MinHash
+وتقسيمها إلى نطاقات LSH، فلا تُقارن إلا العناوين التي تشترك في نطاق واحد على الأقل بدلاً من كل الأزواج
+"""
+
+import argparse
+import random
+import zlib
+from array import array
+from collections import defaultdict
+from typing import List, NamedTuple, Tuple
+
+from link_decode import decode_repaired
+from link_index import load_link_index, parse_season
+from report_writer import ReportWriter
+from title_search import display_title, normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # البصمات تُحسب بحلقة Python عادية
+    np = None
+
+NEAR_DUPLICATES_FILE = 'روابط_AKWAM_شبه_مكررة.txt'
+
+# أنواع المحتوى التي تُقارن عناوينها (الحلقات تتشابه عناوينها داخل المسلسل الواحد)
+CONTENT_KINDS = ('movie', 'series', 'shows', 'mix')
+
+# طول أجزاء الحروف في التقطيع
+SHINGLE_SIZE = 4
+
+# عدد دوال التجزئة في البصمة = النطاقات * صفوف كل نطاق
+# (16 نطاقاً من 4 صفوف: زوج بتشابه 0.85 يلتقي في نطاق واحد على الأقل باحتمال 0.99996)
+NUM_PERM = 64
+BANDS = 16
+
+# أدنى تشابه Jaccard بين أجزاء العنوانين ليُعدا نسختين من نفس المحتوى
+DEFAULT_THRESHOLD = 0.85
+
+# كلمات تميز نسخ نفس المحتوى (بعد توحيد الكتابة) وتُحذف قبل المقارنة
+VARIANT_WORDS = frozenset({
+    'مترجم', 'مترجمه', 'مدبلج', 'مدبلجه', 'المدبلجه', 'مصري', 'للعاميه', 'المصريه',
+    'للعربيه', 'الفصحي', 'dubbed', 'subbed', 'subtitled',
+})
+
+# أرقام الأجزاء المكتوبة بالحروف اللاتينية (the karate kid part ii / iii)
+ROMAN_NUMERALS = frozenset({'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x'})
+
+HASH_SEED = 1
+MASK64 = (1 << 64) - 1
+
+class TitleEntry(NamedTuple):
+    url: str
+    title: str
+    kind: str
+    # العناوين لا تُقارن إلا إذا تطابق هذا المفتاح (النوع، رقم الموسم، الأرقام في العنوان)
+    # حتى لا تُعد الأجزاء والمواسم المختلفة نسخاً مكررة
+    group: Tuple
+
+class DuplicateCluster(NamedTuple):
+    representative: TitleEntry
+    # (العنصر، تشابهه مع العنصر الممثل) مرتبة تنازلياً بالتشابه
+    members: List[Tuple[TitleEntry, float]]
+
+def comparable_text(title):
+    """العنوان الموحد بدون كلمات النسخ (مترجم، مدبلج...)"""
+    return ' '.join(word for word in normalize_text(title).split() if word not in VARIANT_WORDS)
+
+def part_numbers(text):
+    """الكلمات التي تميز جزءاً عن آخر: الأرقام والكلمات التي تحتوي رقماً (ج2) والأرقام اللاتينية"""
+    return tuple(word for word in text.split()
+                 if word in ROMAN_NUMERALS or any(char.isdigit() for char in word))
+
+def title_entries(index, kinds=CONTENT_KINDS):
+    """عناصر المقارنة من صفحات المحتوى في الفهرس المشترك (رابط واحد لكل عنصر)"""
+    entries = {}
+    for kind in kinds:
+        for record in index.kind(kind):
+            if not record.slug or record.url in entries:
+                continue
+            title = display_title(record)
+            text = comparable_text(title)
+            if not text:
+                continue
+            season = parse_season(decode_repaired(record.slug))
+            if season is not None:
+                # الموسم جزء من مفتاح المجموعة، ويُقارن اسم المسلسل وحده
+                text = text.partition('الموسم')[0].strip() or text
+            entries[record.url] = (TitleEntry(record.url, title, kind, (kind, season, part_numbers(text))), text)
+    return list(entries.values())
+
+def shingles(text, size=SHINGLE_SIZE):
+    """أجزاء الحروف المتداخلة للعنوان (مع مسافة في طرفيه) كأرقام 32 بت ثابتة بين التشغيلات"""
+    text = f' {text} '
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+def jaccard(first, second):
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+def hash_parameters(num_perm=NUM_PERM, seed=HASH_SEED):
+    """معاملات دوال التجزئة (a فردي): h(x) = ((a*x + b) mod 2^64) >> 32"""
+    rng = random.Random(seed)
+    return [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=HASH_SEED):
+    """بصمة MinHash لكل مجموعة أجزاء: num_perm قيمة 32 بت مرمزة كبايتات (للتقسيم إلى نطاقات)"""
+    parameters = hash_parameters(num_perm, seed)
+    if np is None or not shingle_sets:
+        signatures = []
+        for values in shingle_sets:
+            signature = array('I', (min(((a * x + b) & MASK64) >> 32 for x in values)
+                                    for a, b in parameters))
+            signatures.append(signature.tobytes())
+        return signatures
+
+    # كل الأجزاء في مصفوفة واحدة، وأصغر قيمة لكل عنوان بـ minimum.reduceat عند حدود العناوين
+    sizes = np.fromiter((len(values) for values in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    values = np.fromiter((x for values in shingle_sets for x in values), dtype=np.uint64, count=int(sizes.sum()))
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    with np.errstate(over='ignore'):
+        for column, (a, b) in enumerate(parameters):
+            hashed = (values * np.uint64(a) + np.uint64(b)) >> np.uint64(32)
+            signatures[:, column] = np.minimum.reduceat(hashed, starts)
+    return [row.tobytes() for row in signatures]
+
+def candidate_pairs(signatures, groups, bands=BANDS):
+    """
+    أزواج العناوين التي تتطابق بصمتاهما في نطاق واحد على الأقل (ومن نفس المجموعة)
+    كل نطاق يُقسم العناوين إلى دلاء بقاموس، فالتكلفة خطية في عدد العناوين
+    """
+    band_size = len(signatures[0]) // bands if signatures else 0
+    pairs = set()
+    for band in range(bands):
+        start, end = band * band_size, (band + 1) * band_size
+        buckets = defaultdict(list)
+        for position, signature in enumerate(signatures):
+            buckets[groups[position], signature[start:end]].append(position)
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    pairs.add((first, second))
+    return pairs
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # العنصر الأسبق في الملف يبقى جذراً
+            if second < first:
+                first, second = second, first
+            self.parent[second] = first
+
+def find_near_duplicates(entries, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    مجموعات النسخ شبه المكررة من [(TitleEntry، النص المقارن)]
+    الأزواج المرشحة من LSH يُتحقق منها بتشابه Jaccard الفعلي قبل ضمها
+    """
+    if num_perm % bands:
+        raise ValueError(f"عدد دوال التجزئة ({num_perm}) يجب أن يقبل القسمة على عدد النطاقات ({bands})")
+    shingle_sets = [shingles(text) for _, text in entries]
+    groups = [entry.group for entry, _ in entries]
+    signatures = minhash_signatures(shingle_sets, num_perm)
+
+    clusters = _DisjointSet(len(entries))
+    for first, second in candidate_pairs(signatures, groups, bands):
+        if jaccard(shingle_sets[first], shingle_sets[second]) >= threshold:
+            clusters.union(first, second)
+
+    members = defaultdict(list)
+    for position in range(len(entries)):
+        members[clusters.find(position)].append(position)
+
+    result = []
+    for root, positions in sorted(members.items()):
+        if len(positions) < 2:
+            continue
+        scored = [(entries[position][0], round(jaccard(shingle_sets[root], shingle_sets[position]), 3))
+                  for position in positions if position != root]
+        scored.sort(key=lambda member: -member[1])
+        result.append(DuplicateCluster(entries[root][0], scored))
+    return result
+
+def redundant_urls(clusters):
+    """روابط النسخ التي يمكن تخطيها (كل عناصر المجموعة عدا الممثل)"""
+    return {entry.url for cluster in clusters for entry, _ in cluster.members}
+
+def create_near_duplicates_report(clusters, output_file=NEAR_DUPLICATES_FILE, compression=None):
+    """تقرير المجموعات: الممثل ثم النسخ مع تشابه كل منها"""
+    redundant = sum(len(cluster.members) for cluster in clusters)
+    with ReportWriter(output_file, compression) as report:
+        report.append("🔁 المحتوى شبه المكرر")
+        report.append("=" * 80)
+        report.append(f"📊 {len(clusters):,} مجموعة، {redundant:,} رابط مكرر يمكن تخطيه")
+        report.append("")
+        for number, cluster in enumerate(clusters, 1):
+            representative = cluster.representative
+            report.append(f"{number}. [{representative.kind}] {representative.title}")
+            report.append(f"   {representative.url}")
+            for entry, similarity in cluster.members:
+                report.append(f"   ≈ {similarity:.2f}  {entry.title}")
+                report.append(f"          {entry.url}")
+            report.append("")
+    return report.path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='كشف المحتوى شبه المكرر بـ MinHash/LSH')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='أدنى تشابه Jaccard (من 0 إلى 1)')
+    parser.add_argument('--output', default=NEAR_DUPLICATES_FILE, help='ملف التقرير')
+    parser.add_argument('--compress', choices=['gzip', 'lzma'], help='ضغط التقرير')
+    args = parser.parse_args()
+
+    entries = title_entries(load_link_index(args.filename))
+    clusters = find_near_duplicates(entries, args.threshold)
+    path = create_near_duplicates_report(clusters, args.output, args.compress)
+    print(f"🔁 {len(clusters):,} مجموعة شبه مكررة من {len(entries):,} عنوان، "
+          f"{len(redundant_urls(clusters)):,} رابط يمكن تخطيه")
+    print(f"✅ تم حفظ التقرير: {path}")
@@ -3,15 +3,17 @@
 
 import re
 from collections import defaultdict
-from urllib.parse import unquote
 
-def analyze_and_organize_links():
-    # قراءة الملف
-    with open('site_links.txt', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # استخراج جميع الروابط
-    links = re.findall(r'https://ak\.sv[^\s]*', content)
+from link_decode import decode_component
+from link_index import load_link_index
+from near_duplicates import find_near_duplicates, title_entries
+from url_canonical import FingerprintSet
+
+def analyze_and_organize_links(filename='site_links.txt', index=None):
+    # الروابط من الفهرس المشترك
+    if index is None:
+        index = load_link_index(filename)
+    links = index.links
     
     # تصنيف الروابط
     organized_data = {
@@ -27,22 +29,24 @@ def analyze_and_organize_links():
     }
     
     # إحصائيات شاملة
+    # الروابط المتكافئة (ترميز العناوين، الشرطة الأخيرة، #، ترتيب المعاملات) تُعد رابطاً واحداً
+    unique_count = len(FingerprintSet(links))
     stats = {
         'إجمالي_الروابط': len(links),
-        'الروابط_الفريدة': len(set(links)),
-        'التكرارات': len(links) - len(set(links))
+        'الروابط_الفريدة': unique_count,
+        'التكرارات': len(links) - unique_count
     }
     
     # تحليل وتصنيف كل رابط
     for link in links:
-        link_decoded = unquote(link)
+        link_decoded = decode_component(link)
         
         if '/movie/' in link:
             # استخراج معلومات الفيلم
             match = re.search(r'/movie/(\d+)/([^?]*)', link)
             if match:
                 movie_id, movie_name = match.groups()
-                movie_name_decoded = unquote(movie_name)
+                movie_name_decoded = decode_component(movie_name)
                 organized_data['الأفلام'].append({
                     'الرابط': link,
                     'المعرف': movie_id,
@@ -54,7 +58,7 @@ def analyze_and_organize_links():
             match = re.search(r'/series/(\d+)/([^?]*)', link)
             if match:
                 series_id, series_name = match.groups()
-                series_name_decoded = unquote(series_name)
+                series_name_decoded = decode_component(series_name)
                 organized_data['المسلسلات'].append({
                     'الرابط': link,
                     'المعرف': series_id,
@@ -66,7 +70,7 @@ def analyze_and_organize_links():
             match = re.search(r'/shows/(\d+)/([^?]*)', link)
             if match:
                 show_id, show_name = match.groups()
-                show_name_decoded = unquote(show_name)
+                show_name_decoded = decode_component(show_name)
                 organized_data['العروض_التلفزيونية'].append({
                     'الرابط': link,
                     'المعرف': show_id,
@@ -78,7 +82,7 @@ def analyze_and_organize_links():
             match = re.search(r'/mix/(\d+)/([^?]*)', link)
             if match:
                 mix_id, mix_name = match.groups()
-                mix_name_decoded = unquote(mix_name)
+                mix_name_decoded = decode_component(mix_name)
                 organized_data['المنوعات'].append({
                     'الرابط': link,
                     'المعرف': mix_id,
@@ -90,8 +94,8 @@ def analyze_and_organize_links():
             match = re.search(r'/episode/(\d+)/([^/]+)/([^?]*)', link)
             if match:
                 episode_id, series_name, episode_name = match.groups()
-                series_name_decoded = unquote(series_name)
-                episode_name_decoded = unquote(episode_name)
+                series_name_decoded = decode_component(series_name)
+                episode_name_decoded = decode_component(episode_name)
                 organized_data['الحلقات'][series_name_decoded].append({
                     'الرابط': link,
                     'معرف_الحلقة': episode_id,
@@ -112,7 +116,7 @@ def analyze_and_organize_links():
     
     return organized_data, stats
 
-def write_organized_file(organized_data, stats):
+def write_organized_file(organized_data, stats, near_duplicates=None):
     with open('الروابط_المنظمة_شامل.md', 'w', encoding='utf-8') as f:
         f.write('# تحليل شامل ومنظم لروابط موقع ak.sv\n\n')
         f.write(f'**تاريخ التحليل:** {__import__("datetime").datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
@@ -226,12 +230,25 @@ def write_organized_file(organized_data, stats):
                 f.write(f'\n... و {len(set(organized_data["أخرى"])) - 20} رابط آخر\n')
             f.write(f'\n**المجموع:** {len(set(organized_data["أخرى"]))} رابط\n\n')
         
+        # المحتوى شبه المكرر (نفس العنوان تحت أكثر من رابط)
+        if near_duplicates:
+            f.write('### 🔁 المحتوى شبه المكرر\n\n')
+            for cluster in near_duplicates[:30]:
+                f.write(f'- **{cluster.representative.title}** - {cluster.representative.url}\n')
+                for entry, similarity in cluster.members:
+                    f.write(f'  - ({similarity:.2f}) {entry.title} - {entry.url}\n')
+            if len(near_duplicates) > 30:
+                f.write(f'\n... و {len(near_duplicates) - 30} مجموعة أخرى\n')
+            redundant = sum(len(cluster.members) for cluster in near_duplicates)
+            f.write(f'\n**المجموع:** {len(near_duplicates)} مجموعة، {redundant} رابط مكرر\n\n')
+        
         f.write('---\n\n')
         f.write('*تم إنشاء هذا التقرير تلقائياً من تحليل ملف site_links.txt*\n')
 
 if __name__ == '__main__':
     print("جاري تحليل وتنظيم الروابط...")
     organized_data, stats = analyze_and_organize_links()
-    write_organized_file(organized_data, stats)
+    near_duplicates = find_near_duplicates(title_entries(load_link_index('site_links.txt')))
+    write_organized_file(organized_data, stats, near_duplicates)
     print("تم إنشاء الملف المنظم: الروابط_المنظمة_شامل.md")
     print(f"تم تحليل {stats['إجمالي_الروابط']:,} رابط")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+كاتب التقارير المتدفق - كل سطر يُكتب إلى ملف مخزن مؤقتاً فور إنتاجه بدلاً من تجميع التقرير
+كاملاً في قائمة ثم '\n'.join (الذي يضاعف الذاكرة للتقارير الكبيرة)، مع ضغط gzip/lzma اختياري
+وترويسة (فهرس، مجاميع) يمكن كتابتها بعد المحتوى دون إبقاء المحتوى في الذاكرة
+"""
+
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+COMPRESSION_SUFFIXES = {
+    None: '',
+    'gzip': '.gz',
+    'lzma': '.xz',
+}
+
+# حجم المخزن المؤقت للكتابة
+BUFFER_SIZE = 1 << 16
+
+# عدد الأسطر التي تُجمع قبل كتابتها دفعة واحدة (الكتابة سطراً سطراً أبطأ بكثير)
+FLUSH_LINES = 2048
+
+def report_path(path, compression=None):
+    """اسم ملف التقرير مع لاحقة الضغط (.gz أو .xz)"""
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"ضغط غير مدعوم: {compression} (المتاح: gzip، lzma)")
+    return path + COMPRESSION_SUFFIXES[compression]
+
+def wrap_report(raw, compression=None):
+    """
+    مجرى نصي UTF-8 مخزن مؤقتاً فوق ملف ثنائي مفتوح للكتابة، مضغوط أو عادي
+    (إغلاق المجرى المضغوط لا يغلق الملف الثنائي)
+    """
+    if compression == 'gzip':
+        # بلا اسم ملف و mtime=0 حتى يتطابق الملف المضغوط لنفس المحتوى في كل تشغيل،
+        # والمستوى 6 (افتراضي أداة gzip) أسرع بكثير من 9 بحجم مقارب
+        raw = gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=0)
+    elif compression == 'lzma':
+        raw = lzma.LZMAFile(raw, 'wb')
+    return io.TextIOWrapper(io.BufferedWriter(raw, BUFFER_SIZE), encoding='utf-8')
+
+class ReportWriter:
+    """
+    كتابة تقرير سطراً بسطر بنفس ناتج '\n'.join(الأسطر)
+    الكتابة تتم في ملف "<الاسم>.partial" بجوار الملف النهائي ويُستبدل به عند الإغلاق بنجاح،
+    فلا يبقى تقرير ناقص إذا فشل التوليد
+
+    deferred_header=True: المحتوى يُكتب في ملف مؤقت، والأسطر المضافة بـ header()
+    توضع قبله عند الإغلاق (للفهرس والمجاميع التي تُعرف بعد كتابة الأقسام)
+    """
+
+    def __init__(self, path, compression=None, deferred_header=False):
+        self.path = report_path(path, compression)
+        self.compression = compression
+        self.lines = 0  # تُحسب الأسطر المجمعة عند كتابتها
+        self._header = [] if deferred_header else None
+        self._pending = []
+        self._separator = ''
+
+        self._partial_path = self.path + '.partial'
+        self._raw = open(self._partial_path, 'wb', buffering=0)
+        if deferred_header:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            self._body = tempfile.TemporaryFile('w+', encoding='utf-8', dir=directory)
+        else:
+            self._body = wrap_report(self._raw, compression)
+
+    def append(self, line=''):
+        """إضافة سطر (نفس واجهة القائمة التي كانت تُجمع فيها الأسطر)"""
+        self._pending.append(line)
+        if len(self._pending) >= FLUSH_LINES:
+            self.flush()
+
+    def extend(self, lines):
+        lines = iter(lines)
+        while True:
+            self._pending.extend(islice(lines, FLUSH_LINES - len(self._pending)))
+            if len(self._pending) < FLUSH_LINES:
+                break
+            self.flush()
+
+    def flush(self):
+        """كتابة الأسطر المجمعة في الملف"""
+        if self._pending:
+            self._body.write(self._separator + '\n'.join(self._pending))
+            self._separator = '\n'
+            self.lines += len(self._pending)
+            self._pending.clear()
+
+    def header(self, line=''):
+        """إضافة سطر إلى الترويسة التي توضع قبل المحتوى عند الإغلاق"""
+        if self._header is None:
+            raise ValueError("الترويسة المؤجلة تتطلب ReportWriter(..., deferred_header=True)")
+        self._header.append(line)
+        self.lines += 1
+
+    def close(self):
+        """إنهاء الكتابة واستبدال الملف النهائي بالتقرير المكتمل"""
+        if self._body is None:
+            return
+        self.flush()
+        if self._header is not None:
+            self._body.seek(0)
+            with wrap_report(self._raw, self.compression) as output:
+                output.write('\n'.join(self._header))
+                if self._header and self._separator:
+                    output.write('\n')
+                shutil.copyfileobj(self._body, output, BUFFER_SIZE)
+        self._body.close()
+        self._raw.close()
+        self._body = None
+        os.replace(self._partial_path, self.path)
+
+    def discard(self):
+        """إلغاء التقرير دون المساس بأي ملف سابق بنفس الاسم"""
+        if self._body is None:
+            return
+        self._body.close()
+        self._raw.close()
+        self._body = None
+        os.remove(self._partial_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
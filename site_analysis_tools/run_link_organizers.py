@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تشغيل جميع منظمات ومحللات الروابط على فهرس واحد مشترك
+"""
+
+import argparse
+import time
+
+from link_decode import print_cache_stats
+from link_index import load_link_index
+from report_writer import COMPRESSION_SUFFIXES
+from links_organizer import organize_links
+from smart_organizer import SmartLinksOrganizer
+from hierarchical_organizer import HierarchicalLinksOrganizer
+from site_structure_analyzer import SiteStructureAnalyzer
+from deep_links_analyzer import DeepLinksAnalyzer
+from advanced_patterns_analyzer import AdvancedPatternsAnalyzer
+from organized_links_analysis import analyze_and_organize_links, write_organized_file
+from near_duplicates import find_near_duplicates, title_entries
+
+def run_all_organizers(filename='site_links.txt', workers=1, compression=None):
+    """
+    تحليل ملف الروابط مرة واحدة ثم تمرير الفهرس لكل أداة
+    workers: عدد العمليات للمنظمات المجزأة (الذكي، الهرمي، بنية الموقع)
+    compression: ضغط تقارير المنظمات الثلاثة (gzip أو lzma)
+    """
+    start = time.time()
+    index = load_link_index(filename)
+    print(f"📥 تم بناء الفهرس المشترك: {len(index):,} رابط في {time.time() - start:.2f} ثانية")
+
+    organize_links(filename, index=index, compression=compression)
+    SmartLinksOrganizer(filename, index=index, workers=workers, compression=compression).run_smart_organization()
+    HierarchicalLinksOrganizer(filename, index=index, workers=workers,
+                               compression=compression).run_hierarchical_organization()
+    SiteStructureAnalyzer(filename, index=index, workers=workers).run_structure_analysis()
+    DeepLinksAnalyzer(filename, index=index).run_complete_analysis()
+    AdvancedPatternsAnalyzer(filename, index=index).run_analysis()
+
+    organized_data, stats = analyze_and_organize_links(filename, index=index)
+    write_organized_file(organized_data, stats, find_near_duplicates(title_entries(index)))
+
+    print(f"✅ اكتملت جميع الأدوات في {time.time() - start:.2f} ثانية")
+    print_cache_stats()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='تشغيل جميع منظمات ومحللات الروابط')
+    parser.add_argument('file', nargs='?', default='site_links.txt', help='ملف الروابط')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='عدد العمليات للتنفيذ المجزأ (0 = عدد المعالجات)')
+    parser.add_argument('--compress', choices=[name for name in COMPRESSION_SUFFIXES if name],
+                        help='ضغط تقارير المنظمات')
+    args = parser.parse_args()
+    run_all_organizers(args.file, args.workers, args.compress)
@@ -23,11 +23,16 @@ from urllib.parse import urljoin, urlparse, unquote
 from fake_useragent import UserAgent
 import mimetypes
 import xml.etree.ElementTree as ET
-import requests
 from PIL import Image
 import time
 import logging
 
+from asset_downloader import AssetDownloader
+from asset_store import AssetStore
+from link_health import LinkHealthChecker
+from link_stream import find_links
+from url_canonical import FingerprintSet, unique_links
+
 # =====================================================
 # إعداد نظام تسجيل الأخطاء والتكوين الأساسي
 # =====================================================
@@ -65,10 +70,20 @@ class ScreenshotConfig:
         
         # إعدادات الأداء
         self.delay_between_requests = 1
+        self.asset_workers = 8  # تحميلات الأصول المتزامنة في الخلفية
+        self.link_assets = False  # روابط صلبة للأصول داخل مجلد كل صفحة بدلاً من الإشارة إلى المخزن
+        self.link_check_workers = 16  # طلبات فحص الروابط المتزامنة
+        # أقصى عدد روابط داخلية تُفحص لكل صفحة: None (الافتراضي) يفحص كل الروابط لأن الرابط المتكرر في
+        # عدة صفحات يُفحص مرة واحدة، و 10 يعيد السلوك السابق (أول 10 روابط فقط)
+        self.max_links_checked = None
 
 config = ScreenshotConfig()
 ua = UserAgent()
-visited = set()
+# مخزن الأصول ومحمّلها وفاحص الروابط تُنشأ في بداية كل تشغيل (start_services)
+asset_store = None
+asset_downloader = None
+link_checker = None
+visited = FingerprintSet()  # الروابط المتكافئة تُزار مرة واحدة
 sitemap_urls = []
 failed_urls = []
 processed_links = []
@@ -109,23 +124,41 @@ def create_directory_structure():
 # إنشاء المجلدات عند تحميل الوحدة
 create_directory_structure()
 
+def start_services():
+    """إنشاء مخزن الأصول ومحمّلها وفاحص الروابط من الإعدادات الحالية (في بداية التشغيل)"""
+    global asset_store, asset_downloader, link_checker
+    # كل أصل يُحمل ويُحفظ مرة واحدة لكل الصفحات (وبين التشغيلات)
+    asset_store = AssetStore(os.path.join(config.output_root, "assets_store"), hardlinks=config.link_assets)
+    asset_downloader = AssetDownloader(workers=config.asset_workers, user_agent=ua.random, store=asset_store)
+    # نتيجة كل رابط تُحفظ فلا تُعاد فحص روابط القوائم والتذييل في كل صفحة
+    link_checker = LinkHealthChecker(workers=config.link_check_workers, user_agent=ua.random,
+                                     cache_file=os.path.join(config.output_root, "link_health.json"))
+
+def stop_services():
+    """انتظار الأصول التي ما زالت تُحمل في الخلفية وحفظ المخزن ونتائج الفحص ثم إيقاف الخيوط"""
+    try:
+        asset_downloader.wait()
+        screenshot_stats['total_assets_downloaded'] = asset_downloader.downloaded
+        asset_store.save()
+        link_checker.save()
+        logger.info(link_checker.summary())
+        store_stats = asset_store.stats()
+        logger.info(f"📦 مخزن الأصول: {store_stats['objects']} ملف لـ {store_stats['urls']} رابط "
+                    f"({store_stats['bytes'] / 1024 / 1024:.1f} MB)")
+    finally:
+        asset_downloader.close()
+        link_checker.close()
+
 def load_links_from_file(file_path):
     """تحميل الروابط من ملف النص"""
     links = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            
-        # استخراج الروابط باستخدام regex
-        url_pattern = r'https://ak\.sv/[^\s\n\r\t]*'
-        found_links = re.findall(url_pattern, content)
+        # استخراج الروابط بقراءة متدفقة من الملف
+        # مع إزالة الأحرف الخاصة من نهاية الرابط
+        cleaned_links = (link.rstrip('.,;:!?)') for link in find_links(file_path))
         
-        # تنظيف وتصفية الروابط
-        for link in found_links:
-            # إزالة الأحرف الخاصة من نهاية الرابط
-            clean_link = link.rstrip('.,;:!?)')
-            if clean_link and clean_link not in links:
-                links.append(clean_link)
+        # توحيد الصيغة وإزالة المكرر بالبصمات مع الحفاظ على الترتيب
+        links = unique_links(link for link in cleaned_links if link)
         
         screenshot_stats['links_from_file'] = len(links)
         logger.info(f"✅ تم تحميل {len(links)} رابط من الملف: {file_path}")
@@ -217,48 +250,41 @@ def get_asset_folder_by_mime(mime):
         return "docs"
     return "others"
 
-def save_binary(url, page_folder):
-    """تحميل وحفظ الملفات الثنائية (الصور، CSS، JS، إلخ)"""
+def asset_path(url, page_folder):
+    """مسار حفظ الأصل داخل مجلد الصفحة حسب نوع الملف"""
+    parsed = urlparse(url)
+    filename = os.path.basename(parsed.path)
+    
+    if not filename or '.' not in filename:
+        filename = f"file_{hash(url) % 10000}"
+
+    # تحديد نوع الملف ومجلد الحفظ
+    mime, _ = mimetypes.guess_type(filename)
+    folder_name = get_asset_folder_by_mime(mime)
+    return os.path.join(page_folder, "assets", folder_name, filename)
+
+def asset_manifest(batch):
+    """قائمة أصول الصفحة: مسار كل أصل في المخزن المشترك وبصمة محتواه"""
+    manifest = []
+    for item, saved_path in batch.saved():
+        asset = asset_store.get(item['original_url'])
+        manifest.append(dict(item, saved_path=saved_path, sha256=asset.sha256 if asset else None))
+    return manifest
+
+def save_assets_info(extracted_assets, page_folder):
+    """حفظ قائمة الأصول"""
+    assets_info_file = os.path.join(page_folder, "assets_info.json")
     try:
-        parsed = urlparse(url)
-        filename = os.path.basename(parsed.path)
-        
-        if not filename or '.' not in filename:
-            filename = f"file_{hash(url) % 10000}"
-
-        # تحديد نوع الملف ومجلد الحفظ
-        mime, _ = mimetypes.guess_type(filename)
-        folder_name = get_asset_folder_by_mime(mime)
-        folder = os.path.join(page_folder, "assets", folder_name)
-        os.makedirs(folder, exist_ok=True)
-
-        filepath = os.path.join(folder, filename)
-        
-        # تجنب إعادة التحميل إذا كان الملف موجود
-        if os.path.exists(filepath):
-            return filepath
-
-        # تحميل الملف
-        headers = {"User-Agent": ua.random}
-        response = requests.get(url, headers=headers, timeout=15, stream=True)
-        
-        if response.status_code == 200:
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            screenshot_stats['total_assets_downloaded'] += 1
-            return filepath
-        else:
-            logger.warning(f"فشل تحميل الأصل {url}: كود الحالة {response.status_code}")
-            
+        with open(assets_info_file, "w", encoding="utf-8") as f:
+            json.dump(extracted_assets, f, ensure_ascii=False, indent=2)
     except Exception as e:
-        logger.error(f"خطأ في تحميل الأصل {url}: {e}")
-        
-    return None
+        logger.error(f"خطأ في حفظ معلومات الأصول: {e}")
 
 def extract_assets(soup, page_folder, page_url):
-    """استخراج وتحميل جميع الأصول من الصفحة"""
+    """
+    استخراج جميع الأصول من الصفحة وإرسالها دفعة واحدة للتحميل في الخلفية
+    (assets_info.json يُكتب عند اكتمال تحميل أصول الصفحة، والنتيجة AssetBatch)
+    """
     asset_tags = {
         "img": "src",
         "link": "href", 
@@ -270,7 +296,7 @@ def extract_assets(soup, page_folder, page_url):
         "object": "data"
     }
     
-    extracted_assets = []
+    jobs = []
     
     for tag, attr in asset_tags.items():
         for element in soup.find_all(tag):
@@ -280,30 +306,29 @@ def extract_assets(soup, page_folder, page_url):
                 try:
                     # تحويل الرابط النسبي إلى مطلق
                     full_url = urljoin(page_url, src)
+                    saved_path = asset_path(full_url, page_folder)
                     
-                    # تحميل الأصل
-                    saved_path = save_binary(full_url, page_folder)
-                    
-                    if saved_path:
-                        extracted_assets.append({
-                            'tag': tag,
-                            'original_url': full_url,
-                            'saved_path': saved_path,
-                            'attribute': attr
-                        })
+                    jobs.append((full_url, saved_path, {
+                        'tag': tag,
+                        'original_url': full_url,
+                        'saved_path': saved_path,
+                        'attribute': attr
+                    }))
                         
                 except Exception as e:
                     logger.error(f"خطأ في معالجة الأصل {src}: {e}")
     
-    # حفظ قائمة الأصول
-    assets_info_file = os.path.join(page_folder, "assets_info.json")
-    try:
-        with open(assets_info_file, "w", encoding="utf-8") as f:
-            json.dump(extracted_assets, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.error(f"خطأ في حفظ معلومات الأصول: {e}")
-    
-    return extracted_assets
+    # تحميل الأصول في الخلفية بينما يستمر الزحف
+    batch = asset_downloader.submit_batch(jobs)
+    batch.add_done_callback(lambda batch: save_assets_info(asset_manifest(batch), page_folder))
+    return batch
+
+def save_page_summary(page_summary, page_folder, extracted_assets=None):
+    """حفظ ملخص الصفحة (بعد اكتمال تحميل أصولها إن وجدت)"""
+    if extracted_assets is not None:
+        page_summary['assets_extracted'] = len(extracted_assets.result())
+    with open(os.path.join(page_folder, "page_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(page_summary, f, ensure_ascii=False, indent=2)
 
 def get_meta_info(soup):
     """استخراج جميع معلومات Meta من الصفحة"""
@@ -403,33 +428,8 @@ def detect_cms(headers, soup):
         return ["Error in Detection"]
 
 def check_links(links):
-    """فحص الروابط المعطلة"""
-    broken_links = []
-    headers = {"User-Agent": ua.random}
-    
-    for link in links[:20]:  # فحص أول 20 رابط فقط لتوفير الوقت
-        try:
-            response = requests.head(link, headers=headers, allow_redirects=True, timeout=10)
-            if response.status_code >= 400:
-                broken_links.append({
-                    'url': link,
-                    'status_code': response.status_code,
-                    'error': f"HTTP {response.status_code}"
-                })
-        except requests.exceptions.RequestException as e:
-            broken_links.append({
-                'url': link,
-                'status_code': 0,
-                'error': str(e)
-            })
-        except Exception as e:
-            broken_links.append({
-                'url': link,
-                'status_code': 0,
-                'error': f"Unknown error: {str(e)}"
-            })
-    
-    return broken_links
+    """فحص الروابط المعطلة (بالتوازي، وكل رابط مرة واحدة في التشغيل)"""
+    return [status.as_dict() for status in link_checker.broken(links)]
 
 async def crawl(page, url, depth=0):
     """الوظيفة الرئيسية للزحف وتحليل الصفحات"""
@@ -533,7 +533,7 @@ async def crawl(page, url, depth=0):
         
         # فحص الروابط المعطلة
         if internal_links:
-            broken_links = check_links(internal_links[:10])  # فحص أول 10 روابط
+            broken_links = check_links(internal_links[:config.max_links_checked])
             if broken_links:
                 with open(os.path.join(page_folder, "broken_links.json"), "w", encoding="utf-8") as f:
                     json.dump(broken_links, f, ensure_ascii=False, indent=2)
@@ -546,17 +546,18 @@ async def crawl(page, url, depth=0):
             'status_code': response.status,
             'content_length': len(content),
             'screenshots_taken': 2,
-            'assets_extracted': len(extracted_assets),
+            'assets_extracted': 0,  # يُحدث عند اكتمال تحميل الأصول
             'internal_links_found': len(internal_links),
             'cms_detected': cms_detected,
             'meta_tags_count': len(meta_info)
         }
         
-        with open(os.path.join(page_folder, "page_summary.json"), "w", encoding="utf-8") as f:
-            json.dump(page_summary, f, ensure_ascii=False, indent=2)
-        
         processed_links.append(page_summary)
         
+        # تحميل الأصول ما زال مستمراً: الملخص يُحفظ عند اكتماله
+        extracted_assets.add_done_callback(
+            lambda batch: save_page_summary(page_summary, page_folder, batch))
+        
         logger.info(f"✅ تمت معالجة: {url} | العمق: {depth} | CMS: {cms_detected}")
         
         # الزحف للروابط الفرعية (محدود العدد)
@@ -704,49 +705,53 @@ async def main():
         
         logger.info(f"📋 تم تحميل {len(links_to_process)} رابط من الملف")
         
-        # إطلاق المتصفح
-        async with async_playwright() as playwright:
-            browser = await playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox', 
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-extensions'
-                ]
-            )
-            
-            # إنشاء صفحة جديدة
-            page = await browser.new_page()
-            
-            # تعيين user agent
-            await page.set_extra_http_headers({
-                'User-Agent': ua.random
-            })
-            
-            # تعيين حجم العرض
-            await page.set_viewport_size({
-                'width': config.viewport_width, 
-                'height': config.viewport_height
-            })
-            
-            # معالجة الروابط من الملف أولاً
-            processed_count = 0
-            for link in links_to_process:
-                if processed_count >= config.max_pages:
-                    logger.info(f"⚠️ تم الوصول للحد الأقصى من الصفحات: {config.max_pages}")
-                    break
+        start_services()
+        try:
+            # إطلاق المتصفح
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(
+                    headless=True,
+                    args=[
+                        '--no-sandbox', 
+                        '--disable-dev-shm-usage',
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-extensions'
+                    ]
+                )
                 
-                await crawl(page, link, 0)
-                processed_count += 1
+                # إنشاء صفحة جديدة
+                page = await browser.new_page()
                 
-                # تأخير قصير بين الطلبات
-                if processed_count % 10 == 0:
-                    logger.info(f"📊 تمت معالجة {processed_count} صفحة من أصل {len(links_to_process)}")
-                    await asyncio.sleep(2)  # استراحة قصيرة كل 10 صفحات
-            
-            # إغلاق المتصفح
-            await browser.close()
+                # تعيين user agent
+                await page.set_extra_http_headers({
+                    'User-Agent': ua.random
+                })
+                
+                # تعيين حجم العرض
+                await page.set_viewport_size({
+                    'width': config.viewport_width, 
+                    'height': config.viewport_height
+                })
+                
+                # معالجة الروابط من الملف أولاً
+                processed_count = 0
+                for link in links_to_process:
+                    if processed_count >= config.max_pages:
+                        logger.info(f"⚠️ تم الوصول للحد الأقصى من الصفحات: {config.max_pages}")
+                        break
+                    
+                    await crawl(page, link, 0)
+                    processed_count += 1
+                    
+                    # تأخير قصير بين الطلبات
+                    if processed_count % 10 == 0:
+                        logger.info(f"📊 تمت معالجة {processed_count} صفحة من أصل {len(links_to_process)}")
+                        await asyncio.sleep(2)  # استراحة قصيرة كل 10 صفحات
+                
+                # إغلاق المتصفح
+                await browser.close()
+        finally:
+            stop_services()
         
         # إنشاء خريطة الموقع
         sitemap_path = os.path.join(config.output_root, "sitemap.xml")
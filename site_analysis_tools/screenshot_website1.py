@@ -8,8 +8,12 @@ import os
 from urllib.parse import urljoin, urlparse
 from fake_useragent import UserAgent
 import mimetypes
+import json
 import xml.etree.ElementTree as ET
-import requests
+
+from asset_downloader import AssetDownloader
+from asset_store import AssetStore
+from link_health import LinkHealthChecker
 
 # إعدادات
 base_url = "https://ak.sv/"  # عدل هنا
@@ -17,11 +21,30 @@ output_root = "site_backup"
 max_depth = 5
 
 ua = UserAgent()
+# تُنشأ في بداية كل تشغيل (start_services) وتُغلق في نهايته (stop_services)
+asset_store = None
+asset_downloader = None
+link_checker = None
 visited = set()
 sitemap_urls = []
 
 os.makedirs(output_root, exist_ok=True)
 
+def start_services():
+    global asset_store, asset_downloader, link_checker
+    asset_store = AssetStore(os.path.join(output_root, "assets_store"))
+    asset_downloader = AssetDownloader(user_agent=ua.random, store=asset_store)
+    link_checker = LinkHealthChecker(timeout=5, user_agent=ua.random)
+
+def stop_services():
+    # انتظار الأصول التي ما زالت تُحمل في الخلفية ثم حفظ المخزن وإيقاف الخيوط
+    try:
+        asset_downloader.wait()
+        asset_store.save()
+    finally:
+        asset_downloader.close()
+        link_checker.close()
+
 def sanitize_path(url):
     parsed = urlparse(url)
     path = parsed.path.strip("/").replace("/", "_") or "home"
@@ -52,7 +75,7 @@ def get_asset_folder_by_mime(mime):
         return "docs"
     return "others"
 
-def save_binary(url, page_folder):
+def asset_path(url, page_folder):
     parsed = urlparse(url)
     filename = os.path.basename(parsed.path)
     if not filename or '.' not in filename:
@@ -60,22 +83,16 @@ def save_binary(url, page_folder):
 
     mime, _ = mimetypes.guess_type(filename)
     folder_name = get_asset_folder_by_mime(mime)
-    folder = os.path.join(page_folder, folder_name)
-    os.makedirs(folder, exist_ok=True)
+    return os.path.join(page_folder, folder_name, filename)
 
-    filepath = os.path.join(folder, filename)
-    if os.path.exists(filepath):
-        return filepath
-    try:
-        headers = {"User-Agent": ua.random}
-        r = requests.get(url, headers=headers, timeout=15)
-        if r.status_code == 200:
-            with open(filepath, "wb") as f:
-                f.write(r.content)
-            return filepath
-    except Exception as e:
-        print(f"Failed to download asset {url} - {e}")
-    return None
+def save_assets_info(batch, page_folder):
+    # مسار كل أصل في المخزن المشترك وبصمة محتواه
+    manifest = []
+    for url, saved_path in batch.saved():
+        asset = asset_store.get(url)
+        manifest.append({"url": url, "saved_path": saved_path, "sha256": asset.sha256 if asset else None})
+    with open(os.path.join(page_folder, "assets_info.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
 
 def extract_assets(soup, page_folder, page_url):
     asset_tags = {
@@ -86,12 +103,17 @@ def extract_assets(soup, page_folder, page_url):
         "video": "src",
         "audio": "src",
     }
+    jobs = []
     for tag, attr in asset_tags.items():
         for el in soup.find_all(tag):
             src = el.get(attr)
             if src and not src.startswith("data:"):
                 full_url = urljoin(page_url, src)
-                save_binary(full_url, page_folder)
+                jobs.append((full_url, asset_path(full_url, page_folder), full_url))
+    # التحميل في الخلفية أثناء الانتقال للصفحة التالية، وassets_info.json يُكتب عند اكتماله
+    batch = asset_downloader.submit_batch(jobs)
+    batch.add_done_callback(lambda batch: save_assets_info(batch, page_folder))
+    return batch
 
 def get_meta_info(soup):
     metas = {}
@@ -118,16 +140,7 @@ def detect_cms(headers, soup):
     return cms
 
 def check_links(links):
-    broken = []
-    headers = {"User-Agent": ua.random}
-    for link in links:
-        try:
-            r = requests.head(link, headers=headers, allow_redirects=True, timeout=5)
-            if r.status_code >= 400:
-                broken.append((link, r.status_code))
-        except:
-            broken.append((link, "Failed"))
-    return broken
+    return [(status.url, status.status_code or "Failed") for status in link_checker.broken(links)]
 
 async def crawl(page, url, depth=0):
     if depth > max_depth or url in visited:
@@ -196,11 +209,15 @@ def save_sitemap(urls, filename="sitemap.xml"):
     tree.write(filename, encoding="utf-8", xml_declaration=True)
 
 async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await crawl(page, base_url, 0)
-        await browser.close()
+    start_services()
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await crawl(page, base_url, 0)
+            await browser.close()
+    finally:
+        stop_services()
     save_sitemap(sitemap_urls, os.path.join(output_root, "sitemap.xml"))
     print(f"🌐 Sitemap saved to {output_root}/sitemap.xml")
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس علاقات المسلسلات - ربط كل مسلسل (باسم موحد) بمواسمه وصفحات مواسمه وحلقاته
+من جزء اسم المسلسل في مسار روابط الحلقات، مع حفظه في نقطة حفظ تُحدّث تزايدياً
+فتُجاب أسئلة مثل "كل حلقات المسلسل" أو "المسلسلات ذات أكثر من N مواسم" دون إعادة فحص الملف
+"""
+
+import argparse
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from analysis_checkpoint import AnalysisCheckpoint
+from link_index import parse_link
+
+INDEX_FILE = 'series_index.json'
+
+# موسم غير مرقم (صفحة مسلسل أو حلقة لا يذكر رابطها الموسم)
+UNNUMBERED_SEASON = 0
+
+class EpisodeRef(NamedTuple):
+    season: int
+    episode: Optional[int]  # رقم الحلقة من الرابط (None إن لم يُذكر)
+    item_id: int
+    url: str
+
+def series_key(name):
+    """الاسم الموحد: أحرف صغيرة والشرطات والمسافات المتكررة مسافة واحدة"""
+    return ' '.join(name.replace('-', ' ').replace('_', ' ').split()).lower()
+
+class SeriesIndex:
+    """مسلسل -> مواسم -> (صفحات الموسم، الحلقات)، مع فهارس عكسية من المعرف إلى المسلسل"""
+
+    def __init__(self):
+        # المفتاح الموحد -> {'name': أول اسم ظهر، 'seasons': {الموسم: {'pages': [...], 'episodes': [...]}}}
+        self.series = {}
+        self.episode_series = {}   # معرف الحلقة -> المفتاح
+        self.page_series = {}      # معرف صفحة المسلسل -> المفتاح
+        self._by_season_count = None
+
+    def __len__(self):
+        return len(self.series)
+
+    def __contains__(self, name):
+        return series_key(name) in self.series
+
+    # ==================== البناء ====================
+
+    def _season(self, name, season):
+        key = series_key(name)
+        entry = self.series.get(key)
+        if entry is None:
+            entry = self.series[key] = {'name': name, 'seasons': {}}
+        season = season or UNNUMBERED_SEASON
+        if season not in entry['seasons']:
+            entry['seasons'][season] = {'pages': [], 'episodes': []}
+            self._by_season_count = None
+        return key, entry['seasons'][season]
+
+    def add_record(self, record):
+        """إضافة سجل من الفهرس المشترك (صفحات المسلسلات والحلقات فقط، والمكرر بنفس المعرف يُتجاهل)"""
+        if record.kind == 'episode':
+            if record.item_id in self.episode_series:
+                return False
+        elif record.kind != 'series' or record.item_id in self.page_series:
+            return False
+        # اسم المسلسل والموسم ورقم الحلقة محللة مسبقاً في السجل (بعد إصلاح الترميز)
+        if not series_key(record.series_slug or ''):
+            return False
+
+        key, season = self._season(record.series_slug, record.season)
+        if record.kind == 'episode':
+            season['episodes'].append((record.episode, record.item_id, record.url))
+            self.episode_series[record.item_id] = key
+        else:
+            season['pages'].append((record.item_id, record.url))
+            self.page_series[record.item_id] = key
+        return True
+
+    def add_links(self, links):
+        added = 0
+        for link in links:
+            # تحليل روابط المسلسلات والحلقات فقط
+            if '/series/' in link or '/episode/' in link:
+                added += self.add_record(parse_link(link))
+        return added
+
+    @classmethod
+    def from_index(cls, index):
+        series_index = cls()
+        for kind in ('series', 'episode'):
+            for record in index.kind(kind):
+                series_index.add_record(record)
+        return series_index
+
+    # ==================== الاستعلامات ====================
+
+    def find(self, name):
+        """المفتاح الموحد للمسلسل إن وُجد في الفهرس"""
+        key = series_key(name)
+        return key if key in self.series else None
+
+    def seasons(self, name):
+        """أرقام المواسم المعروفة للمسلسل تصاعدياً"""
+        entry = self.series.get(series_key(name))
+        return sorted(entry['seasons']) if entry else []
+
+    def season_count(self, name):
+        """عدد المواسم المرقمة (موسم واحد للمسلسلات التي لا تذكر روابطها الموسم)"""
+        entry = self.series.get(series_key(name))
+        if not entry:
+            return 0
+        numbered = sum(1 for season in entry['seasons'] if season != UNNUMBERED_SEASON)
+        return numbered or 1
+
+    def episodes(self, name, season=None):
+        """حلقات المسلسل (أو موسم منه) مرتبة بالموسم ثم رقم الحلقة ثم المعرف"""
+        entry = self.series.get(series_key(name))
+        if not entry:
+            return []
+        if season is None:
+            seasons = entry['seasons'].items()
+        else:
+            seasons = [(season, entry['seasons'][season])] if season in entry['seasons'] else []
+        episodes = [EpisodeRef(number, episode, item_id, url)
+                    for number, data in seasons
+                    for episode, item_id, url in data['episodes']]
+        episodes.sort(key=lambda ref: (ref.season, ref.episode is None, ref.episode or 0, ref.item_id))
+        return episodes
+
+    def season_pages(self, name, season=None):
+        """صفحات المسلسل: [(الموسم، المعرف، الرابط)] مرتبة بالموسم"""
+        entry = self.series.get(series_key(name))
+        if not entry:
+            return []
+        return [(number, item_id, url)
+                for number, data in sorted(entry['seasons'].items())
+                if season is None or number == season
+                for item_id, url in data['pages']]
+
+    def series_of_episode(self, episode_id):
+        """اسم المسلسل الذي تنتمي إليه الحلقة"""
+        key = self.episode_series.get(episode_id)
+        return self.series[key]['name'] if key else None
+
+    def series_with_more_seasons(self, count):
+        """المسلسلات ذات أكثر من count مواسم: [(الاسم، عدد المواسم)] تنازلياً"""
+        if self._by_season_count is None:
+            self._by_season_count = defaultdict(list)
+            for key, entry in self.series.items():
+                self._by_season_count[self.season_count(entry['name'])].append(key)
+        return [(self.series[key]['name'], seasons)
+                for seasons in sorted(self._by_season_count, reverse=True) if seasons > count
+                for key in sorted(self._by_season_count[seasons])]
+
+    # ==================== الحفظ ====================
+
+    def to_state(self):
+        """الحالة كقاموس JSON (مفاتيح المواسم نصية)"""
+        return {
+            key: {
+                'name': entry['name'],
+                'seasons': {str(season): data for season, data in entry['seasons'].items()},
+            }
+            for key, entry in self.series.items()
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        series_index = cls()
+        for key, entry in state.items():
+            seasons = {int(season): {'pages': [tuple(page) for page in data['pages']],
+                                     'episodes': [tuple(episode) for episode in data['episodes']]}
+                       for season, data in entry['seasons'].items()}
+            series_index.series[key] = {'name': entry['name'], 'seasons': seasons}
+            for data in seasons.values():
+                for item_id, _ in data['pages']:
+                    series_index.page_series[item_id] = key
+                for _, item_id, _ in data['episodes']:
+                    series_index.episode_series[item_id] = key
+        return series_index
+
+def load_series_index(filename='site_links.txt', index_file=INDEX_FILE, rebuild=False):
+    """
+    تحميل الفهرس المحفوظ وإضافة الروابط الجديدة فقط منذ آخر حفظ
+    (rebuild=True أو تغيّر الملف في غير نهايته يعيد البناء من البداية)
+    """
+    checkpoint = AnalysisCheckpoint(index_file, filename)
+    state = None if rebuild else checkpoint.load()
+    series_index = SeriesIndex() if state is None else SeriesIndex.from_state(state)
+
+    new_links, tail_links = checkpoint.read_new_links()
+    series_index.add_links(new_links)
+    checkpoint.save(series_index.to_state())
+    # السطر الأخير غير المكتمل يدخل في النتيجة الحالية فقط
+    series_index.add_links(tail_links)
+    return series_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='فهرس علاقات المسلسلات والمواسم والحلقات')
+    parser.add_argument('filename', nargs='?', default='site_links.txt')
+    parser.add_argument('--index-file', default=INDEX_FILE, help='ملف الفهرس المحفوظ')
+    parser.add_argument('--rebuild', action='store_true', help='إعادة بناء الفهرس من البداية')
+    parser.add_argument('--series', help='عرض مواسم وحلقات مسلسل')
+    parser.add_argument('--season', type=int, help='موسم واحد من المسلسل')
+    parser.add_argument('--min-seasons', type=int, metavar='N', help='المسلسلات ذات أكثر من N مواسم')
+    parser.add_argument('--episode', type=int, metavar='ID', help='المسلسل الذي تنتمي إليه حلقة')
+    args = parser.parse_args()
+
+    series_index = load_series_index(args.filename, args.index_file, args.rebuild)
+    print(f"📺 {len(series_index):,} مسلسل، {len(series_index.episode_series):,} حلقة، "
+          f"{len(series_index.page_series):,} صفحة موسم")
+
+    if args.series:
+        if args.series not in series_index:
+            raise SystemExit(f"❌ مسلسل غير موجود في الفهرس: {args.series}")
+        print(f"🗂️ المواسم: {series_index.seasons(args.series)}")
+        for season, item_id, url in series_index.season_pages(args.series, args.season):
+            print(f"  📂 الموسم {season} [{item_id}] {url}")
+        for ref in series_index.episodes(args.series, args.season):
+            print(f"  📹 الموسم {ref.season} الحلقة {ref.episode} [{ref.item_id}] {ref.url}")
+    if args.min_seasons is not None:
+        for name, seasons in series_index.series_with_more_seasons(args.min_seasons):
+            print(f"  📺 {name}: {seasons} مواسم")
+    if args.episode is not None:
+        print(f"📹 الحلقة {args.episode}: {series_index.series_of_episode(args.episode) or 'غير موجودة'}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+التنفيذ المجزأ على عدة عمليات - تقسيم قائمة الروابط إلى أجزاء متتالية تعالجها مجموعة عمليات،
+ثم دمج التجميعات الجزئية بترتيب الأجزاء فتطابق النتيجة المعالجة في عملية واحدة تماماً
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# أقل عدد روابط في الجزء الواحد (الأجزاء الأصغر لا تستحق كلفة نقلها بين العمليات)
+MIN_SHARD_SIZE = 2000
+
+def split_shards(items, count):
+    """تقسيم القائمة إلى count جزءاً متتالياً بأحجام متقاربة"""
+    size, extra = divmod(len(items), count)
+    shards = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(items[start:end])
+        start = end
+    return shards
+
+def merge_aggregates(target, partial):
+    """
+    دمج تجميع جزئي في التجميع الكلي:
+    القوائم تُلحق، الأعداد تُجمع، المجموعات تُوحد، والقواميس تُدمج بالمفتاح
+    (المفاتيح الجديدة تُضاف في النهاية فيبقى ترتيب أول ظهور كما في المعالجة المتتالية)
+    """
+    for key, value in partial.items():
+        if key not in target:
+            target[key] = value
+        elif isinstance(value, dict):
+            merge_aggregates(target[key], value)
+        elif isinstance(value, list):
+            target[key].extend(value)
+        elif isinstance(value, set):
+            target[key] |= value
+        else:
+            target[key] += value
+    return target
+
+def resolve_workers(workers):
+    """عدد العمليات الفعلي (None أو 0 = عدد المعالجات)"""
+    return workers or os.cpu_count() or 1
+
+def run_sharded(collect, items, workers=1):
+    """
+    تطبيق collect (دالة على مستوى الوحدة أو staticmethod تعيد قاموس تجميعات) على items
+    workers=1 يعالج القائمة كاملة في العملية الحالية
+    """
+    workers = min(resolve_workers(workers), max(1, len(items) // MIN_SHARD_SIZE))
+    if workers <= 1:
+        return collect(items)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map يعيد النتائج بترتيب الأجزاء مهما كان ترتيب انتهائها
+        partials = pool.map(collect, split_shards(items, workers))
+        result = next(partials)
+        for partial in partials:
+            merge_aggregates(result, partial)
+    return result
@@ -17,14 +17,23 @@ from fake_useragent import UserAgent
 import xml.etree.ElementTree as ET
 import re
 
+from fetch_engine import DEFAULT_PER_HOST, DEFAULT_WORKERS, FetchEngine
+from http_cache import DEFAULT_CACHE_DIR, install_cache
+from url_canonical import canonicalize
+
 class SimpleWebsiteAnalyzer:
     """أداة تحليل بسيطة للمواقع"""
     
-    def __init__(self, base_url="https://ak.sv/", output_dir="simple_site_analysis"):
+    def __init__(self, base_url="https://ak.sv/", output_dir="simple_site_analysis",
+                 workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST, cache_dir=DEFAULT_CACHE_DIR):
         self.base_url = base_url
         self.output_dir = output_dir
         self.ua = UserAgent()
         self.session = self._setup_session()
+        # الصفحات تُجلب بالتوازي عبر نفس الجلسة (اتصالات دائمة من مجمع واحد)
+        self.engine = FetchEngine(self.session, workers=workers, per_host=per_host, timeout=15)
+        # الذاكرة تُركب بعد مجمع الاتصالات وبنفس حجمه (الصفحات غير المتغيرة تعود 304 من القرص)
+        self.http_cache = install_cache(self.session, cache_dir, pool_maxsize=workers) if cache_dir else None
         self.visited_urls = set()
         self.analyzed_pages = []
         self.failed_urls = []
@@ -102,56 +111,72 @@ class SimpleWebsiteAnalyzer:
     
     def analyze_page(self, url, max_retries=3):
         """تحليل صفحة واحدة"""
+        return self.analyze_pages([url], max_retries)[0]
+    
+    def analyze_pages(self, urls, max_retries=3):
+        """
+        تحليل مجموعة صفحات بالتوازي: بيانات كل صفحة (أو None للصفحة الفاشلة أو المزارة سابقاً)
+        بنفس ترتيب الروابط، وتُضاف الصفحات الناجحة إلى analyzed_pages بهذا الترتيب
+        """
+        pending = [url for url in urls if self._visit(url)]
+        results = self.engine.map(pending, self._process_response, retries=max_retries,
+                                  on_attempt=self._print_attempt, on_error=self._print_request_error)
+        
+        pages = {}
+        for result in results:
+            page_data = self._record_result(result)
+            if page_data is not None:
+                pages[result.url] = page_data
+        return [pages.get(url) for url in urls]
+    
+    def _visit(self, url):
+        """تسجيل الرابط كمزار (False إذا كان مزاراً من قبل)"""
         if url in self.visited_urls:
-            return None
-            
+            return False
         self.visited_urls.add(url)
         self.stats['total_pages'] += 1
+        return True
+    
+    def _record_result(self, result):
+        """إضافة نتيجة جلب صفحة إلى الإحصائيات والصفحات المحللة (بيانات الصفحة أو None عند الفشل)"""
+        url, page_data, error = result
+        if page_data is not None:
+            self.analyzed_pages.append(page_data)
+            self.stats['successful_pages'] += 1
+            self.stats['images_found'] += len(page_data['images'])
+            self.stats['links_found'] += len(page_data['links'])
+            print(f"✅ تم تحليل: {url}")
+        else:
+            if not isinstance(error, requests.exceptions.RequestException):
+                print(f"❌ خطأ عام في تحليل {url}: {error}")
+            self.failed_urls.append({'url': url, 'error': str(error)})
+            self.stats['failed_pages'] += 1
+        return page_data
+    
+    def _print_attempt(self, url, attempt):
+        print(f"🔍 تحليل: {url} (المحاولة {attempt + 1})")
+    
+    def _print_request_error(self, url, attempt, error):
+        print(f"❌ خطأ في الطلب للصفحة {url}: {error}")
+    
+    def _process_response(self, url, response):
+        """تحليل الاستجابة وحفظ ملفات الصفحة (يعمل في خيط الجلب)"""
+        soup = BeautifulSoup(response.content, 'html.parser')
+        page_id = self.get_page_id(url)
         
-        for attempt in range(max_retries):
-            try:
-                print(f"🔍 تحليل: {url} (المحاولة {attempt + 1})")
-                
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                
-                # تحليل المحتوى
-                soup = BeautifulSoup(response.content, 'html.parser')
-                page_id = self.get_page_id(url)
-                
-                # استخراج البيانات
-                page_data = self._extract_page_data(soup, url, response)
-                
-                # حفظ HTML
-                self._save_html(response.text, page_id, url)
-                
-                # حفظ بيانات الصفحة
-                self._save_page_data(page_data, page_id)
-                
-                # حفظ معلومات الأصول
-                self._save_assets_info(page_data['assets'], page_id)
-                
-                self.analyzed_pages.append(page_data)
-                self.stats['successful_pages'] += 1
-                
-                print(f"✅ تم تحليل: {url}")
-                return page_data
-                
-            except requests.exceptions.RequestException as e:
-                print(f"❌ خطأ في الطلب للصفحة {url}: {e}")
-                if attempt == max_retries - 1:
-                    self.failed_urls.append({'url': url, 'error': str(e)})
-                    self.stats['failed_pages'] += 1
-                else:
-                    time.sleep(2)  # انتظار قبل المحاولة التالية
-                    
-            except Exception as e:
-                print(f"❌ خطأ عام في تحليل {url}: {e}")
-                self.failed_urls.append({'url': url, 'error': str(e)})
-                self.stats['failed_pages'] += 1
-                break
+        # استخراج البيانات
+        page_data = self._extract_page_data(soup, url, response)
         
-        return None
+        # حفظ HTML
+        self._save_html(response.text, page_id, url)
+        
+        # حفظ بيانات الصفحة
+        self._save_page_data(page_data, page_id)
+        
+        # حفظ معلومات الأصول
+        self._save_assets_info(page_data['assets'], page_id)
+        
+        return page_data
     
     def _extract_page_data(self, soup, url, response):
         """استخراج بيانات الصفحة"""
@@ -201,10 +226,6 @@ class SimpleWebsiteAnalyzer:
         scripts = len(soup.find_all('script'))
         stylesheets = len(soup.find_all('link', rel='stylesheet'))
         
-        # تحديث الإحصائيات
-        self.stats['images_found'] += len(images)
-        self.stats['links_found'] += len(links)
-        
         return {
             'url': url,
             'title': title,
@@ -262,38 +283,43 @@ class SimpleWebsiteAnalyzer:
         except Exception as e:
             print(f"خطأ في حفظ معلومات الأصول {page_id}: {e}")
     
-    def discover_pages(self, start_url, max_pages=20, max_depth=2):
-        """اكتشاف صفحات الموقع"""
-        discovered_urls = set([start_url])
-        current_depth = 0
+    def discover_pages(self, start_url, max_pages=20, max_depth=2, max_retries=3):
+        """
+        اكتشاف صفحات الموقع بطابور مشترك: كل صفحة تُحلل تضيف روابطها الجديدة من نفس النطاق إلى الطابور
+        فوراً فتبدأ العمال بجلبها دون انتظار باقي صفحات مستواها، مع تسجيل عمق كل رابط
+        (تُجلب الروابط حتى العمق max_depth - 1، وروابط العمق الأخير تُكتشف فقط، وعددها كلها حتى max_pages)
+        """
+        # الروابط تُحفظ بصيغتها القانونية حتى لا تُزار الروابط المتكافئة أكثر من مرة
+        start_url = canonicalize(start_url)
+        depths = {start_url: 0}  # الرابط المكتشف -> عمقه
         
-        while current_depth < max_depth and len(discovered_urls) < max_pages:
-            current_level_urls = list(discovered_urls - self.visited_urls)
-            if not current_level_urls:
-                break
-                
-            print(f"🌐 مستوى العمق {current_depth + 1}: معالجة {len(current_level_urls)} صفحة")
-            
-            new_urls = set()
-            for url in current_level_urls[:max_pages]:
-                page_data = self.analyze_page(url)
-                if page_data:
-                    # استخراج روابط جديدة من نفس النطاق
-                    for link in page_data['links']:
-                        link_url = link['href']
-                        if self._is_same_domain(link_url, start_url) and link_url not in discovered_urls:
-                            new_urls.add(link_url)
-                
-                if len(discovered_urls) >= max_pages:
+        def expand(result):
+            page_data = self._record_result(result)
+            if page_data is None:
+                return []
+            depth = depths[result.url] + 1
+            new_urls = []
+            for link in page_data['links']:
+                if len(depths) >= max_pages:
                     break
-            
-            discovered_urls.update(new_urls)
-            current_depth += 1
-            
-            # تحديد عدد الصفحات الجديدة المكتشفة
-            print(f"🔍 تم اكتشاف {len(new_urls)} رابط جديد")
+                link_url = canonicalize(link['href'])
+                if self._is_same_domain(link_url, start_url) and link_url not in depths:
+                    depths[link_url] = depth
+                    if depth < max_depth and self._visit(link_url):
+                        new_urls.append(link_url)
+            return new_urls
+        
+        print(f"🌐 زحف حتى العمق {max_depth} بطابور مشترك ({self.engine.workers} عامل)")
+        start_urls = [start_url] if max_depth > 0 and self._visit(start_url) else []
+        self.engine.crawl(start_urls, self._process_response, expand, retries=max_retries,
+                          on_attempt=self._print_attempt, on_error=self._print_request_error)
+        
+        for depth in range(1, max_depth + 1):
+            count = sum(1 for url_depth in depths.values() if url_depth == depth)
+            if count:
+                print(f"🔍 العمق {depth}: تم اكتشاف {count} رابط جديد")
         
-        return discovered_urls
+        return set(depths)
     
     def _is_same_domain(self, url1, url2):
         """فحص ما إذا كان الرابطان من نفس النطاق"""
@@ -399,6 +425,8 @@ class SimpleWebsiteAnalyzer:
             print(f"- تم اكتشاف: {len(discovered_urls)} رابط")
             print(f"- تم تحليل: {self.stats['successful_pages']} صفحة بنجاح")
             print(f"- فشل في: {self.stats['failed_pages']} صفحة")
+            if self.http_cache:
+                print(f"- {self.http_cache.summary()}")
             
             # إنشاء خريطة الموقع
             self.generate_sitemap()
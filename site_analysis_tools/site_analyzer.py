@@ -13,9 +13,14 @@ from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from bs4 import BeautifulSoup
 
+from http_cache import DEFAULT_CACHE_DIR, install_cache
+from language_detect import script_counts
+
 class AKSVAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
         self.session = requests.Session()
+        # الصفحات المحفوظة من التشغيلات السابقة يُعاد التحقق منها بدلاً من تحميلها كاملة
+        self.http_cache = install_cache(self.session, cache_dir) if cache_dir else None
         
         # إعداد User-Agent متقدم
         self.session.headers.update({
@@ -47,7 +52,8 @@ class AKSVAnalyzer:
             print(f"🔍 تحليل: {url}")
             response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
-            time.sleep(2)  # فترة انتظار مهذبة
+            if not getattr(response, 'from_cache', False):
+                time.sleep(2)  # فترة انتظار مهذبة
             return response
         except requests.exceptions.Timeout:
             print(f"⏰ انتهت مهلة الطلب: {url}")
@@ -200,8 +206,7 @@ class AKSVAnalyzer:
             return lang_match.group(1)
         
         # تحليل المحتوى للكشف عن العربية
-        arabic_chars = len(re.findall(r'[\u0600-\u06FF]', html))
-        english_chars = len(re.findall(r'[a-zA-Z]', html))
+        arabic_chars, english_chars, _ = script_counts(html)
         
         if arabic_chars > english_chars:
             return 'ar'
@@ -395,6 +400,8 @@ def main():
         # إنتاج التقرير النهائي
         analyzer.generate_comprehensive_report()
         
+        if analyzer.http_cache:
+            print(analyzer.http_cache.summary())
         print("\n✅ تم إكمال التحليل الشامل بنجاح!")
         print("📄 تحقق من الملف: تحليل_موقع_akwam_شامل.md")
         
@@ -4,40 +4,59 @@
 محلل بنية الموقع - ترتيب خاص لفهم هيكل وبنية موقع AKWAM
 """
 
-import re
-import urllib.parse
 from collections import defaultdict, OrderedDict
 import json
 
+from facet_index import FacetIndex
+from language_detect import has_arabic
+from link_decode import link_title
+from link_index import load_link_index
+from sharded import run_sharded
+from url_classifier import BASE_URL, classify_url
+
 class SiteStructureAnalyzer:
-    def __init__(self, filename='site_links.txt'):
+    def __init__(self, filename='site_links.txt', index=None, workers=1):
         self.filename = filename
+        self.index = index
+        self.workers = workers
         self.all_links = []
         self.structure_analysis = {}
         
     def load_links(self):
-        """تحميل الروابط"""
-        with open(self.filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('https://ak.sv/'):
-                self.all_links.append(line)
+        """تحميل الروابط من الفهرس المشترك"""
+        if self.index is None:
+            self.index = load_link_index(self.filename)
+        self.all_links.extend(self.index.links)
                 
-    def analyze_url_patterns(self):
+    @staticmethod
+    def collect_aggregates(links):
+        """تجميعات جزئية لمجموعة روابط متتالية (الأنماط وتنظيم المحتوى) تُدمج بترتيبها في sharded"""
+        analyzer = SiteStructureAnalyzer()
+        return {
+            'patterns': analyzer.analyze_url_patterns(links),
+            'organization': analyzer.analyze_content_organization(links),
+        }
+    
+    def analyze_url_patterns(self, links=None):
         """تحليل أنماط URLs لفهم بنية الموقع"""
+        if links is None:
+            links = self.all_links
         patterns = {
             'main_sections': defaultdict(list),
             'content_types': defaultdict(list),
-            'parameters': defaultdict(list),
+            'parameters': FacetIndex(),
             'depth_levels': defaultdict(list),
             'id_ranges': defaultdict(list),
             'language_patterns': defaultdict(list)
         }
+        id_range_keys = {
+            'movies': 'movie_ids',
+            'series': 'series_ids',
+            'episodes': 'episode_ids',
+            'persons': 'person_ids'
+        }
         
-        for link in self.all_links:
+        for link in links:
             # تحليل المسار الأساسي
             path = link.replace('https://ak.sv/', '')
             parts = path.split('/')
@@ -47,48 +66,18 @@ class SiteStructureAnalyzer:
             patterns['depth_levels'][f'depth_{depth}'].append(link)
             
             # أنواع المحتوى
-            if '/movie/' in link:
-                id_match = re.search(r'/movie/(\d+)/', link)
-                if id_match:
-                    movie_id = int(id_match.group(1))
-                    patterns['content_types']['movies'].append((movie_id, link))
-                    patterns['id_ranges']['movie_ids'].append(movie_id)
-                    
-            elif '/series/' in link:
-                id_match = re.search(r'/series/(\d+)/', link)
-                if id_match:
-                    series_id = int(id_match.group(1))
-                    patterns['content_types']['series'].append((series_id, link))
-                    patterns['id_ranges']['series_ids'].append(series_id)
+            match = classify_url(link)
+            if match.category in id_range_keys:
+                if match.rest is not None:
+                    patterns['content_types'][match.category].append((match.item_id, link))
+                    patterns['id_ranges'][id_range_keys[match.category]].append(match.item_id)
                     
-            elif '/episode/' in link:
-                id_match = re.search(r'/episode/(\d+)/', link)
-                if id_match:
-                    episode_id = int(id_match.group(1))
-                    patterns['content_types']['episodes'].append((episode_id, link))
-                    patterns['id_ranges']['episode_ids'].append(episode_id)
-                    
-            elif '/person/' in link:
-                id_match = re.search(r'/person/(\d+)/', link)
-                if id_match:
-                    person_id = int(id_match.group(1))
-                    patterns['content_types']['persons'].append((person_id, link))
-                    patterns['id_ranges']['person_ids'].append(person_id)
-                    
-            elif '/shows/' in link or '/show/' in link:
-                patterns['content_types']['shows'].append(link)
-                
-            elif '/mix/' in link:
-                patterns['content_types']['mix'].append(link)
+            elif match.category in ['shows', 'mix']:
+                patterns['content_types'][match.category].append(link)
                 
             # المعاملات والفلاتر
             if '?' in link:
-                query_part = link.split('?')[1]
-                params = query_part.split('&')
-                for param in params:
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        patterns['parameters'][key].append(value)
+                patterns['parameters'].add(link)
                         
             # الأقسام الرئيسية
             if parts and parts[0]:
@@ -96,15 +85,17 @@ class SiteStructureAnalyzer:
                 patterns['main_sections'][main_section].append(link)
                 
             # أنماط اللغة
-            if re.search(r'[\u0600-\u06FF]', link):
+            if has_arabic(link):
                 patterns['language_patterns']['arabic'].append(link)
             else:
                 patterns['language_patterns']['english'].append(link)
         
         return patterns
     
-    def analyze_content_organization(self):
+    def analyze_content_organization(self, links=None):
         """تحليل تنظيم المحتوى"""
+        if links is None:
+            links = self.all_links
         organization = {
             'navigation_structure': {},
             'content_hierarchy': {},
@@ -113,23 +104,22 @@ class SiteStructureAnalyzer:
         }
         
         # بنية التنقل
-        main_pages = [link for link in self.all_links if link.count('/') <= 4 and '?' not in link]
+        main_pages = [link for link in links if link.count('/') <= 4 and '?' not in link]
         organization['navigation_structure'] = {
             'main_pages': len(main_pages),
-            'categories': len([link for link in self.all_links if '?category=' in link]),
-            'pages': len([link for link in self.all_links if '?page=' in link]),
-            'tags': len([link for link in self.all_links if '?tag=' in link])
+            'categories': len([link for link in links if '?category=' in link]),
+            'pages': len([link for link in links if '?page=' in link]),
+            'tags': len([link for link in links if '?tag=' in link])
         }
         
         # اصطلاحات التسمية
         arabic_titles = []
         english_titles = []
         
-        for link in self.all_links:
-            title = link.split('/')[-1]
+        for link in links:
+            title = link_title(link)
             if title:
-                title = urllib.parse.unquote(title)
-                if re.search(r'[\u0600-\u06FF]', title):
+                if has_arabic(title):
                     arabic_titles.append(title)
                 else:
                     english_titles.append(title)
@@ -144,8 +134,10 @@ class SiteStructureAnalyzer:
     
     def create_structure_understanding_file(self):
         """إنشاء ملف لفهم بنية الموقع"""
-        patterns = self.analyze_url_patterns()
-        organization = self.analyze_content_organization()
+        # تحليل الأنماط والتنظيم (في عمليات متوازية عند workers > 1)
+        aggregates = run_sharded(SiteStructureAnalyzer.collect_aggregates, self.all_links, self.workers)
+        patterns = aggregates['patterns']
+        organization = aggregates['organization']
         
         output_content = []
         
@@ -202,14 +194,14 @@ class SiteStructureAnalyzer:
                         for i, item in enumerate(sorted_items[:2]):
                             if isinstance(item, tuple):
                                 id_val, link = item
-                                title = urllib.parse.unquote(link.split('/')[-1])
+                                title = link_title(link)
                                 output_content.append(f"    [{id_val:>5}] {title}")
                         
                         output_content.append("  الأحدث:")
                         for i, item in enumerate(sorted_items[-2:]):
                             if isinstance(item, tuple):
                                 id_val, link = item
-                                title = urllib.parse.unquote(link.split('/')[-1])
+                                title = link_title(link)
                                 output_content.append(f"    [{id_val:>5}] {title}")
                         output_content.append("")
         
@@ -221,12 +213,11 @@ class SiteStructureAnalyzer:
         if patterns['parameters']:
             output_content.append("### معاملات التصفح:")
             param_stats = {}
-            for param, values in patterns['parameters'].items():
-                unique_values = len(set(values))
+            for param, values in patterns['parameters'].values.items():
                 param_stats[param] = {
-                    'total': len(values),
-                    'unique': unique_values,
-                    'samples': list(set(values))[:5]
+                    'total': sum(values.values()),
+                    'unique': len(values),
+                    'samples': [value for value, _ in values.most_common(5)]
                 }
             
             # ترتيب حسب الأهمية
@@ -238,6 +229,18 @@ class SiteStructureAnalyzer:
                 output_content.append(f"    القيم المختلفة: {stats['unique']:,}")
                 output_content.append(f"    أمثلة: {', '.join(map(str, stats['samples']))}")
                 output_content.append("")
+
+            facets = patterns['parameters']
+            output_content.append("### تركيبات المعاملات:")
+            for keys, count in facets.combinations.most_common():
+                output_content.append(f"  🧩 {' + '.join(keys)}: {count:,} رابط")
+            paged = [(path, facet, pages) for path, facet, pages in facets.facets() if pages > 1]
+            if paged:
+                output_content.append(f"  📄 فلاتر بأكثر من صفحة ({len(paged):,}):")
+                for path, facet, pages in paged:
+                    filters = '&'.join(f"{key}={value}" for key, value in facet) or 'بدون فلتر'
+                    output_content.append(f"    {path.replace(BASE_URL, '/')} {filters}: {pages} صفحة")
+            output_content.append("")
         
         # 4. التوزيع حسب مستوى العمق
         output_content.append("## 4️⃣ التوزيع حسب عمق المسار")
@@ -270,7 +273,7 @@ class SiteStructureAnalyzer:
             output_content.append("### نماذج من المحتوى العربي:")
             arabic_samples = arabic_links[:10]
             for sample in arabic_samples:
-                title = urllib.parse.unquote(sample.split('/')[-1])
+                title = link_title(sample)
                 content_type = "فيلم" if "/movie/" in sample else "مسلسل" if "/series/" in sample else "حلقة" if "/episode/" in sample else "محتوى"
                 output_content.append(f"  • {content_type}: {title}")
             output_content.append("")
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+البحث في عناوين المحتوى - فهرس مقلوب للكلمات وفهرس ثلاثيات حروف فوق العناوين المفكوكة
+بعد توحيد الكتابة العربية (أشكال الألف، التاء المربوطة، التشكيل، التطويل)، مع ترتيب النتائج:
+كلمة مطابقة ثم بداية كلمة ثم جزء من كلمة
+الفهرس يُحفظ في ملف ثنائي واحد ويُحمّل بـ mmap دون تحليل محتواه (الجداول تُقرأ عند الحاجة)
+"""
+
+import argparse
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import NamedTuple
+
+from link_decode import decode_repaired
+from link_index import load_link_index
+
+INDEX_FILE = 'title_index.bin'
+
+INDEX_MAGIC = b'TSIDX\x00\x00\x01'
+TYPECODE = 'I'
+
+# طول الأجزاء في فهرس الحروف (البحث عن جزء من كلمة يتطلب هذا الطول على الأقل)
+NGRAM = 3
+
+# بدايات الكلمات القصيرة تُدمج قوائمها مرة واحدة وتُحفظ (الحرف الواحد يطابق آلاف الكلمات)
+PREFIX_CACHE_LENGTH = 2
+
+# درجة كل كلمة من الاستعلام حسب نوع المطابقة
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+
+# توحيد الكتابة: الحرف -> بديله (None للحذف)
+ARABIC_NORMALIZATION = {
+    '\u0622': '\u0627', '\u0623': '\u0627', '\u0625': '\u0627', '\u0671': '\u0627',  # آ أ إ ٱ -> ا
+    '\u0629': '\u0647',  # ة -> ه
+    '\u0649': '\u064A',  # ى -> ي
+    '\u0640': None,      # التطويل
+    '\u060C': ' ', '\u061B': ' ', '\u061F': ' ',  # ، ؛ ؟
+}
+# التشكيل (الفتحتان حتى السكون والعلامات الملحقة بها) والألف الخنجرية
+ARABIC_NORMALIZATION.update(dict.fromkeys(map(chr, range(0x064B, 0x0660)), None))
+ARABIC_NORMALIZATION['\u0670'] = None
+# الرموز اللاتينية فواصل بين الكلمات (الشرطة في العناوين المأخوذة من الروابط مسافة)
+ARABIC_NORMALIZATION.update(dict.fromkeys(
+    (chr(code) for code in range(0x21, 0x7F) if not chr(code).isalnum()), ' '))
+
+NORMALIZATION_TABLE = str.maketrans(ARABIC_NORMALIZATION)
+
+def normalize_text(text):
+    """النص الموحد: أحرف صغيرة وكلمات مفصولة بمسافة واحدة"""
+    return ' '.join(text.translate(NORMALIZATION_TABLE).lower().split())
+
+def display_title(record):
+    """عنوان المحتوى من مسار الرابط بعد فك الترميز وإصلاح الأسماء المحفوظة بترميز خاطئ"""
+    segments = [decode_repaired(segment).replace('-', ' ')
+                for segment in record.slug.split('/') if segment]
+    return ' - '.join(segments)
+
+def title_items(index):
+    """(العنوان، الرابط) لكل صفحة محتوى لها عنوان في مسارها، دون تكرار الروابط"""
+    items = {}
+    for record in index.records:
+        if record.slug and record.url not in items:
+            title = display_title(record)
+            if title:
+                items[record.url] = title
+    return [(title, url) for url, title in items.items()]
+
+class SearchHit(NamedTuple):
+    score: int
+    title: str
+    url: str
+
+# ==================== الجداول الثنائية ====================
+
+def _pack_strings(strings):
+    """(مواضع البداية، النصوص مرمزة ومتتالية): النص i هو blob[offsets[i]:offsets[i+1]]"""
+    offsets = array(TYPECODE, [0])
+    chunks = []
+    position = 0
+    for text in strings:
+        data = text.encode('utf-8', 'surrogatepass')
+        chunks.append(data)
+        position += len(data)
+        offsets.append(position)
+    return offsets, b''.join(chunks)
+
+def _pack_postings(postings, keys):
+    """(مواضع البداية، كل القوائم متتالية) بترتيب المفاتيح"""
+    offsets = array(TYPECODE, [0])
+    docs = array(TYPECODE)
+    for key in keys:
+        docs.extend(postings[key])
+        offsets.append(len(docs))
+    return offsets, docs
+
+class StringTable:
+    """تسلسل نصوص فوق جدول مواضع وكتلة UTF-8 (يُفك ترميز النص عند طلبه فقط)"""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return str(self.blob[self.offsets[position]:self.offsets[position + 1]], 'utf-8', 'surrogatepass')
+
+class PostingTable:
+    """مفاتيح مرتبة (بحث ثنائي) مع قائمة مستندات مرتبة لكل مفتاح"""
+
+    def __init__(self, keys, offsets, docs):
+        self.keys = keys
+        self.offsets = offsets
+        self.docs = docs
+
+    def __len__(self):
+        return len(self.keys)
+
+    def postings(self, position):
+        return self.docs[self.offsets[position]:self.offsets[position + 1]]
+
+    def position(self, key):
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return position
+        return None
+
+    def get(self, key):
+        """قائمة مستندات المفتاح (فارغة إن لم يوجد)"""
+        position = self.position(key)
+        return self.postings(position) if position is not None else ()
+
+    def prefix_range(self, prefix):
+        """مدى مواضع المفاتيح التي تبدأ بـ prefix"""
+        return (bisect_left(self.keys, prefix),
+                bisect_left(self.keys, prefix + '\U0010FFFF'))
+
+    def count(self, position):
+        return self.offsets[position + 1] - self.offsets[position]
+
+class TitleIndex:
+    """
+    فهرس البحث: المستندات مرقمة حسب طول العنوان الموحد ثم ترتيبها في الملف،
+    فترتيب أي قائمة مستندات هو ترتيب عرض النتائج داخل نفس الدرجة
+    """
+
+    SECTIONS = ('titles', 'urls', 'norms', 'tokens', 'grams')
+
+    def __init__(self, buffer, header):
+        self.header = header
+        self._buffer = buffer
+        self._views = []
+        self._prefix_cache = {}
+
+        self.titles = self._strings('titles')
+        self.urls = self._strings('urls')
+        # العناوين الموحدة محاطة بمسافتين لفحص حدود الكلمات بعملية "in" واحدة
+        self.norms = self._strings('norms')
+        self.tokens = self._postings('tokens')
+        self.grams = self._postings('grams')
+
+    def __len__(self):
+        return len(self.titles)
+
+    # ==================== البناء ====================
+
+    @classmethod
+    def build(cls, items, source=None):
+        """بناء الفهرس في الذاكرة من (العنوان، الرابط)"""
+        entries = []
+        for title, url in items:
+            norm = normalize_text(title)
+            if norm:
+                entries.append((norm, title, url))
+        # ترتيب ثابت: الأقصر أولاً ثم ترتيب الظهور
+        entries.sort(key=lambda entry: len(entry[0]))
+
+        tokens = defaultdict(list)
+        grams = defaultdict(list)
+        for doc, (norm, _, _) in enumerate(entries):
+            words = set(norm.split())
+            for word in words:
+                tokens[word].append(doc)
+            for gram in {word[i:i + NGRAM] for word in words for i in range(len(word) - NGRAM + 1)}:
+                grams[gram].append(doc)
+
+        tables = {
+            'titles': _pack_strings(title for _, title, _ in entries),
+            'urls': _pack_strings(url for _, _, url in entries),
+            'norms': _pack_strings(f' {norm} ' for norm, _, _ in entries),
+        }
+        for name, postings in (('tokens', tokens), ('grams', grams)):
+            keys = sorted(postings)
+            tables[name] = _pack_strings(keys) + _pack_postings(postings, keys)
+        return cls.from_bytes(cls._serialize(tables, {'count': len(entries), 'source': source}))
+
+    @staticmethod
+    def _serialize(tables, meta):
+        """ملف واحد: التوقيع، طول الترويسة، ترويسة JSON بمواضع الأقسام، ثم الأقسام (محاذاة 4 بايت)"""
+        sections = {}
+        chunks = []
+        position = 0
+        for name in TitleIndex.SECTIONS:
+            for part, value in enumerate(tables[name]):
+                if isinstance(value, array):
+                    if sys.byteorder == 'big':
+                        value = array(TYPECODE, value)
+                        value.byteswap()
+                    value = value.tobytes()
+                sections[f'{name}.{part}'] = (position, len(value))
+                padding = -len(value) % 4
+                chunks.append(value + b'\x00' * padding)
+                position += len(value) + padding
+
+        header = json.dumps(dict(meta, ngram=NGRAM, sections=sections)).encode('utf-8')
+        header += b' ' * (-(len(INDEX_MAGIC) + 4 + len(header)) % 4)
+        return b''.join([INDEX_MAGIC, struct.pack('<I', len(header)), header] + chunks)
+
+    # ==================== التحميل والحفظ ====================
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        view = memoryview(buffer)
+        if bytes(view[:len(INDEX_MAGIC)]) != INDEX_MAGIC:
+            raise ValueError("ملف فهرس البحث غير صالح أو بإصدار مختلف")
+        header_start = len(INDEX_MAGIC) + 4
+        header_length, = struct.unpack_from('<I', view, len(INDEX_MAGIC))
+        header = json.loads(bytes(view[header_start:header_start + header_length]))
+        if header.get('ngram') != NGRAM:
+            raise ValueError("ملف فهرس البحث بُني بطول أجزاء مختلف")
+        header['data_start'] = header_start + header_length
+        return cls(view, header)
+
+    @classmethod
+    def load(cls, path):
+        """تحميل الفهرس بـ mmap: تُقرأ الترويسة فقط والجداول تُقرأ من الملف عند البحث"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        index = cls.from_bytes(mapped)
+        index._mapped = mapped
+        return index
+
+    def save(self, path):
+        """كتابة ذرية لملف الفهرس"""
+        temporary = path + '.partial'
+        with open(temporary, 'wb') as f:
+            f.write(self._buffer)
+        os.replace(temporary, path)
+
+    def close(self):
+        """تحرير الجداول وإغلاق الملف المحمل بـ mmap"""
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._prefix_cache.clear()
+        self._buffer.release()
+        mapped = getattr(self, '_mapped', None)
+        if mapped is not None:
+            mapped.close()
+
+    def _section(self, name):
+        start, length = self.header['sections'][name]
+        start += self.header['data_start']
+        view = self._buffer[start:start + length]
+        self._views.append(view)
+        return view
+
+    def _array(self, name):
+        view = self._section(name)
+        if sys.byteorder == 'big':
+            data = array(TYPECODE, view.tobytes())
+            data.byteswap()
+            return data
+        numbers = view.cast(TYPECODE)
+        self._views.append(numbers)
+        return numbers
+
+    def _strings(self, name):
+        return StringTable(self._array(f'{name}.0'), self._section(f'{name}.1'))
+
+    def _postings(self, name):
+        return PostingTable(self._strings(name), self._array(f'{name}.2'), self._array(f'{name}.3'))
+
+    # ==================== البحث ====================
+
+    def _prefix_docs(self, prefix):
+        """مستندات كل الكلمات التي تبدأ بـ prefix بترتيب تصاعدي دون تكرار"""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+        start, end = self.tokens.prefix_range(prefix)
+        merged = heapq.merge(*(self.tokens.postings(position) for position in range(start, end)))
+        if len(prefix) > PREFIX_CACHE_LENGTH:
+            return _unique_sorted(merged)
+        cached = self._prefix_cache[prefix] = array(TYPECODE, _unique_sorted(merged))
+        return cached
+
+    def _substring_candidates(self, term):
+        """أقصر قائمة بين قوائم أجزاء الكلمة (كل مستند يحتوي الكلمة موجود فيها)"""
+        shortest = None
+        for i in range(len(term) - NGRAM + 1):
+            position = self.grams.position(term[i:i + NGRAM])
+            if position is None:
+                return ()
+            if shortest is None or self.grams.count(position) < self.grams.count(shortest):
+                shortest = position
+        return self.grams.postings(shortest)
+
+    def _candidate_count(self, term):
+        if len(term) >= NGRAM:
+            return len(self._substring_candidates(term))
+        start, end = self.tokens.prefix_range(term)
+        return sum(self.tokens.count(position) for position in range(start, end))
+
+    def _single_term(self, term, limit):
+        """أفضل limit مستند لكلمة واحدة: المطابقة أولاً ثم بداية كلمة ثم جزء منها"""
+        hits = [(EXACT, doc) for doc in self.tokens.get(term)[:limit]]
+        if len(hits) < limit:
+            exact = f' {term} '
+            norms = self.norms
+            for doc in self._prefix_docs(term):
+                if exact not in norms[doc]:
+                    hits.append((PREFIX, doc))
+                    if len(hits) == limit:
+                        return hits
+        if len(hits) < limit and len(term) >= NGRAM:
+            word_start = f' {term}'
+            norms = self.norms
+            for doc in self._substring_candidates(term):
+                norm = norms[doc]
+                if term in norm and word_start not in norm:
+                    hits.append((SUBSTRING, doc))
+                    if len(hits) == limit:
+                        break
+        return hits
+
+    def _all_terms(self, terms, limit):
+        """المستندات التي تحتوي كل الكلمات، مرتبة بمجموع الدرجات"""
+        norms = self.norms
+        # المستندات التي تطابق كل الكلمات مطابقة تامة لها أعلى درجة ممكنة، فإذا وُجد منها
+        # limit مستند بترتيب أقصر قائمة كانت هي النتيجة دون حساب درجات باقي المرشحين
+        exact_lists = [self.tokens.get(term) for term in terms]
+        shortest = min(range(len(terms)), key=lambda i: len(exact_lists[i]))
+        others = [f' {term} ' for i, term in enumerate(terms) if i != shortest]
+        best = []
+        for doc in exact_lists[shortest]:
+            norm = norms[doc]
+            if all(pattern in norm for pattern in others):
+                best.append((EXACT * len(terms), doc))
+                if len(best) == limit:
+                    return best
+
+        driver = min(terms, key=self._candidate_count)
+        if len(driver) >= NGRAM:
+            candidates = self._substring_candidates(driver)
+        else:
+            candidates = self._prefix_docs(driver)
+
+        patterns = [(f' {term} ', f' {term}', term if len(term) >= NGRAM else None) for term in terms]
+        scored = []
+        for doc in candidates:
+            norm = norms[doc]
+            total = 0
+            for exact, word_start, substring in patterns:
+                if exact in norm:
+                    total += EXACT
+                elif word_start in norm:
+                    total += PREFIX
+                elif substring is not None and substring in norm:
+                    total += SUBSTRING
+                else:
+                    break
+            else:
+                scored.append((-total, doc))
+        return [(-score, doc) for score, doc in heapq.nsmallest(limit, scored)]
+
+    def search(self, query, limit=10):
+        """أفضل limit نتيجة للاستعلام (كل كلماته يجب أن تظهر في العنوان)"""
+        terms = list(dict.fromkeys(normalize_text(query).split()))
+        if not terms or limit <= 0:
+            return []
+        if len(terms) == 1:
+            hits = self._single_term(terms[0], limit)
+        else:
+            hits = self._all_terms(terms, limit)
+        return [SearchHit(score, self.titles[doc], self.urls[doc]) for score, doc in hits]
+
+def _unique_sorted(values):
+    previous = None
+    for value in values:
+        if value != previous:
+            previous = value
+            yield value
+
+def source_key(filename):
+    """بصمة ملف الروابط المحفوظة مع الفهرس (يُعاد البناء إذا تغير الملف)"""
+    stat = os.stat(filename)
+    return [os.path.abspath(filename), stat.st_size, stat.st_mtime_ns]
+
+def load_title_index(filename='site_links.txt', index_file=INDEX_FILE, rebuild=False):
+    """تحميل الفهرس المحفوظ، أو بنائه من ملف الروابط وحفظه إذا لم يوجد أو تغير الملف"""
+    source = source_key(filename)
+    if not rebuild and os.path.exists(index_file):
+        try:
+            index = TitleIndex.load(index_file)
+        except ValueError as e:
+            print(f"⚠️ {e} - إعادة البناء")
+        else:
+            if index.header.get('source') == source:
+                return index
+            index.close()
+            print(f"⚠️ تغيّر ملف الروابط منذ بناء الفهرس - إعادة البناء")
+
+    index = TitleIndex.build(title_items(load_link_index(filename)), source)
+    index.save(index_file)
+    return index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='البحث في عناوين المحتوى')
+    parser.add_argument('query', nargs='*', help='كلمات البحث')
+    parser.add_argument('--file', default='site_links.txt', help='ملف الروابط')
+    parser.add_argument('--index-file', default=INDEX_FILE, help='ملف الفهرس المحفوظ')
+    parser.add_argument('--rebuild', action='store_true', help='إعادة بناء الفهرس')
+    parser.add_argument('--limit', type=int, default=20, help='عدد النتائج')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_title_index(args.file, args.index_file, args.rebuild)
+    print(f"🔎 {len(index):,} عنوان في الفهرس ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    if args.query:
+        query = ' '.join(args.query)
+        start = time.perf_counter()
+        hits = index.search(query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"📋 {len(hits)} نتيجة لـ \"{query}\" ({elapsed:.3f} ms)")
+        for hit in hits:
+            print(f"  [{hit.score}] {hit.title}")
+            print(f"      {hit.url}")
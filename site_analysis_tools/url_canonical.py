@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+توحيد صيغة الروابط وإزالة المكرر بالبصمات - صيغة قانونية واحدة لكل رابط
+(ترميز النسبة المئوية للعناوين العربية، الشرطة الأخيرة، الأجزاء #، ترتيب المعاملات)
+مع بصمة 64 بت لإزالة المكرر بزمن ثابت مع الحفاظ على الترتيب
+"""
+
+import hashlib
+import unicodedata
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# الأحرف المسموح بها دون ترميز داخل جزء واحد من المسار (RFC 3986 ما عدا "/")
+PATH_SAFE = "-._~!$&'()*+,;=:@"
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def repair_mojibake(text):
+    """إصلاح نص UTF-8 فُكّ ترميزه خطأً كـ latin-1 أو cp1252 (مثل Ø§Ù\x84)"""
+    if text.isascii():
+        return text
+    for encoding in ('latin-1', 'cp1252'):
+        try:
+            return text.encode(encoding).decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            continue
+    return text
+
+def normalize_component(text, safe=''):
+    """فك الترميز ثم توحيد Unicode (NFC) ثم إعادة الترميز بحروف ست عشرية كبيرة"""
+    return quote(unicodedata.normalize('NFC', unquote(text)), safe=safe)
+
+def canonicalize(url):
+    """الصيغة القانونية للرابط: روابط متكافئة تعطي النص نفسه"""
+    url = repair_mojibake(url.strip())
+    parts = urlsplit(url)
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    # كل جزء من المسار على حدة حتى يبقى %2F داخل الجزء كما هو
+    path = '/'.join(normalize_component(segment, PATH_SAFE) for segment in parts.path.split('/'))
+    path = path.rstrip('/') or '/'
+
+    query = ''
+    if parts.query:
+        params = sorted(
+            (unicodedata.normalize('NFC', name), unicodedata.normalize('NFC', value))
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        )
+        query = urlencode(params, quote_via=quote)
+
+    # الجزء # لا يُرسل للخادم فيُحذف
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def canonical_fingerprint(canonical_url):
+    """بصمة 64 بت لرابط في صيغته القانونية مسبقاً"""
+    digest = hashlib.blake2b(canonical_url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+def fingerprint(url):
+    """بصمة 64 بت للصيغة القانونية للرابط"""
+    return canonical_fingerprint(canonicalize(url))
+
+class FingerprintSet:
+    """
+    مجموعة روابط تُخزن فيها بصمة 64 بت فقط لكل رابط (فحص وإضافة بزمن ثابت)
+    احتمال تصادم بصمتين مختلفتين مهمل (~10^-8 لمليون رابط)
+    """
+
+    def __init__(self, urls=()):
+        self.fingerprints = set()
+        for url in urls:
+            self.add(url)
+
+    def add_canonical(self, canonical_url):
+        """إضافة رابط في صيغته القانونية، ويعيد True إذا كان جديداً"""
+        key = canonical_fingerprint(canonical_url)
+        if key in self.fingerprints:
+            return False
+        self.fingerprints.add(key)
+        return True
+
+    def add(self, url):
+        """إضافة رابط، ويعيد True إذا لم يكن مكافئه موجوداً من قبل"""
+        return self.add_canonical(canonicalize(url))
+
+    def __contains__(self, url):
+        return fingerprint(url) in self.fingerprints
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+def unique_links(links, canonical=True):
+    """
+    إزالة الروابط المتكافئة مع الحفاظ على ترتيب أول ظهور
+    canonical: إعادة الصيغة القانونية بدلاً من النص الأصلي لأول ظهور
+    """
+    seen = FingerprintSet()
+    result = []
+    for link in links:
+        canonical_link = canonicalize(link)
+        if seen.add_canonical(canonical_link):
+            result.append(canonical_link if canonical else link)
+    return result
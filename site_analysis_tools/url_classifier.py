@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مصنف الروابط الموحد - تعبير منتظم واحد مُجمّع يعيد النوع والمعرف والعنوان في مطابقة واحدة
+"""
+
+import re
+from collections import namedtuple
+
+BASE_URL = 'https://ak.sv/'
+
+# جدول القواعد المشترك: بادئة المسار -> نوع المحتوى (الأطول أولاً)
+CONTENT_RULES = (
+    ('show/episode', 'show_episode'),
+    ('movie', 'movie'),
+    ('series', 'series'),
+    ('episode', 'episode'),
+    ('person', 'person'),
+    ('shows', 'shows'),
+    ('show', 'show'),
+    ('mix', 'mix'),
+)
+
+# الفئة التي تتفق عليها جميع الأدوات لكل نوع محتوى
+CONTENT_CATEGORIES = {
+    'movie': 'movies',
+    'series': 'series',
+    'episode': 'episodes',
+    'show_episode': 'episodes',
+    'shows': 'shows',
+    'show': 'shows',
+    'person': 'persons',
+    'mix': 'mix',
+}
+
+# البادئة -> (النوع، القسم) محسوبة مسبقاً لتجنب أي معالجة داخل الحلقة الساخنة
+_RULE_BY_PREFIX = {prefix: (kind, prefix.split('/', 1)[0]) for prefix, kind in CONTENT_RULES}
+
+URL_PATTERN = re.compile(
+    r'^https://ak\.sv/(?:'
+    r'(?P<prefix>' + '|'.join(re.escape(prefix) for prefix, _ in CONTENT_RULES) + r')'
+    r'/(?P<id>\d+)(?:/(?P<rest>.*))?'
+    r'|(?P<section>[^/?#]*).*'
+    r')$',
+    re.DOTALL,
+)
+
+
+class UrlMatch(namedtuple('UrlMatch', ['kind', 'section', 'item_id', 'rest'])):
+    """نتيجة التصنيف: rest هو كل ما بعد "/<id>/" (None إذا لم تتبع المعرف شرطة)"""
+    __slots__ = ()
+
+    @property
+    def category(self):
+        return CONTENT_CATEGORIES.get(self.kind)
+
+    @property
+    def slug(self):
+        if self.rest is None:
+            return None
+        return self.rest.split('#', 1)[0].split('?', 1)[0]
+
+
+NO_MATCH = UrlMatch('page', '', None, None)
+
+
+_match = URL_PATTERN.match
+_new = tuple.__new__
+
+
+def classify_url(url):
+    """تصنيف رابط واحد بمطابقة واحدة"""
+    match = _match(url)
+    if match is None:
+        return NO_MATCH
+
+    prefix, item_id, rest, section = match.groups()
+    if prefix is None:
+        return _new(UrlMatch, ('page', section, None, None))
+
+    kind, section = _RULE_BY_PREFIX[prefix]
+    return _new(UrlMatch, (kind, section, int(item_id), rest))
+
+
+def content_id(url):
+    """معرف المحتوى كما تستخدمه أدوات الترتيب (0 إذا لم يتبع المعرف مسار)"""
+    match = classify_url(url)
+    return match.item_id if match.rest is not None else 0